@@ -0,0 +1,31 @@
+"""Memory of the AST built by Parser.parse_program, in bytes per node.
+
+The tokens are lexed and normalized before tracemalloc starts, so only
+the tree (with the scopes of its blocks) is measured.
+"""
+
+import tracemalloc
+
+from common import generate_program, count_nodes
+
+from akorn.diagnostic import ErrorReporter
+from akorn.parser import Parser
+from akorn.scanner import FastLexer
+from akorn.syntatic_normalizer import TheNormalizer
+
+
+def main():
+    code = generate_program(20000)
+    tokens = TheNormalizer(FastLexer(code, ErrorReporter()).tokenize(), ErrorReporter()).normalizer()
+
+    tracemalloc.start()
+    root = Parser(tokens, ErrorReporter()).parse_program()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = count_nodes(root)
+    print(f"{nodes} nodes, {size / 2**20:.1f} MiB, {size / nodes:.1f} bytes/node")
+
+
+if __name__ == "__main__":
+    main()
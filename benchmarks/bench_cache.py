@@ -0,0 +1,63 @@
+"""Time to get a checked program ready to interpret, with and without the
+`__akorncache__` of `akorn run`.
+
+Cold is the lexer, normalizer, parser and type checker plus writing the
+cache, warm is loading the cached flat AST (and rebuilding the tree). For
+the pycodegen engine cold also lowers and compiles the program, and warm
+loads the cached Python code.
+The script is written to a temporary directory.
+"""
+
+import os
+import tempfile
+
+from common import best_time, generate_program
+
+from akorn.ast import FlatAst
+from akorn.cache import load_code, load_program, source_hash, store_code, store_program
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import PythonEngine
+
+
+def main():
+    code = generate_program(5000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "generated.akorn")
+
+        with open(script, "w") as file_ak:
+            file_ak.write(code)
+
+        def cold():
+            root = check_source(code, ErrorReporter())
+            store_program(script, source_hash(code), FlatAst.from_tree(root))
+
+        def warm_flat():
+            load_program(script, source_hash(code))
+
+        def warm_tree():
+            load_program(script, source_hash(code)).to_tree()
+
+        def cold_code():
+            engine = PythonEngine(check_source(code, ErrorReporter()), ErrorReporter())
+            store_code(script, source_hash(code), engine.code, engine.positions)
+
+        def warm_code():
+            PythonEngine.from_code(*load_code(script, source_hash(code)), ErrorReporter())
+
+        cold_time = best_time(cold)
+        flat_time = best_time(warm_flat)
+        tree_time = best_time(warm_tree)
+        cold_code_time = best_time(cold_code)
+        code_time = best_time(warm_code)
+
+    print(f"cold (check and write the cache): {cold_time * 1000:.1f} ms")
+    print(f"warm, flat AST: {flat_time * 1000:.1f} ms ({cold_time / flat_time:.1f}x)")
+    print(f"warm, tree: {tree_time * 1000:.1f} ms ({cold_time / tree_time:.1f}x)")
+    print(f"pycodegen cold (check, compile and write the code): {cold_code_time * 1000:.1f} ms")
+    print(f"pycodegen warm, Python code: {code_time * 1000:.1f} ms ({cold_code_time / code_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Wall time of `akorn check` over a tree of generated scripts for a growing
+number of jobs, it should go down until the number of cores.
+
+The scripts are written to a temporary directory, pass the number of
+scripts as the first argument (64 by default).
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from common import generate_program
+
+from akorn.cli.check import PHASES, check_scripts, find_scripts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(count):
+            with open(os.path.join(directory, f"script_{i}.akorn"), "w") as file_ak:
+                file_ak.write(generate_program(300))
+
+        scripts = find_scripts([directory])
+        jobs = 1
+
+        while True:
+            start = time.perf_counter()
+            results = check_scripts(scripts, jobs)
+            elapsed = time.perf_counter() - start
+
+            phases = ", ".join(
+                f"{phase} {sum(timings[phase] for _, _, timings in results) * 1000:.0f}ms" for phase in PHASES
+            )
+            print(f"{jobs} jobs: {elapsed:.2f}s ({phases})")
+
+            if jobs >= cores:
+                break
+
+            jobs = min(jobs * 2, cores)
+
+    print(f"{count} scripts, {cores} cores")
+
+
+if __name__ == "__main__":
+    main()
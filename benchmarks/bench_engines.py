@@ -0,0 +1,88 @@
+"""Run time of the scripts of `examples/loops` with each execution engine
+of `akorn run --engine=`, and how many times faster than the tree walker.
+
+The scripts read their numbers from a canned stdin (INPUTS, the default is
+300 for every read) and their output is captured and compared, the engines
+must print the same. Scripts that do not pass the checker are skipped. The
+time of the closure and vm engines includes compiling the program.
+
+Before the examples, the engines run the scripts of CHECKS, small cases
+where one of them once printed something else.
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from common import ROOT, best_time, run_script
+
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import ENGINES
+
+#Input of the scripts whose loops would be too short with the default
+INPUTS = {
+    "sum_to_n": "100000\n",
+    "fibonacci": "2000\n",
+    "numero_primo": "1000000007\n999999937\n" * 3,
+    "contador_de_digitos": "1" * 4000 + "\n",
+    "sum_to_digits": "9" * 4000 + "\n",
+    "product_to_digits": "2" * 4000 + "\n",
+    "rev_num": "123456789" * 400 + "\n",
+}
+
+DEFAULT_INPUT = "300\n" * 3
+
+#(name, script, stdin) of the cases the engines must agree on
+CHECKS = [
+    #The value of a call statement is not a break (1) or a continue (2)
+    ("call statement in a loop", """
+var int i = 0
+while i < 3 {
+    i = i + 1
+    readInt("")
+    writeline("after read", i)
+}
+writeline("done", i)
+""", "1\n2\n5\n"),
+]
+
+
+def run_engine(engine: str, root_node, stdin: str) -> str:
+    return run_script(lambda: ENGINES[engine](root_node, ErrorReporter()), stdin)
+
+
+def main():
+    for name, source, stdin in CHECKS:
+        root_node = check_source(source, ErrorReporter())
+        outputs = {engine: run_engine(engine, root_node, stdin) for engine in ENGINES}
+
+        if len(set(outputs.values())) != 1:
+            raise SystemExit(f"{name}: the engines printed different outputs {outputs}")
+
+        print(f"{name}: same output")
+
+    scripts = sorted((ROOT / "examples" / "loops").glob("*.akorn"))
+
+    for script in scripts:
+        name = script.stem
+
+        with redirect_stdout(io.StringIO()):
+            root_node = check_source(script.read_text(encoding="utf-8"), ErrorReporter())
+
+        if root_node is None:
+            print(f"{name}: skipped, the script has errors")
+            continue
+
+        stdin = INPUTS.get(name, DEFAULT_INPUT)
+        outputs = {engine: run_engine(engine, root_node, stdin) for engine in ENGINES}
+
+        if len(set(outputs.values())) != 1:
+            raise SystemExit(f"{name}: the engines printed different outputs")
+
+        times = {engine: best_time(lambda: run_engine(engine, root_node, stdin)) for engine in ENGINES}
+        detail = ", ".join(f"{engine} {elapsed * 1000:.1f} ms ({times['tree'] / elapsed:.1f}x)" for engine, elapsed in times.items())
+        print(f"{name}: {detail}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Recorded-input benchmark of the scripts of `examples`.
+
+Every script runs with the stdin of its fixture, `fixtures/<folder>/<name>.in`
+(empty when there is none), and what it prints, with the errors `akorn run`
+would show, is compared with the golden file `fixtures/<folder>/<name>.out`.
+Each phase of the pipeline is timed apart, over `repeat` runs of the whole
+pipeline, and the timings are written as JSON.
+
+    python benchmarks/bench_examples.py [repeat] [--engine=tree|closure|vm|pycodegen] [--json=path] [--record]
+
+`--record` writes the golden files from the output of this run instead of
+checking them, for a new example or a change of what one prints.
+"""
+
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from unittest import mock
+
+from common import ROOT
+
+from akorn.cli.cmd_akorn import run_engine
+from akorn.diagnostic import ErrorReporter
+from akorn.parser import Parser
+from akorn.runtime import ENGINES
+from akorn.scanner import FastLexer, load_source
+from akorn.semantic import Semantic, Resolver
+from akorn.syntatic_normalizer import TheNormalizer
+
+FIXTURES = ROOT / "benchmarks" / "fixtures"
+
+PHASES = ("load", "lexer", "normalizer", "parser", "semantic", "resolver", "compile", "run")
+
+DEFAULT_REPEAT = 5
+
+
+def run_pipeline(script, stdin: bytes, engine: str) -> tuple[str, dict[str, float]]:
+    """What the script prints and the seconds of each phase it got to, the
+    phases stop at the first one with errors, like `akorn run`"""
+
+    reporter = ErrorReporter()
+    timings = {}
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", newline="\n")
+
+    phases = (
+        ("load", lambda _: load_source(str(script), reporter)),
+        ("lexer", lambda code: FastLexer(code, reporter).tokenize_buffer()),
+        ("normalizer", lambda tokens: TheNormalizer(tokens, reporter).normalizer()),
+        ("parser", lambda tokens: Parser(tokens, reporter).parse_program()),
+        ("semantic", lambda root_node: Semantic(reporter).check_ast(root_node) or root_node),
+        ("resolver", lambda root_node: Resolver().resolve(root_node) or root_node),
+        ("compile", lambda root_node: ENGINES[engine](root_node, reporter)),
+        ("run", lambda interpreter: run_script(interpreter, reporter, stdin)),
+    )
+
+    result = None
+
+    with redirect_stdout(stdout):
+        for phase, run_phase in phases:
+            start = time.perf_counter()
+            result = run_phase(result)
+            timings[phase] = time.perf_counter() - start
+
+            if reporter.has_errors():
+                reporter.display()
+                reporter.clear_list_error()
+                break
+
+    stdout.flush()
+    return stdout.buffer.getvalue().decode("utf-8"), timings
+
+
+def run_script(interpreter, reporter: ErrorReporter, stdin: bytes) -> None:
+    #A stdin with bytes under it, the reads take it in chunks as from a pipe
+    with mock.patch("sys.stdin", io.TextIOWrapper(io.BytesIO(stdin), encoding="utf-8")):
+        try:
+            run_engine(interpreter, reporter)
+        except EOFError:
+            #The scripts that loop until there is no more input
+            pass
+
+
+def summary(seconds: list[float]) -> dict[str, float]:
+    return {
+        "min": min(seconds),
+        "median": statistics.median(seconds),
+        "mean": statistics.fmean(seconds),
+    }
+
+
+def main():
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].partition("=")[::2] for arg in sys.argv[1:] if arg.startswith("--"))
+    repeat = int(positional[0]) if positional else DEFAULT_REPEAT
+    engine = options.get("engine", "tree")
+    json_path = options.get("json") or str(ROOT / "bench_examples.json")
+    record = "record" in options
+
+    if engine not in ENGINES:
+        raise SystemExit(f"Unknown engine '{engine}', use --engine={'|'.join(ENGINES)}")
+
+    results = {}
+    different = []
+
+    for script in sorted((ROOT / "examples").glob("*/*.akorn")):
+        name = f"{script.parent.name}/{script.stem}"
+        fixture = FIXTURES / script.parent.name / script.stem
+        stdin_path = fixture.with_suffix(".in")
+        golden_path = fixture.with_suffix(".out")
+        stdin = stdin_path.read_bytes() if stdin_path.exists() else b""
+
+        timings = {phase: [] for phase in PHASES}
+        outputs = set()
+
+        for _ in range(repeat):
+            output, run_timings = run_pipeline(script, stdin, engine)
+            outputs.add(output)
+
+            for phase, seconds in run_timings.items():
+                timings[phase].append(seconds)
+
+        if len(outputs) != 1:
+            raise SystemExit(f"{name}: the runs printed different outputs")
+
+        output = outputs.pop()
+
+        if record:
+            golden_path.write_text(output, encoding="utf-8", newline="\n")
+            status = "recorded"
+        elif not golden_path.exists():
+            status = "no golden file"
+            different.append(name)
+        elif golden_path.read_text(encoding="utf-8") != output:
+            status = "differs from the golden file"
+            different.append(name)
+        else:
+            status = "ok"
+
+        phases = {phase: summary(seconds) for phase, seconds in timings.items() if seconds}
+        totals = [sum(run) for run in zip(*(seconds for seconds in timings.values() if seconds))]
+        results[name] = {"status": status, "phases": phases, "total": summary(totals)}
+
+        detail = ", ".join(f"{phase} {times['min'] * 1000:.2f}" for phase, times in phases.items())
+        print(f"{name:<40} {status:<14} total {min(totals) * 1000:8.2f} ms ({detail})")
+
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump({
+            "engine": engine,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "scripts": results,
+        }, file, indent=2)
+
+    print(f"\nTimings of {len(results)} scripts, best of {repeat} runs in ms, written to {json_path}")
+
+    if different:
+        raise SystemExit(f"{len(different)} scripts do not match their golden file: {', '.join(different)}")
+
+
+if __name__ == "__main__":
+    main()
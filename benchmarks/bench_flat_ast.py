@@ -0,0 +1,52 @@
+"""Memory and garbage collector cost of the tree AST against the flat AST.
+
+The tree is measured as Parser.parse_program builds it and the flat AST
+after FlatAst.from_tree, once the tree is gone, in bytes per node and in
+objects tracked by the garbage collector. The scopes of the blocks are in
+both, the flat AST keeps them in its `scopes` pool.
+"""
+
+import gc
+import tracemalloc
+
+from common import best_time, generate_program
+
+from akorn.ast import FlatAst
+from akorn.diagnostic import ErrorReporter
+from akorn.parser import Parser
+from akorn.scanner import FastLexer
+from akorn.syntatic_normalizer import TheNormalizer
+
+
+def measure(build):
+    gc.collect()
+    tracked = len(gc.get_objects())
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, len(gc.get_objects()) - tracked
+
+
+def main():
+    code = generate_program(20000)
+    tokens = TheNormalizer(FastLexer(code, ErrorReporter()).tokenize(), ErrorReporter()).normalizer()
+
+    root, tree_size, tree_objects = measure(lambda: Parser(list(tokens), ErrorReporter()).parse_program())
+    flat_ast, flat_size, flat_objects = measure(lambda: FlatAst.from_tree(Parser(list(tokens), ErrorReporter()).parse_program()))
+    nodes = len(flat_ast)
+
+    print(f"{nodes} nodes")
+    print(f"tree: {tree_size / 2**20:.1f} MiB, {tree_size / nodes:.1f} bytes/node, {tree_objects} objects tracked by the gc")
+    print(f"flat: {flat_size / 2**20:.1f} MiB, {flat_size / nodes:.1f} bytes/node, {flat_objects} objects tracked by the gc")
+
+    del flat_ast
+    print(f"full collection with the tree alive: {best_time(gc.collect) * 1000:.1f} ms")
+    del root
+    flat_ast = FlatAst.from_tree(Parser(list(tokens), ErrorReporter()).parse_program())
+    print(f"full collection with the flat AST alive: {best_time(gc.collect) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
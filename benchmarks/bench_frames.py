@@ -0,0 +1,66 @@
+"""Frames of the tree walker and the closure engine on a script whose loops
+open a block with variables of its own every iteration.
+
+The frames come from a `FramePool`: a block takes one when it starts and
+gives it back when it ends, so a loop runs with the same list every
+iteration. The program is run twice with the same engine to show that a run
+leaves nothing behind, and the peak is the most memory the frames took.
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from common import best_time
+
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import Interpreter, ClosureInterpreter
+
+SCRIPT = """
+var int total = 0
+var int i = 0
+while i < 200 {
+    var int j = 0
+    while j < 50 {
+        var int square = j * j
+        var int rest = square % 7
+        if rest > 3 {
+            var int twice = rest * 2
+            total = total + twice
+        }
+        j = j + 1
+    }
+    i = i + 1
+}
+writeline(total)
+"""
+
+ENGINES = {
+    "tree": Interpreter,
+    "closure": ClosureInterpreter,
+}
+
+
+def main():
+    root_node = check_source(SCRIPT, ErrorReporter())
+
+    for name, engine in ENGINES.items():
+        interpreter = engine(root_node, ErrorReporter())
+        outputs = []
+
+        def run():
+            output = io.StringIO()
+
+            with redirect_stdout(output):
+                interpreter.interpret_main()
+
+            outputs.append(output.getvalue())
+
+        elapsed = best_time(run)
+        pool = interpreter.frame_pool
+        assert len(set(outputs)) == 1, f"{name}: the runs printed {set(outputs)}"
+        print(f"{name:<8} {elapsed * 1000:.1f} ms, {pool.created} frames created, {pool.reused} reused, peak {pool.peak_bytes} bytes, {pool.live_bytes} held after the runs")
+
+
+if __name__ == "__main__":
+    main()
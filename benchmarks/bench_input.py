@@ -0,0 +1,97 @@
+"""Time of a script that sums a million ints piped to stdin, with the
+chunked reader of the builtins and with one `input()` per read like they
+used before.
+
+`readInt` takes its line from the `input` of its engine, that reads stdin
+in chunks of `INPUT_CHUNK_SIZE` bytes and parses the int from the bytes of
+the line.
+The script runs in a child process so its stdin is a real pipe. Then
+`readString` reads one line of `LONG_LINE` bytes, that comes in many
+chunks.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT
+
+COUNT = 1_000_000
+
+SCRIPT = f"""
+var int total = 0
+var int i = 0
+while i < {COUNT} {{
+    total = total + readInt("number: ")
+    i = i + 1
+}}
+writeline(total)
+"""
+
+LONG_LINE = 64 << 20
+
+LONG_LINE_SCRIPT = """
+var string line = readString("")
+writeline(line == "x")
+"""
+
+#Child that runs the script with the pycodegen engine, with the old builtin if asked
+CHILD = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import PythonEngine
+
+def input_read_int(args):
+    line = input(*args)
+    while True:
+        try:
+            return int(line)
+        except ValueError:
+            line = input(*args)
+
+engine = PythonEngine(check_source(open(sys.argv[2]).read(), ErrorReporter()), ErrorReporter())
+if sys.argv[3] == "input":
+    engine.builtins["readInt"] = input_read_int
+start = time.perf_counter()
+engine.interpret_main()
+print(time.perf_counter() - start, file=sys.stderr)
+"""
+
+
+def main():
+    numbers = "".join(f"{i * 7919 % 100_003 - 50_000}\n" for i in range(COUNT))
+    expected = sum(int(line) for line in numbers.split())
+
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "sum.akorn")
+
+        with open(script, "w", encoding="utf-8") as file:
+            file.write(SCRIPT)
+
+        for label in ("input", "chunked"):
+            result = subprocess.run(
+                [sys.executable, "-c", CHILD, str(ROOT / "src"), script, label],
+                input=numbers.encode(), capture_output=True,
+            )
+            output = result.stdout.decode()
+            assert output.endswith(f"{expected}\n"), output[-200:] + result.stderr.decode()[-2000:]
+            elapsed = float(result.stderr.decode().split()[-1])
+            print(f"{label:<8} {COUNT} ints: {elapsed * 1000:.0f} ms ({elapsed / COUNT * 1e6:.2f} us per read), {len(output)} bytes of output")
+
+        with open(script, "w", encoding="utf-8") as file:
+            file.write(LONG_LINE_SCRIPT)
+
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD, str(ROOT / "src"), script, "chunked"],
+            input=b"7" * LONG_LINE + b"\n", capture_output=True,
+        )
+        assert result.stdout == b"False\n", result.stdout[-200:] + result.stderr[-2000:]
+        elapsed = float(result.stderr.decode().split()[-1])
+        print(f"chunked  a line of {LONG_LINE >> 20} MB: {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
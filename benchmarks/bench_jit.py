@@ -0,0 +1,113 @@
+"""Run time of the scripts of `examples/loops` on the tree walker with and
+without the loop JIT of `akorn run --jit`, and what the JIT reports.
+
+The scripts and their inputs are the ones of bench_engines, the outputs
+with and without the JIT must be the same. The time with the JIT includes
+compiling the hot loops.
+
+Before the examples, the scripts of CHECKS are run with and without the
+JIT, small cases that the JIT once ran wrong or kept walking. No loop of
+them may fail its guard more than `JIT_RECOMPILE_FAILURES` times.
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from common import ROOT, best_time, run_script
+from bench_engines import INPUTS, DEFAULT_INPUT
+
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import Interpreter, LoopJit
+from akorn.runtime.jit import JIT_RECOMPILE_FAILURES
+
+#(name, script, stdin) of the cases the JIT must run like the tree walker
+CHECKS = [
+    #Variables with the names of the locals of the compiled loop
+    ("variables named like the locals of the JIT", """
+var int total = 0
+var int i = 0
+while i < 500 {
+    var int frame = i
+    var int frames = 1
+    var int iterations = 2
+    total = total + frame + frames - iterations
+    i = i + 1
+}
+writeline(total)
+""", ""),
+    #Names that NFKC normalization changes, a parsed Python name would not be the same
+    ("variables named ﬁ and ｘ", """
+var int ﬁ = 0
+var int ｘ = 0
+var int i = 0
+while i < 500 {
+    i = i + 1
+    ﬁ = ﬁ + 1
+    ｘ = ｘ + ﬁ
+}
+writeline(ﬁ, ｘ)
+""", ""),
+    #The inner loop is compiled with `n` set and entered again with `n` unset, it is compiled again
+    ("a loop entered with a variable unset", """
+var int total = 0
+var int k = 0
+while k < 20 {
+    var int n
+    var int i = 0
+    while i < 300 {
+        n = i
+        i = i + 1
+    }
+    total = total + n
+    k = k + 1
+}
+writeline(total)
+""", ""),
+]
+
+
+def run_tree(root_node, stdin: str, jit: LoopJit | None) -> str:
+    return run_script(lambda: Interpreter(root_node, ErrorReporter(), jit), stdin)
+
+
+def main():
+    for name, source, stdin in CHECKS:
+        root_node = check_source(source, ErrorReporter())
+
+        jit = LoopJit()
+
+        if run_tree(root_node, stdin, None) != run_tree(root_node, stdin, jit):
+            raise SystemExit(f"{name}: the JIT printed a different output")
+
+        if any(record.guard_failures > JIT_RECOMPILE_FAILURES for record in jit.loops.values()):
+            raise SystemExit(f"{name}: a loop kept failing its guard\n{jit.report()}")
+
+        print(f"{name}: same output")
+
+    scripts = sorted((ROOT / "examples" / "loops").glob("*.akorn"))
+
+    for script in scripts:
+        name = script.stem
+
+        with redirect_stdout(io.StringIO()):
+            root_node = check_source(script.read_text(encoding="utf-8"), ErrorReporter())
+
+        if root_node is None:
+            print(f"{name}: skipped, the script has errors")
+            continue
+
+        stdin = INPUTS.get(name, DEFAULT_INPUT)
+        jit = LoopJit()
+
+        if run_tree(root_node, stdin, None) != run_tree(root_node, stdin, jit):
+            raise SystemExit(f"{name}: the JIT printed a different output")
+
+        walker = best_time(lambda: run_tree(root_node, stdin, None))
+        compiled = best_time(lambda: run_tree(root_node, stdin, LoopJit()))
+        print(f"{name}: tree {walker * 1000:.1f} ms, tree --jit {compiled * 1000:.1f} ms ({walker / compiled:.1f}x)")
+        print(jit.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Per-iteration time of the tree walker on the loops of `examples/loops`.
+
+Every statement returns an int completion, NORMAL, BREAK or CONTINUE, and
+the statements and expressions are dispatched by their kind in one dict
+lookup. Before, the blocks passed the strings "break" and "continue" up and
+`visit_node` went down a chain of `is` comparisons.
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+
+from common import ROOT, best_time
+
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import Interpreter
+
+#(script, stdin of one run, iterations of its loop)
+LOOPS = [
+    ("fizzbuzz.akorn", "", 100),
+    ("tabla_multiplicar.akorn", "7\n", 10),
+]
+
+#Runs of each script per timing, the loops are short
+RUNS = 200
+
+
+def main():
+    for name, stdin, iterations in LOOPS:
+        source = (ROOT / "examples" / "loops" / name).read_text(encoding="utf-8")
+        root_node = check_source(source, ErrorReporter())
+
+        def run():
+            stdin_before = sys.stdin
+
+            try:
+                with redirect_stdout(io.StringIO()):
+                    for _ in range(RUNS):
+                        sys.stdin = io.StringIO(stdin)
+                        Interpreter(root_node, ErrorReporter()).interpret_main()
+            finally:
+                sys.stdin = stdin_before
+
+        elapsed = best_time(run)
+        total = RUNS * iterations
+        print(f"{name:<24} {total} iterations: {elapsed * 1000:.1f} ms ({elapsed / total * 1e6:.2f} us per iteration)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Differential check and run time of `akorn build --target=c` against the
+tree walker on the scripts of `examples/loops`.
+
+Every script that passes the checker is compiled to a native executable,
+run with the same canned stdin as the tree walker and its output compared,
+so the C backend must print what the interpreter prints. The inputs are
+the ones of bench_engines except where the numbers would not fit in the 64
+bits of a native int. The native time includes starting the process, the
+time of the C compiler is printed apart.
+
+Before the examples, the scripts of CHECKS are built and compared the same
+way, small cases the C backend once failed to build or ran wrong.
+"""
+
+import io
+import subprocess
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from common import ROOT, best_time, run_script
+from bench_engines import INPUTS, DEFAULT_INPUT
+
+from akorn.backend import CCodegen, find_c_compiler, compile_c
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import Interpreter
+
+#Inputs whose results stay in 64 bits
+NATIVE_INPUTS = {
+    **INPUTS,
+    "factorial_iterativo": "20\n",
+    "potencia_iterativa": "3\n39\n",
+    "fibonacci": "90\n",
+    "contador_de_digitos": "1" * 18 + "\n",
+    "sum_to_digits": "9" * 18 + "\n",
+    "product_to_digits": "2" * 18 + "\n",
+    "rev_num": "123456789\n",
+}
+
+#(name, script, stdin) of the cases the native executable must run like the tree walker
+CHECKS = [
+    #Names a C compiler does not take as they are, or takes only with extensions
+    ("variables with names that are not ASCII", """
+var int ⸯ = 3
+var int año = 4
+var int au00f1 = 5
+var float 𝔵 = 1.5
+writeline(ⸯ + año, au00f1, 𝔵)
+""", ""),
+]
+
+
+def run_tree(root_node, stdin: str) -> str:
+    return run_script(lambda: Interpreter(root_node, ErrorReporter()), stdin)
+
+
+def run_native(executable: Path, stdin: str) -> str:
+    return subprocess.run([str(executable)], input=stdin, capture_output=True, text=True).stdout
+
+
+def build_native(root_node, build_dir: str, name: str, compiler: str) -> tuple[Path, float]:
+    """The executable of the program and the seconds the C compiler took"""
+
+    c_path = Path(build_dir) / f"{name}.c"
+    executable = Path(build_dir) / name
+    c_path.write_text(CCodegen().lower(root_node), encoding="utf-8")
+
+    start = time.perf_counter()
+    errors = compile_c(str(c_path), str(executable), compiler)
+    compile_time = time.perf_counter() - start
+
+    if errors is not None:
+        raise SystemExit(f"{name}: the C compiler failed\n{errors}")
+
+    return executable, compile_time
+
+
+def main():
+    compiler = find_c_compiler()
+
+    if compiler is None:
+        raise SystemExit("No C compiler was found, set CC to one")
+
+    scripts = sorted((ROOT / "examples" / "loops").glob("*.akorn"))
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        for index, (name, source, stdin) in enumerate(CHECKS):
+            root_node = check_source(source, ErrorReporter())
+            executable, _ = build_native(root_node, build_dir, f"check_{index}", compiler)
+
+            if run_tree(root_node, stdin) != run_native(executable, stdin):
+                raise SystemExit(f"{name}: the native executable printed a different output")
+
+            print(f"{name}: same output")
+
+        for script in scripts:
+            name = script.stem
+
+            with redirect_stdout(io.StringIO()):
+                root_node = check_source(script.read_text(encoding="utf-8"), ErrorReporter())
+
+            if root_node is None:
+                print(f"{name}: skipped, the script has errors")
+                continue
+
+            executable, compile_time = build_native(root_node, build_dir, name, compiler)
+            stdin = NATIVE_INPUTS.get(name, DEFAULT_INPUT)
+
+            if run_tree(root_node, stdin) != run_native(executable, stdin):
+                raise SystemExit(f"{name}: the native executable printed a different output")
+
+            walker = best_time(lambda: run_tree(root_node, stdin))
+            native = best_time(lambda: run_native(executable, stdin))
+            print(f"{name}: same output, tree {walker * 1000:.1f} ms, native {native * 1000:.1f} ms ({walker / native:.1f}x), {compiler} {compile_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
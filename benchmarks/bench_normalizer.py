@@ -0,0 +1,33 @@
+"""Scaling of TheNormalizer.normalizer with the number of tokens.
+
+The time per token must stay flat up to 1M tokens; the old in-place
+implementation popped every dropped newline out of the list and grew
+quadratically.
+"""
+
+from common import generate_program, best_time
+
+from akorn.diagnostic import ErrorReporter
+from akorn.scanner import FastLexer
+from akorn.syntatic_normalizer import TheNormalizer
+
+
+def main():
+    print(f"{'tokens':>10} {'seconds':>10} {'ns/token':>10}")
+
+    statements = 1000
+
+    while True:
+        tokens = FastLexer(generate_program(statements), ErrorReporter()).tokenize()
+
+        elapsed = best_time(lambda: TheNormalizer(tokens, ErrorReporter()).normalizer())
+        print(f"{len(tokens):>10} {elapsed:>10.3f} {elapsed / len(tokens) * 1e9:>10.1f}")
+
+        if len(tokens) >= 1_000_000:
+            break
+
+        statements *= 4
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Time per operation of the tree walker for every operator and operand
+type, with the function picked for the node when the program is loaded
+(`SPECIALIZED_OPERATIONS`) and with the if/elif chain on the operator
+that the tree walker ran before, kept here as `generic_operation`.
+
+Both read their operands from the same two variables, so the difference
+is only the cost of choosing what to do with them.
+"""
+
+from common import best_time
+
+from akorn.ast import BinaryOpNode
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import Interpreter
+from akorn.runtime.interpreter import SPECIALIZED_OPERATIONS
+
+OPERANDS = {
+    "int": ("7", "3"),
+    "float": ("7.5", "2.5"),
+    "string": ("'ab'", "'b'"),
+    "bool": ("true", "false"),
+}
+
+REPEAT = 100000
+
+
+def generic_operation(interpreter: Interpreter, node) -> object:
+    """The operation as the tree walker ran it before it was specialized"""
+
+    left = interpreter.visit_node(node.left)
+    operator = node.operator
+    right = interpreter.visit_node(node.right)
+
+    if operator == '<':
+        return left < right
+    elif operator == '>':
+        return left > right
+    elif operator == '<=':
+        return left <= right
+    elif operator == '>=':
+        return left >= right
+    elif operator == '==':
+        return left == right
+    elif operator == '!=':
+        return left != right
+    elif operator == '+':
+        return left + right
+    elif operator == '-':
+        return left - right
+    elif operator == '*':
+        return left * right
+    elif operator == '/':
+        if right == 0:
+            interpreter.stop()
+
+        if isinstance(left, int) and isinstance(right, int):
+            return left // right
+
+        return left / right
+    elif operator == '%':
+        if right == 0:
+            interpreter.stop()
+
+        return left % right
+    elif operator == "**":
+        return left ** right
+
+
+def main():
+    for operator, value_type in SPECIALIZED_OPERATIONS:
+        left, right = OPERANDS[value_type]
+        script = f"var {value_type} a = {left}\nvar {value_type} b = {right}\nwriteline(a {operator} b)\n"
+        root_node = check_source(script, ErrorReporter())
+        interpreter = Interpreter(root_node, ErrorReporter())
+
+        #The frame of the program, with the values of a and b, running it would release it at its end
+        interpreter.frames = [[interpreter.visit_node(statement.value) for statement in root_node.statements[:2]]]
+
+        node = root_node.statements[2].args[0]
+        visit = interpreter.visit_binary_operation if node.kind is BinaryOpNode else interpreter.visit_comparison_operation
+
+        def run_specialized():
+            for _ in range(REPEAT):
+                visit(node)
+
+        def run_generic():
+            for _ in range(REPEAT):
+                generic_operation(interpreter, node)
+
+        #Alternated, so a slower moment of the machine hits both
+        specialized = generic = float("inf")
+
+        for _ in range(7):
+            specialized = min(specialized, best_time(run_specialized, repeat=1) / REPEAT)
+            generic = min(generic, best_time(run_generic, repeat=1) / REPEAT)
+
+        print(f"{value_type:>6} {operator:<2}: specialized {specialized * 1e9:.0f} ns, if/elif chain {generic * 1e9:.0f} ns ({generic / specialized:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Time of a script that prints a million lines, to a file that is not a
+terminal, with the buffered output of the builtins and with one `print()`
+per call like they used before.
+
+`writeline` puts its text in the `output` of its engine, that writes it
+out in one encoded `sys.stdout.buffer.write` every `OUTPUT_BUFFER_SIZE`
+characters.
+
+Before the timings two engines run at once in two threads, each with its
+own `--input` and `--out` file, and each file must hold the lines of its
+own engine alone.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+from common import best_time
+
+from akorn.cli.cmd_akorn import check_source, run_engine
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import ENGINES
+
+LINES = 1_000_000
+
+SCRIPT = f"""
+var int i = 0
+while i < {LINES} {{
+    writeline(i, "squared is", i * i)
+    i = i + 1
+}}
+"""
+
+#Echoes the lines of its input with their number
+ECHO_SCRIPT = """
+var int i = 0
+while i < 20000 {
+    writeline(i, readString(""))
+    i = i + 1
+}
+"""
+
+
+def print_writeline(args) -> None:
+    print(*args)
+
+
+def check_threads() -> None:
+    root_node = check_source(ECHO_SCRIPT, ErrorReporter())
+
+    with tempfile.TemporaryDirectory() as directory:
+        runs = []
+
+        for name in ("vm", "pycodegen"):
+            input_path = os.path.join(directory, f"{name}.in")
+            out_path = os.path.join(directory, f"{name}.out")
+            lines = [f"{name} {i}" for i in range(20000)]
+
+            with open(input_path, "w", encoding="utf-8") as file:
+                file.write("".join(f"{line}\n" for line in lines))
+
+            reporter = ErrorReporter()
+            engine = ENGINES[name](root_node, reporter)
+            thread = threading.Thread(target=run_engine, args=(engine, reporter, out_path, input_path))
+            runs.append((thread, out_path, "".join(f"{i} {line}\n" for i, line in enumerate(lines))))
+
+        for thread, _, _ in runs:
+            thread.start()
+
+        for thread, out_path, expected in runs:
+            thread.join()
+
+            with open(out_path, encoding="utf-8") as file:
+                if file.read() != expected:
+                    raise SystemExit(f"{out_path}: the engines running at once mixed their input or output")
+
+
+def main():
+    check_threads()
+    root_node = check_source(SCRIPT, ErrorReporter())
+    stdout_before = sys.stdout
+
+    for name in ("vm", "pycodegen"):
+        for label in ("print() per call", "buffered"):
+            engine = ENGINES[name](root_node, ErrorReporter())
+
+            #The VM looks its builtins up when it calls them, pycodegen when it runs the program
+            if label == "print() per call":
+                engine.builtins["writeline"] = print_writeline
+
+            try:
+                with open(os.devnull, "w", encoding="utf-8") as devnull:
+                    sys.stdout = devnull
+                    elapsed = best_time(engine.interpret_main, repeat=1)
+            finally:
+                sys.stdout = stdout_before
+
+            print(f"{name:<10} {label:<17} {LINES} lines: {elapsed * 1000:.0f} ms ({elapsed / LINES * 1e6:.2f} us per line)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Typing into a big script: FastLexer.relex against lexing it all again.
+
+Every edit inserts one character a little after the previous one, like an
+editor sending keystrokes. Then the keystrokes alternate between the top
+and the end of the script, each one after the offsets of almost every
+token were moved by the one before it, and the tokens of the re-lexed
+buffer are compared with lexing the script again.
+"""
+
+import random
+import time
+
+from common import generate_program
+
+from akorn.diagnostic import ErrorReporter
+from akorn.scanner import FastLexer
+
+
+def main():
+    random.seed(0)
+    code = generate_program(5000)
+    buffer = FastLexer(code, ErrorReporter()).tokenize_buffer()
+    offset = len(code) // 2
+    keystrokes = 50
+
+    full = 0.0
+    incremental = 0.0
+
+    for _ in range(keystrokes):
+        offset = code.index(" ", offset + 1)
+        inserted = random.choice("abx1 ")
+        code = code[:offset] + inserted + code[offset:]
+
+        start = time.perf_counter()
+        buffer = FastLexer(code, ErrorReporter()).relex(buffer, offset, 0, inserted)
+        incremental += time.perf_counter() - start
+
+        start = time.perf_counter()
+        FastLexer(code, ErrorReporter()).tokenize_buffer()
+        full += time.perf_counter() - start
+
+    print(f"script: {len(code)} characters, {len(buffer)} tokens, {keystrokes} keystrokes")
+    print(f"full re-lex:  {full / keystrokes * 1e3:8.3f} ms/keystroke")
+    print(f"incremental:  {incremental / keystrokes * 1e3:8.3f} ms/keystroke")
+
+    top = code.index(" ", 100)
+    bottom = code.rindex(" ", 0, len(code) - 100)
+    jumping = 0.0
+
+    for keystroke in range(keystrokes):
+        offset = top if keystroke % 2 == 0 else bottom
+        code = code[:offset] + "a" + code[offset:]
+        bottom += 1
+
+        start = time.perf_counter()
+        buffer = FastLexer(code, ErrorReporter()).relex(buffer, offset, 0, "a")
+        jumping += time.perf_counter() - start
+
+    if list(buffer.tokens()) != list(FastLexer(code, ErrorReporter()).tokenize_buffer().tokens()):
+        raise SystemExit("The re-lexed tokens differ from lexing the script again")
+
+    print(f"top and end:  {jumping / keystrokes * 1e3:8.3f} ms/keystroke")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Time of the Semantic pass over a large generated script, the parse is
+done once and not measured.
+
+Pass the number of statements as the first argument (20000 by default).
+"""
+
+import sys
+
+from common import best_time, generate_program
+
+from akorn.cli.pipeline import parse_source
+from akorn.diagnostic import ErrorReporter
+from akorn.semantic import Semantic
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    root_node = parse_source(generate_program(statements), ErrorReporter())
+
+    reporter = ErrorReporter()
+    Semantic(reporter).check_ast(root_node)
+
+    if reporter.has_errors():
+        raise SystemExit(reporter.errors[0])
+
+    elapsed = best_time(lambda: Semantic(ErrorReporter()).check_ast(root_node))
+    print(f"semantic, {statements} statements: {elapsed * 1000:.1f} ms ({elapsed / statements * 1e6:.2f} us per statement)")
+
+
+if __name__ == "__main__":
+    main()
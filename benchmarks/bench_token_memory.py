@@ -0,0 +1,36 @@
+"""Memory per token of the `Token` list against the compact `TokenBuffer`.
+
+Both are measured with tracemalloc while they are alive, the source string
+itself is allocated before the measure starts.
+"""
+
+import tracemalloc
+
+from common import generate_program
+
+from akorn.diagnostic import ErrorReporter
+from akorn.scanner import FastLexer
+
+
+def measure(build):
+    tracemalloc.start()
+    tokens = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(tokens), size
+
+
+def main():
+    print(f"{'tokens':>10} {'list B/token':>14} {'buffer B/token':>16} {'ratio':>7}")
+
+    for statements in (1000, 10000, 50000):
+        code = generate_program(statements)
+
+        count, list_size = measure(lambda: FastLexer(code, ErrorReporter()).tokenize())
+        _, buffer_size = measure(lambda: FastLexer(code, ErrorReporter()).tokenize_buffer())
+
+        print(f"{count:>10} {list_size / count:>14.1f} {buffer_size / count:>16.1f} {list_size / buffer_size:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Run time of a script whose inner loop, three blocks deep, only reads and
+assigns variables declared in the outer blocks.
+
+Every access is a `frames[depth][slot]` index after the Resolver, before it
+was a walk up the scopes hashing the name at every level.
+"""
+
+import io
+from contextlib import redirect_stdout
+
+from common import best_time
+
+from akorn.cli.cmd_akorn import check_source
+from akorn.diagnostic import ErrorReporter
+from akorn.runtime import Interpreter
+
+SCRIPT = """
+var int total = 0
+var int step = 3
+var int i = 0
+while i < 100 {
+    var int j = 0
+    while j < 100 {
+        if j % 2 == 0 {
+            total = total + step * i - j
+        } else {
+            total = total - step + i
+        }
+        j = j + 1
+    }
+    i = i + 1
+}
+writeline(total)
+"""
+
+
+def main():
+    root_node = check_source(SCRIPT, ErrorReporter())
+
+    def run():
+        with redirect_stdout(io.StringIO()):
+            Interpreter(root_node, ErrorReporter()).interpret_main()
+
+    elapsed = best_time(run)
+    print(f"10000 iterations of the inner loop: {elapsed * 1000:.1f} ms ({elapsed / 10000 * 1e6:.2f} us per iteration)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Helpers shared by the benchmark scripts.
+
+Run the scripts from the repository root, e.g. `python benchmarks/bench_normalizer.py`;
+the `src` directory is put on the path so the package does not need to be installed.
+"""
+
+import io
+import pathlib
+import sys
+import time
+from contextlib import redirect_stdout
+from unittest import mock
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+
+def generate_program(statements: int) -> str:
+    """Akorn script in newline style with comments and blank lines between
+    the statements, like the machine generated ones"""
+
+    parts = []
+
+    for i in range(statements):
+        parts.append(
+            f"// statement {i}\n"
+            f"var int value_{i} = ({i} + 2) * 3 - {i} % 7\n"
+            f"\n"
+            f"/* check the value\n   of statement {i} */\n"
+            f"if value_{i} >= 10 and not value_{i} == 12\n"
+            f"{{\n"
+            f"    value_{i} += 1\n"
+            f"}}\n"
+            f"\n"
+        )
+
+    return "".join(parts)
+
+
+def best_time(function, repeat: int = 3) -> float:
+    """Best wall time in seconds of `repeat` calls"""
+
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def run_script(make_engine, stdin: str) -> str:
+    """What the engine of `make_engine()` prints when it runs with `stdin`.
+    The engine is made here, so timing this includes compiling the program
+    for the engines that compile it."""
+
+    output = io.StringIO()
+
+    with redirect_stdout(output), mock.patch("sys.stdin", io.StringIO(stdin)):
+        try:
+            make_engine().interpret_main()
+        except EOFError:
+            #The scripts that loop until there is no more input
+            pass
+
+    return output.getvalue()
+
+
+def count_nodes(node) -> int:
+    """Number of AST nodes reachable from `node`"""
+
+    from akorn.ast import Node
+
+    if isinstance(node, (list, tuple)):
+        return sum(count_nodes(item) for item in node)
+
+    if not isinstance(node, Node):
+        return 0
+
+    names = getattr(node, "fields", None) or vars(node)
+    return 1 + sum(count_nodes(getattr(node, name)) for name in names)
@@ -1 +1,2 @@
-from .nodes import *
\ No newline at end of file
+from .nodes import *
+from .flat_ast import FlatAst, NodeCursor, NODE_KINDS
\ No newline at end of file
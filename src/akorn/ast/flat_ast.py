@@ -0,0 +1,567 @@
+from array import array
+from typing import Iterator
+from .nodes import *
+
+#Every node class has a kind code, its index in this tuple
+NODE_KINDS = (
+    ProgramNode,
+    BlockNode,
+    DeclarationNode,
+    AssignmentNode,
+    CallNode,
+    IfNode,
+    ElseNode,
+    WhileNode,
+    BreakStatement,
+    ContinueStatement,
+    IntNode,
+    FloatNode,
+    StringNode,
+    BoolNode,
+    NoneNode,
+    VariableNode,
+    UnaryNode,
+    NotBooleanNode,
+    BinaryOpNode,
+    ComparisonOpNode,
+    BooleanOpNode,
+)
+
+NO_NODE = -1
+
+#Codes of the static types found by Semantic, -1 when there is none
+STATIC_TYPES = ("none", "int", "float", "string", "bool")
+
+#Kinds whose static type is stored in each node, for the rest it is a class attribute
+TYPED_KINDS = frozenset(kind for kind in NODE_KINDS if "static_type" in kind.__slots__)
+
+#Kinds with the (depth, slot) address of the Resolver, and the ones with a frame
+ADDRESSED_KINDS = frozenset((VariableNode, AssignmentNode, DeclarationNode))
+FRAME_KINDS = frozenset((ProgramNode, BlockNode))
+
+
+class NodeCursor:
+    """Node read from a row of a `FlatAst`.
+    \nIt has the attributes of the node class it stands for (`kind`), so
+    print_ast and the interpreter can read it like a node. Children are
+    returned as new cursors and values are read from the pools of the
+    table, nothing of the original tree is rebuilt."""
+
+    __slots__ = ("ast", "index", "kind")
+
+    def __init__(self, ast: "FlatAst", index: int) -> None:
+        self.ast = ast
+        self.index = index
+        self.kind: type[Node] = NODE_KINDS[ast.kinds[index]]
+
+    def children(self) -> Iterator["NodeCursor"]:
+        ast = self.ast
+        child = ast.first_child[self.index]
+
+        while child != NO_NODE:
+            yield NodeCursor(ast, child)
+            child = ast.next_sibling[child]
+
+    def child(self, position: int = 0) -> "NodeCursor":
+        ast = self.ast
+        child = ast.first_child[self.index]
+
+        for _ in range(position):
+            child = ast.next_sibling[child]
+
+        return NodeCursor(ast, child)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return self.kind.fields
+
+    @property
+    def line(self) -> int:
+        return self.ast.lines[self.index]
+
+    @property
+    def column(self) -> int:
+        return self.ast.columns[self.index]
+
+    @property
+    def static_type(self) -> str | None:
+        code = self.ast.static_types[self.index]
+        return STATIC_TYPES[code] if code >= 0 else None
+
+    @property
+    def depth(self) -> int:
+        return self.ast.depths[self.index]
+
+    @property
+    def slot(self) -> int:
+        return self.ast.slots[self.index]
+
+    @property
+    def size(self) -> int:
+        return self.ast.slots[self.index]
+
+    @property
+    def operation(self):
+        return self.ast.operations[self.index]
+
+    @property
+    def operand(self):
+        return self.ast.operand_at(self.index)
+
+    @property
+    def value(self):
+        kind = self.kind
+
+        if kind is DeclarationNode or kind is AssignmentNode:
+            return self.child()
+
+        if kind is NoneNode:
+            return NoneNode.value
+
+        return self.operand
+
+    @property
+    def type(self) -> str:
+        if self.kind is DeclarationNode:
+            return self.operand[1]
+
+        return self.kind.type
+
+    @property
+    def mutable(self) -> bool:
+        return self.operand[2]
+
+    @property
+    def name(self) -> str:
+        if self.kind is DeclarationNode:
+            return self.operand[0]
+
+        return self.operand
+
+    @property
+    def calle(self) -> str:
+        return self.operand
+
+    @property
+    def operator(self) -> str:
+        return self.operand
+
+    @property
+    def scope(self):
+        return self.operand
+
+    @property
+    def label(self) -> str:
+        label = self.kind.label
+
+        #The labels of the operations are properties of the node class
+        if isinstance(label, property):
+            return label.fget(self)
+
+        return label
+
+    @property
+    def node(self) -> "NodeCursor":
+        return self.child()
+
+    @property
+    def left(self) -> "NodeCursor":
+        return self.child()
+
+    @property
+    def right(self) -> "NodeCursor":
+        return self.child(1)
+
+    @property
+    def condition(self) -> "NodeCursor":
+        return self.child()
+
+    @property
+    def block(self) -> "NodeCursor":
+        if self.kind is WhileNode:
+            return self.child(1)
+
+        return self.child()
+
+    @property
+    def statements(self) -> list["NodeCursor"]:
+        return list(self.children())
+
+    @property
+    def args(self) -> list["NodeCursor"]:
+        return list(self.children())
+
+    @property
+    def branches(self) -> list[tuple["NodeCursor", "NodeCursor"]]:
+        children = list(self.children())
+        return [(children[i], children[i + 1]) for i in range(0, len(children) - 1, 2)]
+
+    @property
+    def else_node(self) -> "NodeCursor":
+        *_, else_node = self.children()
+        return else_node
+
+    def __repr__(self):
+        return f"<{__class__.__name__} kind={self.kind.__name__} index={self.index}>"
+
+
+class FlatAst:
+    """AST stored as one table of parallel arrays, a row per node: the kind
+    code, the rows of the first child and of the next sibling (-1 if there
+    is none), the line, the column, the operand, the code of the static
+    type of the expressions (see `STATIC_TYPES`) and the depth and slot
+    that the Resolver gives to variables, or the depth and frame size of
+    programs and blocks (-1 for the rest).
+    \nThe operand is an index into a pool that depends on the kind: `names`
+    for variables, callees and operators, `constants` for the values of the
+    literals and the (name, type, mutable) of the declarations, and `scopes`
+    for programs and blocks. Names and constants are interned. The children
+    are the fields that hold nodes, in order; the last child of an `IfNode`
+    is its else node and the ones before are the (condition, block) pairs
+    of its branches.
+    \nThe rows are in pre-order, the root is row 0."""
+
+    def __init__(self) -> None:
+        self.kinds = array('B')
+        self.first_child = array('i')
+        self.next_sibling = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.operands = array('i')
+        self.static_types = array('b')
+        self.depths = array('h')
+        self.slots = array('i')
+        self.names: list[str] = []
+        self.constants: list = []
+        self.scopes: list = []
+        #Picked by the tree walker for each operation row, it is not pickled
+        self.operations: list = []
+        self.name_indexes: dict[str, int] = {}
+        self.constant_indexes: dict[tuple, int] = {}
+        self.kind_codes = {kind: code for code, kind in enumerate(NODE_KINDS)}
+        self.static_type_codes = {static_type: code for code, static_type in enumerate(STATIC_TYPES)}
+
+        self.encoders = {
+            ProgramNode: self.encode_block,
+            BlockNode: self.encode_block,
+            DeclarationNode: self.encode_declaration,
+            AssignmentNode: self.encode_assignment,
+            CallNode: self.encode_call,
+            IfNode: self.encode_if,
+            ElseNode: self.encode_else,
+            WhileNode: self.encode_while,
+            BreakStatement: self.encode_leaf,
+            ContinueStatement: self.encode_leaf,
+            IntNode: self.encode_literal,
+            FloatNode: self.encode_literal,
+            StringNode: self.encode_literal,
+            BoolNode: self.encode_literal,
+            NoneNode: self.encode_leaf,
+            VariableNode: self.encode_variable,
+            UnaryNode: self.encode_unary,
+            NotBooleanNode: self.encode_not,
+            BinaryOpNode: self.encode_operation,
+            ComparisonOpNode: self.encode_operation,
+            BooleanOpNode: self.encode_operation,
+        }
+
+        self.decoders = {
+            ProgramNode: self.decode_block,
+            BlockNode: self.decode_block,
+            DeclarationNode: self.decode_declaration,
+            AssignmentNode: self.decode_assignment,
+            CallNode: self.decode_call,
+            IfNode: self.decode_if,
+            ElseNode: self.decode_else,
+            WhileNode: self.decode_while,
+            BreakStatement: self.decode_statement,
+            ContinueStatement: self.decode_statement,
+            IntNode: self.decode_literal,
+            FloatNode: self.decode_literal,
+            StringNode: self.decode_literal,
+            BoolNode: self.decode_literal,
+            NoneNode: self.decode_none,
+            VariableNode: self.decode_variable,
+            UnaryNode: self.decode_unary,
+            NotBooleanNode: self.decode_not,
+            BinaryOpNode: self.decode_operation,
+            ComparisonOpNode: self.decode_operation,
+            BooleanOpNode: self.decode_operation,
+        }
+
+
+    @classmethod
+    def from_tree(cls, root: ProgramNode) -> "FlatAst":
+        flat_ast = cls()
+        flat_ast.convert(root)
+        return flat_ast
+
+
+    def intern_name(self, name: str) -> int:
+        index = self.name_indexes.get(name)
+
+        if index is None:
+            index = self.name_indexes[name] = len(self.names)
+            self.names.append(name)
+
+        return index
+
+
+    def intern_constant(self, value) -> int:
+        #1, 1.0 and True are equal, the type keeps them apart
+        key = (type(value), value)
+        index = self.constant_indexes.get(key)
+
+        if index is None:
+            index = self.constant_indexes[key] = len(self.constants)
+            self.constants.append(value)
+
+        return index
+
+
+    def add_scope(self, scope) -> int:
+        self.scopes.append(scope)
+        return len(self.scopes) - 1
+
+
+    def encode_block(self, node: ProgramNode | BlockNode) -> tuple[int, list]:
+        return self.add_scope(node.scope), node.statements
+
+
+    def encode_declaration(self, node: DeclarationNode) -> tuple[int, list]:
+        return self.intern_constant((node.name, node.type, node.mutable)), [node.value]
+
+
+    def encode_assignment(self, node: AssignmentNode) -> tuple[int, list]:
+        return self.intern_name(node.name), [node.value]
+
+
+    def encode_call(self, node: CallNode) -> tuple[int, list]:
+        return self.intern_name(node.calle), node.args
+
+
+    def encode_if(self, node: IfNode) -> tuple[int, list]:
+        children = [child for branch in node.branches for child in branch]
+        children.append(node.else_node)
+        return NO_NODE, children
+
+
+    def encode_else(self, node: ElseNode) -> tuple[int, list]:
+        return NO_NODE, [node.block]
+
+
+    def encode_while(self, node: WhileNode) -> tuple[int, list]:
+        return NO_NODE, [node.condition, node.block]
+
+
+    def encode_leaf(self, node: Node) -> tuple[int, list]:
+        return NO_NODE, []
+
+
+    def encode_literal(self, node: LiteralNode) -> tuple[int, list]:
+        return self.intern_constant(node.value), []
+
+
+    def encode_variable(self, node: VariableNode) -> tuple[int, list]:
+        return self.intern_name(node.name), []
+
+
+    def encode_unary(self, node: UnaryNode) -> tuple[int, list]:
+        return self.intern_name(node.operator), [node.node]
+
+
+    def encode_not(self, node: NotBooleanNode) -> tuple[int, list]:
+        return NO_NODE, [node.node]
+
+
+    def encode_operation(self, node: BinaryOpNode | ComparisonOpNode | BooleanOpNode) -> tuple[int, list]:
+        return self.intern_name(node.operator), [node.left, node.right]
+
+
+    def convert(self, root: Node) -> None:
+        """Appends the rows of the tree under `root` in pre-order.
+        \nThe tree is walked with a stack instead of recursion, so long chains
+        of operations do not hit the recursion limit."""
+
+        last_child = []
+        pending = [(root, NO_NODE)]
+
+        while pending:
+            node, parent = pending.pop()
+            operand, children = self.encoders[node.__class__](node)
+            row = len(self.kinds)
+
+            self.kinds.append(self.kind_codes[node.__class__])
+            self.first_child.append(NO_NODE)
+            self.next_sibling.append(NO_NODE)
+            self.lines.append(getattr(node, "line", 0))
+            self.columns.append(getattr(node, "column", 0))
+            self.operands.append(operand)
+            self.static_types.append(self.static_type_codes.get(getattr(node, "static_type", None), -1))
+            self.depths.append(getattr(node, "depth", -1))
+            self.slots.append(node.size if node.__class__ in FRAME_KINDS else getattr(node, "slot", -1))
+            last_child.append(NO_NODE)
+
+            if parent != NO_NODE:
+                if last_child[parent] == NO_NODE:
+                    self.first_child[parent] = row
+                else:
+                    self.next_sibling[last_child[parent]] = row
+
+                last_child[parent] = row
+
+            for child in reversed(children):
+                pending.append((child, row))
+
+
+    def operand_at(self, index: int):
+        kind = NODE_KINDS[self.kinds[index]]
+        operand = self.operands[index]
+
+        if operand == NO_NODE:
+            return None
+
+        if kind is ProgramNode or kind is BlockNode:
+            return self.scopes[operand]
+
+        if kind is DeclarationNode or issubclass(kind, LiteralNode):
+            return self.constants[operand]
+
+        return self.names[operand]
+
+
+    def decode_block(self, kind: type[Node], row: int, children: list[Node]) -> ProgramNode | BlockNode:
+        return kind(children, self.scopes[self.operands[row]])
+
+
+    def decode_declaration(self, kind: type[Node], row: int, children: list[Node]) -> DeclarationNode:
+        name, data_type, mutable = self.constants[self.operands[row]]
+        return DeclarationNode(name, data_type, mutable, children[0])
+
+
+    def decode_assignment(self, kind: type[Node], row: int, children: list[Node]) -> AssignmentNode:
+        return AssignmentNode(self.names[self.operands[row]], children[0])
+
+
+    def decode_call(self, kind: type[Node], row: int, children: list[Node]) -> CallNode:
+        return CallNode(self.names[self.operands[row]], children, self.lines[row], self.columns[row])
+
+
+    def decode_if(self, kind: type[Node], row: int, children: list[Node]) -> IfNode:
+        branches = [(children[i], children[i + 1]) for i in range(0, len(children) - 1, 2)]
+        return IfNode(branches, children[-1])
+
+
+    def decode_else(self, kind: type[Node], row: int, children: list[Node]) -> ElseNode:
+        return ElseNode(children[0])
+
+
+    def decode_while(self, kind: type[Node], row: int, children: list[Node]) -> WhileNode:
+        return WhileNode(children[0], children[1])
+
+
+    def decode_statement(self, kind: type[Node], row: int, children: list[Node]) -> BreakStatement | ContinueStatement:
+        return kind()
+
+
+    def decode_literal(self, kind: type[Node], row: int, children: list[Node]) -> LiteralNode:
+        return kind(self.constants[self.operands[row]], self.lines[row], self.columns[row])
+
+
+    def decode_none(self, kind: type[Node], row: int, children: list[Node]) -> NoneNode:
+        return NoneNode(self.lines[row], self.columns[row])
+
+
+    def decode_variable(self, kind: type[Node], row: int, children: list[Node]) -> VariableNode:
+        return VariableNode(self.names[self.operands[row]], self.lines[row], self.columns[row])
+
+
+    def decode_unary(self, kind: type[Node], row: int, children: list[Node]) -> UnaryNode:
+        return UnaryNode(self.names[self.operands[row]], children[0])
+
+
+    def decode_not(self, kind: type[Node], row: int, children: list[Node]) -> NotBooleanNode:
+        return NotBooleanNode(children[0])
+
+
+    def decode_operation(self, kind: type[Node], row: int, children: list[Node]) -> BinaryOpNode | ComparisonOpNode | BooleanOpNode:
+        return kind(children[0], self.names[self.operands[row]], children[1])
+
+
+    def to_tree(self) -> ProgramNode:
+        """Builds the node objects of the table back.
+        \nThe rows are read from the last one, in pre-order the children of a
+        row always come after it, so they are built before their parent."""
+
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        nodes: list[Node] = [None] * len(self.kinds)
+
+        for row in range(len(self.kinds) - 1, -1, -1):
+            children = []
+            child = first_child[row]
+
+            while child != NO_NODE:
+                children.append(nodes[child])
+                nodes[child] = None
+                child = next_sibling[child]
+
+            kind = NODE_KINDS[self.kinds[row]]
+            node = nodes[row] = self.decoders[kind](kind, row, children)
+
+            if kind in TYPED_KINDS and self.static_types[row] >= 0:
+                node.static_type = STATIC_TYPES[self.static_types[row]]
+
+            if kind in ADDRESSED_KINDS:
+                node.depth, node.slot = self.depths[row], self.slots[row]
+            elif kind in FRAME_KINDS:
+                node.depth, node.size = self.depths[row], self.slots[row]
+
+        return nodes[0]
+
+
+    def __getstate__(self) -> dict:
+        """Only the table and the pools are pickled, the rest is rebuilt"""
+
+        return {
+            "kinds": self.kinds,
+            "first_child": self.first_child,
+            "next_sibling": self.next_sibling,
+            "lines": self.lines,
+            "columns": self.columns,
+            "operands": self.operands,
+            "static_types": self.static_types,
+            "depths": self.depths,
+            "slots": self.slots,
+            "names": self.names,
+            "constants": self.constants,
+            "scopes": self.scopes,
+        }
+
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__()
+        self.__dict__.update(state)
+        self.name_indexes = {name: index for index, name in enumerate(self.names)}
+        self.constant_indexes = {(type(value), value): index for index, value in enumerate(self.constants)}
+
+
+    def operation_rows(self) -> Iterator[tuple[int, str, str]]:
+        """(row, operator, static type of the left operand) of the
+        arithmetic operations and comparisons"""
+
+        binary_code = self.kind_codes[BinaryOpNode]
+        comparison_code = self.kind_codes[ComparisonOpNode]
+
+        for row, code in enumerate(self.kinds):
+            if code == binary_code or code == comparison_code:
+                left_type = self.static_types[self.first_child[row]]
+                yield row, self.names[self.operands[row]], STATIC_TYPES[left_type] if left_type >= 0 else None
+
+
+    def root(self) -> NodeCursor:
+        return NodeCursor(self, 0)
+
+
+    def __len__(self) -> int:
+        return len(self.kinds)
\ No newline at end of file
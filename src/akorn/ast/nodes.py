@@ -1,4 +1,32 @@
 class Node:
+    """Base of the AST nodes.
+    \nNodes are slotted: the per-node data lives in `__slots__`, the data
+    shared by every node of a class (`type` of the literals, constant
+    labels) is a class attribute and the labels built from the node are
+    properties. `fields` lists the attributes that print_ast shows, in
+    order.
+    \nExpression nodes have the `static_type` that Semantic infers for them,
+    a class attribute for literals and None until Semantic runs for the
+    rest.
+    \nVariables, assignments and declarations have the (`depth`, `slot`)
+    address that the Resolver gives them, and programs and blocks their
+    `depth` and the `size` of their frame; -1 until the Resolver runs.
+    \nArithmetic operations and comparisons have the `operation` the tree
+    walker picked for their operator and operand types, None until it
+    loads the program."""
+    
+    __slots__ = ()
+    fields: tuple[str, ...] = ()
+    
+    #Class of the node, the `NodeCursor` of a flat AST has the same attribute.
+    #It is a class attribute instead of a property because the passes read it
+    #for every node they visit
+    kind: type["Node"]
+    
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.kind = cls
+    
     def __repr__() -> str:
         return f"<{__class__.__name__}>"
 
@@ -14,14 +42,18 @@ AKORN_NONE = NoneValue()
 
 
 class NoneNode(Node):
+    __slots__ = ("line", "column")
+    fields = ("value", "type", "line", "column")
+    value = AKORN_NONE
+    type = "none"
+    static_type = "none"
+    
     def __init__(
         self,
         line: int,
         column: int
         ):
         
-        self.value = AKORN_NONE
-        self.type = "none"
         self.line = line
         self.column = column
         
@@ -30,6 +62,9 @@ class NoneNode(Node):
   
         
 class LiteralNode(Node):
+    __slots__ = ("value", "line", "column")
+    fields = ("value", "line", "column")
+    
     def __init__(
         self, 
         value, 
@@ -43,6 +78,12 @@ class LiteralNode(Node):
 
 
 class IntNode(LiteralNode):
+    __slots__ = ()
+    fields = ("value", "type", "line", "column", "label")
+    type = "int"
+    static_type = "int"
+    label = "integer 64-bits"
+    
     def __init__(
         self,
         value: int,
@@ -51,16 +92,20 @@ class IntNode(LiteralNode):
         ) -> None:
         
         self.value = value
-        self.type = "int"
         self.line = line
         self.column = column
-        self.label = "integer 64-bits"
         
     def __repr__(self) -> str:
         return f"<{__class__.__name__} value={self.value}>"
 
 
 class FloatNode(LiteralNode):
+    __slots__ = ()
+    fields = ("value", "type", "line", "column", "label")
+    type = "float"
+    static_type = "float"
+    label = "float 64-bits"
+    
     def __init__(
         self,
         value: float,
@@ -69,16 +114,20 @@ class FloatNode(LiteralNode):
         ) -> None:
         
         self.value = value
-        self.type = "float"
         self.line = line
         self.column = column
-        self.label = "float 64-bits"
         
     def __repr__(self) -> str:
         return f"<{__class__.__name__} value={self.value}>"
 
 
 class StringNode(LiteralNode):
+    __slots__ = ()
+    fields = ("value", "type", "line", "column", "label")
+    type = "string"
+    static_type = "string"
+    label = "string literal"
+    
     def __init__(
         self,
         value: str,
@@ -87,16 +136,20 @@ class StringNode(LiteralNode):
         ) -> None:
         
         self.value = value
-        self.type = "string"
         self.line = line
         self.column = column
-        self.label = "string literal"
         
     def __repr__(self):
         return f'<{__class__.__name__} value="{self.value}">'
 
 
 class BoolNode(LiteralNode):
+    __slots__ = ()
+    fields = ("value", "type", "line", "column", "label")
+    type = "bool"
+    static_type = "bool"
+    label = "boolean value"
+    
     def __init__(
         self,
         value: bool,
@@ -105,16 +158,18 @@ class BoolNode(LiteralNode):
         ) -> None:
         
         self.value = value
-        self.type = "bool"
         self.line = line
         self.column = column
-        self.label = "boolean value"
         
     def __repr__(self):
         return f"<{__class__.__name__} value={self.value}>"
 
 
 class UnaryNode(Node):
+    __slots__ = ("operator", "node", "line", "column", "static_type")
+    fields = ("operator", "node", "line", "column", "label")
+    label = "negative unary"
+    
     def __init__(
         self,
         operator:str,
@@ -125,13 +180,17 @@ class UnaryNode(Node):
         self.node = node
         self.line = node.line
         self.column = node.column
-        self.label = "negative unary"
+        self.static_type: str | None = None
         
     def __repr__(self) -> str:
         return f"<{__class__.__name__} operator={self.operator} value={self.node})>"
 
 
 class NotBooleanNode(Node):
+    __slots__ = ("node", "line", "column", "static_type")
+    fields = ("node", "line", "column", "label")
+    label = "boolean operation not"
+    
     def __init__(
         self,
         node: Node
@@ -140,13 +199,16 @@ class NotBooleanNode(Node):
         self.node = node
         self.line = self.node.line
         self.column = self.node.column
-        self.label = "boolean operation not"
+        self.static_type: str | None = None
         
     def __repr__(self):
         return f"<{__class__.__name__} value={self.node}"
 
 
 class BooleanOpNode(Node):
+    __slots__ = ("left", "operator", "right", "line", "column", "static_type")
+    fields = ("left", "operator", "right", "line", "column", "label")
+    
     def __init__(
         self,
         left: Node,
@@ -159,13 +221,20 @@ class BooleanOpNode(Node):
         self.right = right
         self.line = self.left.line
         self.column = self.left.column
-        self.label = f"Boolean operation '{self.operator}'"
+        self.static_type: str | None = None
+
+    @property
+    def label(self) -> str:
+        return f"Boolean operation '{self.operator}'"
         
     def __repr__(self):
         return f"<{__class__.__name__} left={self.left} operator={self.operator}, right={self.right}"
 
 
 class ComparisonOpNode(Node):
+    __slots__ = ("left", "operator", "right", "line", "column", "static_type", "operation")
+    fields = ("left", "operator", "right", "line", "column", "label")
+    
     def __init__(
         self,
         left: Node,
@@ -178,13 +247,21 @@ class ComparisonOpNode(Node):
         self.right = right
         self.line: int = left.line
         self.column: int = left.column
-        self.label = f"comparison operation {self.operator}"
+        self.static_type: str | None = None
+        self.operation = None
+
+    @property
+    def label(self) -> str:
+        return f"comparison operation {self.operator}"
         
     def __repr__(self):
         return f"<{__class__.__name__} left={self.left} operator={self.operator} right={self.right}"
 
 
 class BinaryOpNode(Node):
+    __slots__ = ("left", "operator", "right", "line", "column", "static_type", "operation")
+    fields = ("left", "operator", "right", "line", "column", "label")
+    
     def __init__(
         self,
         left:Node,
@@ -197,13 +274,22 @@ class BinaryOpNode(Node):
         self.right = right
         self.line: int = left.line
         self.column: int = left.column
-        self.label = f"arithmetic operation {self.operator}"
+        self.static_type: str | None = None
+        self.operation = None
+
+    @property
+    def label(self) -> str:
+        return f"arithmetic operation {self.operator}"
         
     def __repr__(self) -> str:
         return f"<{__class__.__name__} left={self.left} operator={self.operator} right={self.right}>"
 
 
 class VariableNode(Node):
+    __slots__ = ("name", "line", "column", "static_type", "depth", "slot")
+    fields = ("name", "line", "column", "label")
+    label = "variable"
+    
     def __init__(
         self,
         name: str,
@@ -214,13 +300,18 @@ class VariableNode(Node):
         self.name = name
         self.line = line
         self.column = column
-        self.label = "variable"
+        self.static_type: str | None = None
+        self.depth = -1
+        self.slot = -1
     
     def __repr__(self) -> str:
         return f"<{__class__.__name__} name={self.name}>"
   
         
 class AssignmentNode(Node):
+    __slots__ = ("name", "value", "line", "column", "depth", "slot")
+    fields = ("name", "value", "line", "column")
+    
     def __init__(
         self,
         name: str,
@@ -231,12 +322,17 @@ class AssignmentNode(Node):
         self.value = value
         self.line = self.value.line
         self.column = self.value.column
+        self.depth = -1
+        self.slot = -1
         
     def __repr__(self) -> str:
         return f"<{__class__.__name__} name={self.name} value={self.value}>"
 
 
 class DeclarationNode(Node):
+    __slots__ = ("name", "type", "value", "line", "column", "mutable", "depth", "slot")
+    fields = ("name", "type", "value", "line", "column", "mutable")
+    
     def __init__(
         self,
         name: str,
@@ -251,12 +347,17 @@ class DeclarationNode(Node):
         self.line = self.value.line
         self.column = self.value.column
         self.mutable = mutable
+        self.depth = -1
+        self.slot = -1
         
     def __repr__(self):
         return f"<{__class__.__name__} type={self.type} name={self.name} value={self.value}>"
 
 
 class ElseNode(Node):
+    __slots__ = ("block",)
+    fields = ("block",)
+    
     def __init__(
         self,
         block
@@ -269,6 +370,9 @@ class ElseNode(Node):
   
   
 class IfNode(Node):
+    __slots__ = ("branches", "else_node")
+    fields = ("branches", "else_node")
+    
     def __init__(
         self,
         branches,
@@ -283,16 +387,23 @@ class IfNode(Node):
 
 
 class BreakStatement(Node):
+    __slots__ = ()
+    
     def __repr__():
         return f"<{__class__.__name__}"
 
 
 class ContinueStatement(Node):
+    __slots__ = ()
+    
     def __repr__():
         return f"<{__class__.__name__}>"
 
 
 class WhileNode(Node):
+    __slots__ = ("condition", "block")
+    fields = ("condition", "block")
+    
     def __init__(
         self,
         cond,
@@ -308,20 +419,32 @@ class WhileNode(Node):
    
              
 class CallNode(Node):
+    __slots__ = ("calle", "args", "line", "column", "static_type")
+    fields = ("calle", "args")
+    label = "function call"
+    
     def __init__(
         self,
         callee: str,
-        args: list[Node]
+        args: list[Node],
+        line: int,
+        column: int
         ) -> None:
         
         self.calle = callee
         self.args = args
+        self.line = line
+        self.column = column
+        self.static_type: str | None = None
         
     def __repr__(self):
         return f"<{__class__.__name__} calle={self.calle} args={self.args}"
 
 
 class BlockNode(Node):
+    __slots__ = ("statements", "scope", "depth", "size")
+    fields = ("statements", "scope")
+    
     def __init__(
         self,
         statements: list[Node],
@@ -330,12 +453,17 @@ class BlockNode(Node):
         
         self.statements = statements
         self.scope = scope
+        self.depth = -1
+        self.size = -1
         
     def __repr__(self):
         return f"{__class__.__name__} statements={self.statements} scope={self.scope}"
 
 
 class ProgramNode(Node):
+    __slots__ = ("statements", "scope", "depth", "size")
+    fields = ("statements", "scope")
+    
     def __init__(
         self,
         statements: list[Node],
@@ -344,6 +472,8 @@ class ProgramNode(Node):
         
         self.statements = statements
         self.scope = scope
+        self.depth = -1
+        self.size = -1
         
     def __repr__(self):
         return f"<{__class__.__name__} statements={self.statements}>"
\ No newline at end of file
@@ -0,0 +1,4 @@
+from .ccodegen import CCodegen
+from .native import find_c_compiler, default_output, compile_c
+
+__all__ = ["CCodegen", "find_c_compiler", "default_output", "compile_c"]
\ No newline at end of file
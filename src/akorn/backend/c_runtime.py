@@ -0,0 +1,338 @@
+#Runtime that `CCodegen` puts at the start of every C program: the values
+#are printed like Python prints them and the errors are the ones of the
+#tree walker, a 64-bit int that overflows is an OverflowError
+C_RUNTIME = r"""#define _POSIX_C_SOURCE 200809L
+#include <ctype.h>
+#include <inttypes.h>
+#include <math.h>
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#ifdef _WIN32
+#include <io.h>
+#define akorn_isatty _isatty
+#else
+#include <unistd.h>
+#define akorn_isatty isatty
+#endif
+
+#if defined(__GNUC__) || defined(__clang__)
+#define akorn_add_overflows(a, b, result) __builtin_add_overflow(a, b, result)
+#define akorn_sub_overflows(a, b, result) __builtin_sub_overflow(a, b, result)
+#define akorn_mul_overflows(a, b, result) __builtin_mul_overflow(a, b, result)
+#else
+static bool akorn_add_overflows(int64_t a, int64_t b, int64_t *result) {
+    if ((b > 0 && a > INT64_MAX - b) || (b < 0 && a < INT64_MIN - b)) return true;
+    *result = a + b;
+    return false;
+}
+
+static bool akorn_sub_overflows(int64_t a, int64_t b, int64_t *result) {
+    if ((b < 0 && a > INT64_MAX + b) || (b > 0 && a < INT64_MIN + b)) return true;
+    *result = a - b;
+    return false;
+}
+
+static bool akorn_mul_overflows(int64_t a, int64_t b, int64_t *result) {
+    if (a != 0 && b != 0) {
+        if ((a == -1 && b == INT64_MIN) || (b == -1 && a == INT64_MIN)) return true;
+        if (a != -1 && b != -1 && (a * b) / b != a) return true;
+    }
+    *result = a * b;
+    return false;
+}
+#endif
+
+static void akorn_error(const char *kind, int line, int column, const char *message) {
+    printf("[%s][line: %d, col: %d] %s\n\n", kind, line, column, message);
+    exit(1);
+}
+
+static void akorn_overflow(int line, int column) {
+    akorn_error("OverflowError", line, column, "The result does not fit in an integer of 64 bits");
+}
+
+static void akorn_divide_by_zero(int line, int column) {
+    akorn_error("ZeroDivisionError", line, column, "You cannot divide a number by zero");
+}
+
+static void akorn_modulo_by_zero(int line, int column) {
+    akorn_error("ZeroDivisionError", line, column, "You cannot find the modulus of a number divided by zero");
+}
+
+static inline int64_t akorn_add(int64_t a, int64_t b, int line, int column) {
+    int64_t result;
+    if (akorn_add_overflows(a, b, &result)) akorn_overflow(line, column);
+    return result;
+}
+
+static inline int64_t akorn_sub(int64_t a, int64_t b, int line, int column) {
+    int64_t result;
+    if (akorn_sub_overflows(a, b, &result)) akorn_overflow(line, column);
+    return result;
+}
+
+static inline int64_t akorn_mul(int64_t a, int64_t b, int line, int column) {
+    int64_t result;
+    if (akorn_mul_overflows(a, b, &result)) akorn_overflow(line, column);
+    return result;
+}
+
+static inline int64_t akorn_neg(int64_t a, int line, int column) {
+    if (a == INT64_MIN) akorn_overflow(line, column);
+    return -a;
+}
+
+/* Division and modulus round to minus infinity, like Python */
+static inline int64_t akorn_div(int64_t a, int64_t b, int line, int column) {
+    if (b == 0) akorn_divide_by_zero(line, column);
+    if (a == INT64_MIN && b == -1) akorn_overflow(line, column);
+    int64_t quotient = a / b;
+    if (a % b != 0 && ((a < 0) != (b < 0))) quotient -= 1;
+    return quotient;
+}
+
+static inline int64_t akorn_mod(int64_t a, int64_t b, int line, int column) {
+    if (b == 0) akorn_modulo_by_zero(line, column);
+    if (b == -1) return 0;
+    int64_t remainder = a % b;
+    if (remainder != 0 && ((remainder < 0) != (b < 0))) remainder += b;
+    return remainder;
+}
+
+static int64_t akorn_pow(int64_t base, int64_t exponent, int line, int column) {
+    if (exponent < 0) {
+        akorn_error("ValueError", line, column, "A negative exponent of an int gives a float, it is not supported in a native build");
+    }
+    int64_t result = 1;
+    while (exponent > 0) {
+        if (exponent & 1) result = akorn_mul(result, base, line, column);
+        exponent >>= 1;
+        if (exponent > 0) base = akorn_mul(base, base, line, column);
+    }
+    return result;
+}
+
+static inline double akorn_fdiv(double a, double b, int line, int column) {
+    if (b == 0.0) akorn_divide_by_zero(line, column);
+    return a / b;
+}
+
+static inline double akorn_fmod(double a, double b, int line, int column) {
+    if (b == 0.0) akorn_modulo_by_zero(line, column);
+    double remainder = fmod(a, b);
+    if (remainder != 0.0) {
+        if ((remainder < 0.0) != (b < 0.0)) remainder += b;
+    } else {
+        remainder = copysign(0.0, b);
+    }
+    return remainder;
+}
+
+/* The shortest digits that read back as the same double, laid out like Python's repr */
+static void akorn_format_float(double value, char *out) {
+    if (isnan(value)) { strcpy(out, "nan"); return; }
+    if (isinf(value)) { strcpy(out, value > 0 ? "inf" : "-inf"); return; }
+
+    char buffer[40];
+    for (int precision = 1; precision <= 17; precision++) {
+        snprintf(buffer, sizeof buffer, "%.*e", precision - 1, value);
+        if (strtod(buffer, NULL) == value) break;
+    }
+
+    char digits[24];
+    int count = 0;
+    char *cursor = buffer;
+    if (*cursor == '-') *out++ = *cursor++;
+    for (; *cursor != 'e'; cursor++) {
+        if (*cursor != '.') digits[count++] = *cursor;
+    }
+    int exponent = atoi(cursor + 1);
+    while (count > 1 && digits[count - 1] == '0') count--;
+
+    if (exponent < -4 || exponent >= 16) {
+        *out++ = digits[0];
+        if (count > 1) {
+            *out++ = '.';
+            memcpy(out, digits + 1, count - 1);
+            out += count - 1;
+        }
+        sprintf(out, "e%c%02d", exponent < 0 ? '-' : '+', exponent < 0 ? -exponent : exponent);
+        return;
+    }
+
+    if (exponent < 0) {
+        *out++ = '0';
+        *out++ = '.';
+        for (int i = -1; i > exponent; i--) *out++ = '0';
+        memcpy(out, digits, count);
+        out += count;
+    } else {
+        for (int i = 0; i <= exponent; i++) *out++ = i < count ? digits[i] : '0';
+        *out++ = '.';
+        if (count > exponent + 1) {
+            memcpy(out, digits + exponent + 1, count - exponent - 1);
+            out += count - exponent - 1;
+        } else {
+            *out++ = '0';
+        }
+    }
+    *out = '\0';
+}
+
+static void akorn_print_int(int64_t value) { printf("%" PRId64, value); }
+
+static void akorn_print_float(double value) {
+    char text[48];
+    akorn_format_float(value, text);
+    fputs(text, stdout);
+}
+
+static void akorn_print_bool(bool value) { fputs(value ? "True" : "False", stdout); }
+
+static void akorn_print_string(const char *value) { fputs(value, stdout); }
+
+/* The prompts are only shown at a terminal, like the read builtins of the engines */
+static void akorn_prompt(const char *prompt) {
+    static int interactive = -1;
+    if (interactive < 0) interactive = akorn_isatty(0);
+    if (prompt != NULL && interactive) fputs(prompt, stdout);
+}
+
+/* A line of stdin without its newline, like Python's input() */
+static char *akorn_read_line(void) {
+    fflush(stdout);
+    size_t capacity = 64, length = 0;
+    char *line = malloc(capacity);
+    int c;
+    while ((c = getchar()) != EOF && c != '\n') {
+        if (length + 1 == capacity) {
+            capacity *= 2;
+            line = realloc(line, capacity);
+        }
+        line[length++] = (char) c;
+    }
+    if (c == EOF && length == 0) {
+        fputs("EOFError: EOF when reading a line\n", stderr);
+        exit(1);
+    }
+    line[length] = '\0';
+    return line;
+}
+
+/* The text without the spaces around it and the underscores between digits, NULL if an underscore is misplaced */
+static char *akorn_number_text(const char *line) {
+    while (isspace((unsigned char) *line)) line++;
+    size_t length = strlen(line);
+    while (length > 0 && isspace((unsigned char) line[length - 1])) length--;
+
+    char *text = malloc(length + 1);
+    size_t count = 0;
+    for (size_t i = 0; i < length; i++) {
+        if (line[i] == '_') {
+            if (i == 0 || i + 1 == length || !isdigit((unsigned char) line[i - 1]) || !isdigit((unsigned char) line[i + 1])) {
+                free(text);
+                return NULL;
+            }
+            continue;
+        }
+        text[count++] = line[i];
+    }
+    text[count] = '\0';
+    return text;
+}
+
+static bool akorn_parse_int(const char *line, int64_t *value, int line_number, int column) {
+    char *text = akorn_number_text(line);
+    if (text == NULL) return false;
+
+    const char *cursor = text;
+    bool negative = *cursor == '-';
+    if (*cursor == '-' || *cursor == '+') cursor++;
+    if (!isdigit((unsigned char) *cursor)) { free(text); return false; }
+
+    int64_t result = 0;
+    for (; *cursor; cursor++) {
+        if (!isdigit((unsigned char) *cursor)) { free(text); return false; }
+        int digit = *cursor - '0';
+        if (akorn_mul_overflows(result, (int64_t) 10, &result) || akorn_sub_overflows(result, (int64_t) digit, &result)) {
+            akorn_overflow(line_number, column);
+        }
+    }
+    free(text);
+
+    if (!negative) {
+        if (result == INT64_MIN) akorn_overflow(line_number, column);
+        result = -result;
+    }
+    *value = result;
+    return true;
+}
+
+static bool akorn_parse_float(const char *line, double *value) {
+    char *text = akorn_number_text(line);
+    if (text == NULL) return false;
+
+    /* strtod also reads hexadecimal floats, Python does not */
+    if (*text == '\0' || strchr(text, 'x') != NULL || strchr(text, 'X') != NULL) { free(text); return false; }
+
+    char *end;
+    *value = strtod(text, &end);
+    bool parsed = *end == '\0';
+    free(text);
+    return parsed;
+}
+static char *akorn_int_text(int64_t value) {
+    char *text = malloc(24);
+    sprintf(text, "%" PRId64, value);
+    return text;
+}
+
+static char *akorn_float_text(double value) {
+    char *text = malloc(48);
+    akorn_format_float(value, text);
+    return text;
+}
+
+/* The reads ask again until the line is valid, like the builtins of the tree walker */
+static int64_t akorn_read_int(const char *prompt, int line, int column) {
+    for (;;) {
+        akorn_prompt(prompt);
+        char *input = akorn_read_line();
+        int64_t value;
+        bool parsed = akorn_parse_int(input, &value, line, column);
+        free(input);
+        if (parsed) return value;
+    }
+}
+
+static double akorn_read_float(const char *prompt) {
+    for (;;) {
+        akorn_prompt(prompt);
+        char *input = akorn_read_line();
+        double value;
+        bool parsed = akorn_parse_float(input, &value);
+        free(input);
+        if (parsed) return value;
+    }
+}
+
+static const char *akorn_read_string(const char *prompt) {
+    akorn_prompt(prompt);
+    return akorn_read_line();
+}
+
+static bool akorn_read_bool(const char *prompt, const char *true_text, const char *false_text) {
+    for (;;) {
+        akorn_prompt(prompt);
+        char *input = akorn_read_line();
+        bool is_true = true_text != NULL && strcmp(input, true_text) == 0;
+        bool is_false = false_text != NULL && strcmp(input, false_text) == 0;
+        free(input);
+        if (is_true) return true;
+        if (is_false) return false;
+    }
+}
+"""
@@ -0,0 +1,409 @@
+from akorn.ast import *
+from .c_runtime import C_RUNTIME
+
+#Akorn type -> C type of its values
+C_TYPES = {
+    "int": "int64_t",
+    "float": "double",
+    "bool": "bool",
+    "string": "const char *",
+}
+
+#Value of a variable declared without one, a native build has no None
+C_DEFAULTS = {
+    "int": "0",
+    "float": "0.0",
+    "bool": "false",
+    "string": '""',
+}
+
+#(operator, type) -> runtime function, the int ones check overflow and the divisions check zero
+C_FUNCTIONS = {
+    ("+", "int"): "akorn_add",
+    ("-", "int"): "akorn_sub",
+    ("*", "int"): "akorn_mul",
+    ("/", "int"): "akorn_div",
+    ("%", "int"): "akorn_mod",
+    ("**", "int"): "akorn_pow",
+    ("/", "float"): "akorn_fdiv",
+    ("%", "float"): "akorn_fmod",
+}
+
+#Operators that are the same in C for the values of every type they take
+C_OPERATORS = {
+    "+": "+",
+    "-": "-",
+    "*": "*",
+    "<": "<",
+    ">": ">",
+    "<=": "<=",
+    ">=": ">=",
+    "==": "==",
+    "!=": "!=",
+    "and": "&&",
+    "or": "||",
+}
+
+
+def c_string(text: str) -> str:
+    """C literal of the UTF-8 bytes of `text`, every byte that is not plain
+    ASCII is an octal escape of three digits"""
+
+    escaped = []
+
+    for byte in text.encode("utf-8"):
+        if 32 <= byte < 127 and chr(byte) not in '"\\?':
+            escaped.append(chr(byte))
+        else:
+            escaped.append(f"\\{byte:03o}")
+
+    return '"' + "".join(escaped) + '"'
+
+
+def c_identifier(name: str) -> str:
+    """`name` with only the ASCII letters, digits and `_` that every C
+    compiler takes, any other character is `u` and its 4 hex digits or `U`
+    and its 8 hex digits, like the universal character names of C"""
+
+    mangled = []
+
+    for character in name:
+        if character.isascii() and (character.isalnum() or character == "_"):
+            mangled.append(character)
+        elif ord(character) <= 0xFFFF:
+            mangled.append(f"u{ord(character):04x}")
+        else:
+            mangled.append(f"U{ord(character):08x}")
+
+    return "".join(mangled)
+
+
+def has_call(node: Node) -> bool:
+    kind = node.kind
+
+    if kind is CallNode:
+        return True
+
+    if kind is BinaryOpNode or kind is ComparisonOpNode or kind is BooleanOpNode:
+        return has_call(node.left) or has_call(node.right)
+
+    if kind is UnaryNode or kind is NotBooleanNode:
+        return has_call(node.node)
+
+    return False
+
+
+class CCodegen:
+    """Lowers a checked and resolved program to the source of a C program.
+    \nThe types Semantic enforces become C types: an int is an `int64_t`, a
+    float a `double`, a bool a `bool` and a string a `const char *`. Every
+    variable is a local of `akorn_main`, named `<name>_<index>_<type>` with
+    the index of the variable in the block ranges of the bytecode compiler,
+    so a name declared again in a block with another type is another local.
+    The name is mangled by `c_identifier` to the ASCII a C compiler takes.
+    \nThe runtime of `C_RUNTIME` prints the values like the tree walker and
+    stops with its errors. The int operations report an OverflowError where
+    the tree walker would go on with a Python int bigger than 64 bits, and
+    a variable declared without a value starts at the zero of its type.
+    \nC does not say in which order the operands of an operator are
+    evaluated, so when both have a call (a read) the left one is kept in a
+    temporary first. A break or continue out of any loop ends the statement
+    of the program it is in, as in the tree walker."""
+
+    def __init__(self) -> None:
+        self.bases: list[int] = []
+        self.variable_count = 0
+        self.declarations: dict[str, str] = {}
+        self.temporary_count = 0
+        self.loop_depth = 0
+        self.leaves_statement = False
+        self.lines: list[str] = []
+        self.indent = 1
+
+        self.statement_lowerers = {
+            DeclarationNode: self.lower_store,
+            AssignmentNode: self.lower_store,
+            CallNode: self.lower_call_statement,
+            IfNode: self.lower_if,
+            WhileNode: self.lower_while,
+            BreakStatement: self.lower_break,
+            ContinueStatement: self.lower_continue,
+        }
+
+        self.expression_lowerers = {
+            IntNode: self.lower_int,
+            FloatNode: self.lower_float,
+            StringNode: self.lower_string,
+            BoolNode: self.lower_bool,
+            VariableNode: self.lower_variable,
+            UnaryNode: self.lower_unary,
+            NotBooleanNode: self.lower_not,
+            BinaryOpNode: self.lower_binary_operation,
+            ComparisonOpNode: self.lower_comparison,
+            BooleanOpNode: self.lower_comparison,
+            CallNode: self.lower_call,
+        }
+
+
+    def lower(self, root_node: ProgramNode | FlatAst, shared: bool = False) -> str:
+        """C source of the program, with a `main` that runs it unless it is
+        for a shared library, that exports `akorn_main`"""
+
+        if isinstance(root_node, FlatAst):
+            root_node = root_node.root()
+
+        self.open_block(root_node)
+
+        for statement in root_node.statements:
+            self.leaves_statement = False
+            start = len(self.lines)
+            self.lower_statement(statement)
+
+            #do { } while (0) runs once and a break leaves it
+            if self.leaves_statement:
+                self.lines[start:] = ["    do {"] + ["    " + line for line in self.lines[start:]] + ["    } while (0);"]
+
+        self.bases.pop()
+
+        declarations = [f"    {C_TYPES[value_type]} {name};" for name, value_type in self.declarations.items()]
+        source = [C_RUNTIME, "int akorn_main(void) {"] + declarations + self.lines + ["    fflush(stdout);", "    return 0;", "}", ""]
+
+        if not shared:
+            source += ["int main(void) {", "    return akorn_main();", "}", ""]
+
+        return "\n".join(source)
+
+
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.indent + line)
+
+
+    def open_block(self, block_node: ProgramNode | BlockNode) -> None:
+        del self.bases[block_node.depth:]
+        self.bases.append(self.variable_count)
+        self.variable_count += block_node.size
+
+
+    def lower_block(self, block_node: BlockNode) -> None:
+        self.open_block(block_node)
+        self.indent += 1
+
+        for statement in block_node.statements:
+            self.lower_statement(statement)
+
+        self.indent -= 1
+        self.bases.pop()
+
+
+    def variable_name(self, node: VariableNode | AssignmentNode | DeclarationNode, value_type: str) -> str:
+        #The index after the name keeps apart the variables whose names are the same once mangled
+        name = f"{c_identifier(node.name)}_{self.bases[node.depth] + node.slot}_{value_type}"
+        self.declarations[name] = value_type
+        return name
+
+
+    def temporary(self, value_type: str) -> str:
+        name = f"akorn_temporary_{self.temporary_count}"
+        self.temporary_count += 1
+        self.declarations[name] = value_type
+        return name
+
+
+    def lower_statement(self, node: Node) -> None:
+        lowerer = self.statement_lowerers.get(node.kind)
+
+        if lowerer is not None:
+            lowerer(node)
+
+
+    def lower_store(self, node: DeclarationNode | AssignmentNode) -> None:
+        if node.value.kind is NoneNode:
+            value_type = node.type
+            value = C_DEFAULTS[value_type]
+        else:
+            value_type = node.value.static_type
+            value = self.lower_expression(node.value)
+
+        self.emit(f"{self.variable_name(node, value_type)} = {value};")
+
+
+    def lower_call_statement(self, call_node: CallNode) -> None:
+        if call_node.calle != "write" and call_node.calle != "writeline":
+            self.emit(f"(void) {self.lower_call(call_node)};")
+            return
+
+        #print() evaluates all the values before it prints the first one
+        values = []
+
+        for arg in call_node.args:
+            value = self.lower_expression(arg)
+
+            if has_call(arg):
+                temporary = self.temporary(arg.static_type)
+                self.emit(f"{temporary} = {value};")
+                value = temporary
+
+            values.append((value, arg.static_type))
+
+        for index, (value, value_type) in enumerate(values):
+            if index:
+                self.emit("putchar(' ');")
+
+            self.emit(f"akorn_print_{value_type}({value});")
+
+        if call_node.calle == "writeline":
+            self.emit("putchar('\\n');")
+
+
+    def lower_if(self, if_node: IfNode) -> None:
+        for index, (condition, block) in enumerate(if_node.branches):
+            keyword = "if" if index == 0 else "} else if"
+            self.emit(f"{keyword} ({self.lower_expression(condition)}) {{")
+            self.lower_block(block)
+
+        if if_node.else_node.kind is ElseNode:
+            self.emit("} else {")
+            self.lower_block(if_node.else_node.block)
+
+        self.emit("}")
+
+
+    def lower_while(self, while_node: WhileNode) -> None:
+        self.emit(f"while ({self.lower_expression(while_node.condition)}) {{")
+        self.loop_depth += 1
+        self.lower_block(while_node.block)
+        self.loop_depth -= 1
+        self.emit("}")
+
+
+    def lower_break(self, break_node: BreakStatement) -> None:
+        if self.loop_depth == 0:
+            self.leaves_statement = True
+
+        self.emit("break;")
+
+
+    def lower_continue(self, continue_node: ContinueStatement) -> None:
+        if self.loop_depth == 0:
+            self.leaves_statement = True
+            self.emit("break;")
+            return
+
+        self.emit("continue;")
+
+
+    def lower_expression(self, node: Node) -> str:
+        return self.expression_lowerers[node.kind](node)
+
+
+    def lower_int(self, int_node: IntNode) -> str:
+        return f"INT64_C({int_node.value})"
+
+
+    def lower_float(self, float_node: FloatNode) -> str:
+        return repr(float(float_node.value))
+
+
+    def lower_string(self, string_node: StringNode) -> str:
+        return c_string(string_node.value)
+
+
+    def lower_bool(self, bool_node: BoolNode) -> str:
+        return "true" if bool_node.value else "false"
+
+
+    def lower_variable(self, var_node: VariableNode) -> str:
+        return self.variable_name(var_node, var_node.static_type)
+
+
+    def lower_unary(self, unary_node: UnaryNode) -> str:
+        operand = self.lower_expression(unary_node.node)
+
+        if unary_node.operator == "+":
+            return operand
+
+        if unary_node.static_type == "int":
+            return f"akorn_neg({operand}, {unary_node.node.line}, {unary_node.node.column})"
+
+        return f"(-{operand})"
+
+
+    def lower_not(self, not_node: NotBooleanNode) -> str:
+        return f"(!{self.lower_expression(not_node.node)})"
+
+
+    def lower_operands(self, operation: BinaryOpNode | ComparisonOpNode | BooleanOpNode) -> tuple[str, str, str]:
+        """Left and right of the operation, and what has to run before them"""
+
+        left = self.lower_expression(operation.left)
+        right = self.lower_expression(operation.right)
+
+        #&& and || already run their left side first
+        if operation.kind is BooleanOpNode or not (has_call(operation.left) and has_call(operation.right)):
+            return "", left, right
+
+        temporary = self.temporary(operation.left.static_type)
+        return f"{temporary} = {left}, ", temporary, right
+
+
+    def lower_binary_operation(self, operation: BinaryOpNode) -> str:
+        before, left, right = self.lower_operands(operation)
+        value_type = operation.static_type
+        function = C_FUNCTIONS.get((operation.operator, value_type))
+
+        if function is not None:
+            value = f"{function}({left}, {right}, {operation.left.line}, {operation.left.column})"
+        elif operation.operator == "**":
+            value = f"pow({left}, {right})"
+        else:
+            value = f"({left} {C_OPERATORS[operation.operator]} {right})"
+
+        return f"({before}{value})" if before else value
+
+
+    def lower_comparison(self, operation: ComparisonOpNode | BooleanOpNode) -> str:
+        before, left, right = self.lower_operands(operation)
+        operator = C_OPERATORS[operation.operator]
+
+        #The strings are compared by their bytes, the order of their code points in UTF-8
+        if operation.left.static_type == "string":
+            value = f"(strcmp({left}, {right}) {operator} 0)"
+        else:
+            value = f"({left} {operator} {right})"
+
+        return f"({before}{value})" if before else value
+
+
+    def text_of(self, arg: Node) -> str:
+        """C string of a value, for the prompts of the reads"""
+
+        value = self.lower_expression(arg)
+        value_type = arg.static_type
+
+        if value_type == "string":
+            return value
+
+        if value_type == "bool":
+            return f'({value} ? "True" : "False")'
+
+        return f"akorn_{value_type}_text({value})"
+
+
+    def lower_call(self, call_node: CallNode) -> str:
+        calle = call_node.calle
+        args = call_node.args
+        prompt = self.text_of(args[0]) if args else "NULL"
+
+        if calle == "readInt":
+            return f"akorn_read_int({prompt}, {call_node.line}, {call_node.column})"
+
+        if calle == "readFloat":
+            return f"akorn_read_float({prompt})"
+
+        if calle == "readString":
+            return f"akorn_read_string({prompt})"
+
+        #readBool compares the line with its second and third values, that only match if they are strings
+        texts = [self.lower_expression(arg) if arg.static_type == "string" else "NULL" for arg in args[1:3]]
+        texts += ["NULL"] * (2 - len(texts))
+        return f"akorn_read_bool({prompt}, {', '.join(texts)})"
@@ -0,0 +1,57 @@
+import os
+import shutil
+import subprocess
+import sys
+
+#C compilers tried in order when CC is not set
+C_COMPILERS = ("cc", "gcc", "clang")
+
+
+def find_c_compiler() -> str | None:
+    """The compiler of the CC environment variable, or the first of
+    `C_COMPILERS` that is installed"""
+
+    compiler = os.environ.get("CC")
+
+    if compiler:
+        return compiler
+
+    for name in C_COMPILERS:
+        if shutil.which(name) is not None:
+            return name
+
+    return None
+
+
+def default_output(rute_script: str, shared: bool = False) -> str:
+    """Path of the executable or the shared library of a script, next to it"""
+
+    base = os.path.splitext(rute_script)[0]
+
+    if not shared:
+        return base + ".exe" if sys.platform == "win32" else base
+
+    if sys.platform == "win32":
+        return base + ".dll"
+
+    return base + (".dylib" if sys.platform == "darwin" else ".so")
+
+
+def compile_c(c_path: str, output: str, compiler: str, shared: bool = False) -> str | None:
+    """Compiles the C file to `output` with a gcc-like compiler, returns the
+    errors of the compiler if it failed"""
+
+    command = [compiler, "-O2", "-std=c99", "-o", output, c_path, "-lm"]
+
+    if shared:
+        command[1:1] = ["-shared", "-fPIC"]
+
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except OSError as error:
+        return str(error)
+
+    if result.returncode != 0:
+        return result.stderr or result.stdout
+
+    return None
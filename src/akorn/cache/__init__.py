@@ -0,0 +1,3 @@
+from .program_cache import CACHE_DIR, source_hash, cache_path, load_program, store_program, load_code, store_code
+
+__all__ = ["CACHE_DIR", "source_hash", "cache_path", "load_program", "store_program", "load_code", "store_code"]
\ No newline at end of file
@@ -0,0 +1,105 @@
+import hashlib
+import marshal
+import mmap
+import os
+import pickle
+import tempfile
+from importlib.util import MAGIC_NUMBER
+from types import CodeType
+from akorn import __version__
+from akorn.ast import FlatAst
+
+CACHE_DIR = "__akorncache__"
+
+#Goes up when the layout of the cached programs changes
+CACHE_FORMAT = 3
+
+
+def source_hash(code: str | mmap.mmap) -> str:
+    if isinstance(code, str):
+        code = code.encode("utf-8", "surrogatepass")
+
+    return hashlib.sha256(code).hexdigest()
+
+
+def cache_path(rute_script: str, extension: str = "pickle") -> str:
+    """Cached program of a script: `__akorncache__/<script>.akorn-<version>.pickle`
+    next to the script, like the .pyc files of Python. The compiled Python
+    code of the pycodegen engine has the `pyc` extension."""
+
+    directory, name = os.path.split(os.path.abspath(rute_script))
+    return os.path.join(directory, CACHE_DIR, f"{name}.akorn-{__version__}.{extension}")
+
+
+def cache_header(digest: str) -> bytes:
+    return f"akorn {__version__} {CACHE_FORMAT} {digest}\n".encode("ascii")
+
+
+def load_program(rute_script: str, digest: str) -> FlatAst | None:
+    """Checked program of the script whose source hashes to `digest`.
+    \nReturns None when there is no cached program or when it can not be
+    used: made by another version, for another source or damaged."""
+
+    try:
+        with open(cache_path(rute_script), "rb") as cache_file:
+            if cache_file.readline() != cache_header(digest):
+                return None
+
+            program = pickle.load(cache_file)
+    except Exception:
+        return None
+
+    if not isinstance(program, FlatAst):
+        return None
+
+    return program
+
+
+def store_program(rute_script: str, digest: str, program: FlatAst) -> None:
+    write_cache(cache_path(rute_script), cache_header(digest) + pickle.dumps(program, pickle.HIGHEST_PROTOCOL))
+
+
+def load_code(rute_script: str, digest: str) -> tuple[CodeType, tuple] | None:
+    """Code and source map of the pycodegen engine for the script whose
+    source hashes to `digest`, None when there are none or they were made
+    by another version of akorn or of Python (the magic number of its .pyc
+    files)."""
+
+    try:
+        with open(cache_path(rute_script, "pyc"), "rb") as cache_file:
+            if cache_file.readline() != cache_header(digest) or cache_file.read(len(MAGIC_NUMBER)) != MAGIC_NUMBER:
+                return None
+
+            code, positions = marshal.load(cache_file)
+    except Exception:
+        return None
+
+    if not isinstance(code, CodeType):
+        return None
+
+    return code, positions
+
+
+def store_code(rute_script: str, digest: str, code: CodeType, positions: tuple) -> None:
+    write_cache(cache_path(rute_script, "pyc"), cache_header(digest) + MAGIC_NUMBER + marshal.dumps((code, positions)))
+
+
+def write_cache(path: str, data: bytes) -> None:
+    """Writes the data to a temporary file that then replaces the cached
+    one, so a run never reads a half written cache. Nothing happens when
+    the cache can not be written, as with a read-only directory."""
+
+    directory = os.path.dirname(path)
+    temporary = None
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False) as cache_file:
+            temporary = cache_file.name
+            cache_file.write(data)
+
+        os.replace(temporary, path)
+    except OSError:
+        if temporary is not None and os.path.exists(temporary):
+            os.unlink(temporary)
\ No newline at end of file
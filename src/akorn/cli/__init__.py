@@ -1,4 +1,4 @@
 from .cli import run_cli
-from .cmd_akorn import cmd_akorn_run, cmd_akorn_ast, cmd_akorn_help, cmd_akorn_tokens, cmd_akorn_version
+from .cmd_akorn import cmd_akorn_run, cmd_akorn_ast, cmd_akorn_help, cmd_akorn_tokens, cmd_akorn_version, cmd_akorn_check
 
-__all__ = ["run_cli", "cmd_akorn_run", "cmd_akorn_ast", "cmd_akorn_help", "cmd_akorn_tokens", "cmd_akorn_version"]
\ No newline at end of file
+__all__ = ["run_cli", "cmd_akorn_run", "cmd_akorn_ast", "cmd_akorn_help", "cmd_akorn_tokens", "cmd_akorn_version", "cmd_akorn_check"]
\ No newline at end of file
@@ -0,0 +1,87 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from akorn.diagnostic import ErrorReporter
+from akorn.parser import Parser
+from akorn.scanner import LEXERS, FastLexer, load_source
+from akorn.semantic import Semantic
+from akorn.syntatic_normalizer import TheNormalizer
+
+PHASES = ("lexer", "normalizer", "parser", "semantic")
+
+
+def find_scripts(paths: list[str]) -> list[str]:
+    """The .akorn scripts of `paths`, directories are searched recursively.
+    The list is sorted so the diagnostics always come in the same order."""
+
+    scripts = set()
+
+    for path in paths:
+        if not os.path.isdir(path):
+            scripts.add(path)
+            continue
+
+        for directory, _, names in os.walk(path):
+            for name in names:
+                if name.endswith(".akorn"):
+                    scripts.add(os.path.join(directory, name))
+
+    return sorted(scripts)
+
+
+def check_script(rute_script: str, lexer_engine: str = "fast") -> tuple[str, list[str], dict[str, float]]:
+    """Runs the phases up to Semantic.check_ast one after the other, stopping
+    at the first one with errors like `akorn run` does.
+    \nReturns the script, its errors and the seconds spent in each phase. A
+    phase that crashes is reported as an InternalError of the script, so one
+    script can not stop the check of the others."""
+
+    reporter = ErrorReporter()
+    timings = dict.fromkeys(PHASES, 0.0)
+    code = load_source(rute_script, reporter, allow_mapped=lexer_engine == "fast")
+
+    if code is None:
+        return rute_script, reporter.errors, timings
+
+    def lexer(code):
+        lexer = LEXERS[lexer_engine](code, reporter)
+        return lexer.tokenize_buffer() if isinstance(lexer, FastLexer) else lexer.tokenize()
+
+    phases = (
+        ("lexer", lexer),
+        ("normalizer", lambda tokens: TheNormalizer(tokens, reporter).normalizer()),
+        ("parser", lambda tokens: Parser(tokens, reporter).parse_program()),
+        ("semantic", lambda root_node: Semantic(reporter).check_ast(root_node)),
+    )
+
+    #Each phase takes what the one before returned
+    result = code
+
+    for phase, run_phase in phases:
+        start = time.perf_counter()
+
+        try:
+            result = run_phase(result)
+        except Exception as error:
+            reporter.add_error(f"[InternalError][file: {rute_script}] The {phase} failed: {type(error).__name__}: {error}")
+
+        timings[phase] = time.perf_counter() - start
+
+        if reporter.has_errors():
+            break
+
+    return rute_script, reporter.errors, timings
+
+
+def check_scripts(scripts: list[str], jobs: int, lexer_engine: str = "fast") -> list[tuple[str, list[str], dict[str, float]]]:
+    """Checks the scripts in `jobs` processes, the results keep the order of
+    `scripts` whatever the order they finish in"""
+
+    if jobs == 1 or len(scripts) < 2:
+        return [check_script(script, lexer_engine) for script in scripts]
+
+    engines = [lexer_engine] * len(scripts)
+    chunksize = max(1, len(scripts) // (jobs * 4))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(check_script, scripts, engines, chunksize=chunksize))
\ No newline at end of file
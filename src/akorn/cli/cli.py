@@ -1,32 +1,82 @@
+import sys
 from sys import argv
 from .repl import repl
-from .cmd_akorn import cmd_akorn_run, cmd_akorn_tokens, cmd_akorn_ast, cmd_akorn_version, cmd_akorn_help
+from .options import split_options, lexer_option, ast_option, engine_option, jit_option, file_option, target_option, jobs_option
+from .cmd_akorn import cmd_akorn_run, cmd_akorn_tokens, cmd_akorn_ast, cmd_akorn_version, cmd_akorn_help, cmd_akorn_check, cmd_akorn_build
 
 def run_cli(reporter):
     if len(argv) < 2 or argv[1] != "akorn":
         print("Usage: akorn [commands]")
         return
     
-    args = argv[2:]
+    args, options = split_options(argv[2:])
+    debug = bool(options.get("debug"))
+    use_cache = not options.get("no-cache")
     
     if args[0] == "run":
+        lexer_engine = lexer_option(options)
+        ast_form = ast_option(options)
+        engine = engine_option(options)
+        jit = jit_option(options, engine) if engine is not None else None
+        out = file_option(options, "out")
+        input_file = file_option(options, "input")
+        if lexer_engine is None or ast_form is None or engine is None or jit is None or out is None or input_file is None:
+            return
+        
         try:
-            cmd_akorn_run(args[1], reporter)
+            cmd_akorn_run(args[1], reporter, lexer_engine, debug, ast_form, use_cache, engine, jit, out, input_file)
         except IndexError:
-            print("Usage: akorn run [rute script akon]")
+            print("Usage: akorn run [rute script akon] [--lexer=fast|reference] [--ast=tree|flat] [--engine=tree|closure|vm|pycodegen] [--jit] [--jit-stats] [--out=file] [--input=file] [--no-cache] [--debug]")
             
     elif args[0] == "token":
+        lexer_engine = lexer_option(options)
+        if lexer_engine is None:
+            return
+        
         try:
-            cmd_akorn_tokens(args[1], reporter)
+            cmd_akorn_tokens(args[1], reporter, lexer_engine)
         except IndexError:
-            print("Usage: akorn token [rute script akon]")
+            print("Usage: akorn token [rute script akon] [--lexer=fast|reference]")
 
     elif args[0] == "ast":
+        ast_form = ast_option(options)
+        if ast_form is None:
+            return
+        
         try:
-            cmd_akorn_ast(args[1], reporter)
+            cmd_akorn_ast(args[1], reporter, debug, ast_form)
         except IndexError:
-            print("Usage: akorn ast [rute script akon]")
+            print("Usage: akorn ast [rute script akon] [--ast=tree|flat] [--debug]")
             
+    elif args[0] == "check":
+        lexer_engine = lexer_option(options)
+        jobs = jobs_option(options)
+        if lexer_engine is None or jobs is None:
+            sys.exit(2)
+        
+        if len(args) < 2:
+            print("Usage: akorn check [rutes of akon scripts or directories] [--jobs=N] [--lexer=fast|reference]")
+            sys.exit(2)
+        
+        #The exit status lets a CI job fail on scripts with errors
+        if not cmd_akorn_check(args[1:], jobs, lexer_engine):
+            sys.exit(1)
+    
+    elif args[0] == "build":
+        lexer_engine = lexer_option(options)
+        target = target_option(options)
+        output = options.get("output")
+        if lexer_engine is None or target is None:
+            sys.exit(2)
+        
+        #A bare --output has no path
+        if len(args) < 2 or output is True:
+            print("Usage: akorn build [rute script akon] [--target=c] [--output=path] [--shared] [--lexer=fast|reference] [--debug]")
+            sys.exit(2)
+        
+        if not cmd_akorn_build(args[1], reporter, lexer_engine, target, output, bool(options.get("shared")), debug):
+            sys.exit(1)
+    
     elif args[0] == "version":
         cmd_akorn_version()
         
@@ -34,7 +84,7 @@ def run_cli(reporter):
         cmd_akorn_help()
     
     elif args[0] == "repl":
-        repl(reporter)
+        repl(reporter, debug)
     
 # run = correr el archivo en el interprete
 # tokens = correr hasta conseguir lista de tokens y mostarlas
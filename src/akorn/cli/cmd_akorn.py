@@ -1,76 +1,146 @@
-from akorn.scanner import Lexer
+import os
+import time
+from akorn.ast import FlatAst, ProgramNode
+from akorn.cache import source_hash, cache_path, load_program, store_program, load_code, store_code
+from akorn.scanner import LEXERS, FastLexer, load_source
 from akorn.syntatic_normalizer import TheNormalizer
-from akorn.parser.parser import Parser
-from akorn.semantic import Semantic
-from akorn.runtime.interpreter import Interpreter
+from akorn.semantic import Semantic, Resolver
+from akorn.runtime import ENGINES, PythonEngine, Interpreter, LoopJit
+from akorn.backend import CCodegen, find_c_compiler, default_output, compile_c
 from akorn.utils.print_ast import print_ast
-import pathlib
+from .check import PHASES, find_scripts, check_scripts
+from .pipeline import parse_source
 
-def cmd_akorn_run(rute_script: str, reporter):
-    ruta = pathlib.Path(rute_script)
-    ruta.parent.mkdir(parents=True, exist_ok=True)
-    ruta.touch(exist_ok=True)
-        
-    #Code Akon
-    with open(ruta, "r") as file_ak:
-        code = file_ak.read()
-    
-    #Lexer
-    lexer = Lexer(code, reporter)
-    tokens = lexer.tokenize()
+def cmd_akorn_run(rute_script: str, reporter, lexer_engine: str = "fast", debug: bool = False, ast_form: str = "tree", use_cache: bool = True, engine: str = "tree", jit: str = "off", out: str = "", input_file: str = ""):
+    #Code Akon, nothing is created if the script does not exist
+    code = load_source(rute_script, reporter, allow_mapped=lexer_engine == "fast")
     
-    if reporter.has_errors():
+    if code is None:
         reporter.display()
         reporter.clear_list_error()
         return
     
-    the_normalizer = TheNormalizer(tokens, reporter)
-    tokens = the_normalizer.normalizer()
+    #A script that did not change since its last run is not checked again
+    program = None
+    if use_cache:
+        digest = source_hash(code)
+        
+        #The pycodegen engine only needs its compiled Python code, not the program
+        if engine == "pycodegen":
+            compiled = load_code(rute_script, digest)
+            
+            if compiled is not None:
+                if debug:
+                    print(f"[Debug] compiled Python code loaded from {cache_path(rute_script, 'pyc')}\n")
+                
+                run_engine(PythonEngine.from_code(*compiled, reporter), reporter, out, input_file)
+                return
+        
+        program = load_program(rute_script, digest)
+        
+        if debug and program is not None:
+            print(f"[Debug] checked program loaded from {cache_path(rute_script)}\n")
     
-    if reporter.has_errors():
-        reporter.display()
-        reporter.clear_list_error()
-        return
+    if program is None:
+        root_node = check_source(code, reporter, lexer_engine, debug)
+        
+        if root_node is None:
+            return
+        
+        #The cache keeps the checked program as a flat AST
+        if use_cache:
+            program = FlatAst.from_tree(root_node)
+            store_program(rute_script, digest, program)
+    
+    elif ast_form == "tree":
+        root_node = program.to_tree()
+    
+    #The flat AST replaces the tree, whose nodes are freed before running
+    if ast_form == "flat":
+        root_node = program if program is not None else FlatAst.from_tree(root_node)
+    
+    #Interprete, every engine but the tree walker compiles the whole program before running it
+    if jit != "off":
+        loop_jit = LoopJit()
+        interpreter = Interpreter(root_node, reporter, loop_jit)
+    else:
+        interpreter = ENGINES[engine](root_node, reporter)
+    
+    if use_cache and engine == "pycodegen":
+        store_code(rute_script, digest, interpreter.code, interpreter.positions)
     
-    #Parser
-    parser = Parser(tokens, reporter)
-    root_node = parser.parse_program()
+    run_engine(interpreter, reporter, out, input_file)
+    
+    if jit == "stats":
+        print(loop_jit.report())
+    
+def run_engine(interpreter, reporter, out: str = "", input_file: str = ""):
+    try:
+        if input_file:
+            interpreter.input.open_file(input_file)
+    except OSError as error:
+        reporter.add_error(f"[InputError][file: {input_file}] The input can not be read: {error.strerror}")
+    
+    try:
+        if out and not reporter.has_errors():
+            interpreter.output.redirect(out)
+    except OSError as error:
+        reporter.add_error(f"[OutputError][file: {out}] The output can not be written: {error.strerror}")
+    
+    try:
+        if not reporter.has_errors():
+            interpreter.interpret_main()
+    except Exception:
+        #A runtime error is reported and then stops the engine
+        if not reporter.has_errors():
+            raise
+    finally:
+        interpreter.output.close()
+        interpreter.input.close()
     
     if reporter.has_errors():
         reporter.display()
         reporter.clear_list_error()
-        return
+    
+def check_source(code, reporter, lexer_engine: str = "fast", debug: bool = False) -> ProgramNode | None:
+    """Lexer, normalizer, parser, type checker and resolver, None if the script has errors"""
+    
+    #Lexer, normalizer and parser streaming the tokens
+    root_node = parse_source(code, reporter, lexer_engine, debug)
+    
+    if root_node is None:
+        return None
     
     #Type checker
     semantic_checker = Semantic(reporter)
     semantic_checker.check_ast(root_node)
     
-    if reporter.has_error():
+    if reporter.has_errors():
         reporter.display()
         reporter.clear_list_error()
-        return
+        return None
     
-    #Interprete
-    interpreter = Interpreter(root_node, reporter)
-    interpreter.interpret_main()
+    #Addresses of the variables in the runtime frames
+    Resolver().resolve(root_node)
     
-    if reporter.has_errors():
+    return root_node
+
+def cmd_akorn_tokens(rute_script: str, reporter, lexer_engine: str = "fast"):
+    #Code Akon, nothing is created if the script does not exist
+    code = load_source(rute_script, reporter, allow_mapped=lexer_engine == "fast")
+    
+    if code is None:
         reporter.display()
         reporter.clear_list_error()
         return
     
-def cmd_akorn_tokens(rute_script: str, reporter):
-    ruta = pathlib.Path(rute_script)
-    ruta.parent.mkdir(parents=True, exist_ok=True)
-    ruta.touch(exist_ok=True)
-        
-    #Code Akon
-    with open(ruta, "r") as file_ak:
-        code = file_ak.read()
+    #Lexer, the fast engine keeps the tokens in a compact buffer
+    lexer = LEXERS[lexer_engine](code, reporter)
     
-    #Lexer
-    lexer = Lexer(code, reporter)
-    tokens = lexer.tokenize()
+    if isinstance(lexer, FastLexer):
+        tokens = lexer.tokenize_buffer()
+    else:
+        tokens = lexer.tokenize()
     
     if reporter.has_errors():
         reporter.display()
@@ -92,60 +162,131 @@ def cmd_akorn_tokens(rute_script: str, reporter):
     for i in range(len_tokens):
         print(f"{i} => {tokens[i]}")
 
-def cmd_akorn_ast(rute_script: str, reporter):
-    ruta = pathlib.Path(rute_script)
-    ruta.parent.mkdir(parents=True, exist_ok=True)
-    ruta.touch(exist_ok=True)
-        
-    #Code Akon
-    with open(ruta, "r") as file_ak:
-        code = file_ak.read()
-    
-    #Lexer
-    lexer = Lexer(code, reporter)
-    tokens = lexer.tokenize()
+def cmd_akorn_ast(rute_script: str, reporter, debug: bool = False, ast_form: str = "tree"):
+    #Code Akon, nothing is created if the script does not exist
+    code = load_source(rute_script, reporter, allow_mapped=True)
     
-    if reporter.has_errors():
+    if code is None:
         reporter.display()
         reporter.clear_list_error()
         return
     
-    the_normalizer = TheNormalizer(tokens, reporter)
-    tokens = the_normalizer.normalizer()
+    #Lexer, normalizer and parser streaming the tokens
+    root_node = parse_source(code, reporter, debug=debug)
     
-    if reporter.has_errors():
-        reporter.display()
-        reporter.clear_list_error()
-        return
-    
-    #Parser
-    parser = Parser(tokens, reporter)
-    root_node = parser.parse_program()
-    
-    if reporter.has_errors():
-        reporter.display()
-        reporter.clear_list_error()
+    if root_node is None:
         return
     
     #semantic
     #semantic = Semantic(root_node, reporter)
     #semantic.check_ast()
         
+    if ast_form == "flat":
+        root_node = FlatAst.from_tree(root_node)
+    
     #Print ast
     print_ast(root_node)
    
+def cmd_akorn_check(paths: list[str], jobs: int, lexer_engine: str = "fast") -> bool:
+    """Checks every script of `paths` without running them, in `jobs`
+    processes. Returns False if a script has errors."""
+    
+    scripts = find_scripts(paths)
+    
+    if not scripts:
+        print("No akorn scripts were found")
+        return False
+    
+    start = time.perf_counter()
+    results = check_scripts(scripts, jobs, lexer_engine)
+    elapsed = time.perf_counter() - start
+    
+    #Results come in the order of the sorted scripts
+    failed = 0
+    timings = dict.fromkeys(PHASES, 0.0)
+    
+    for rute_script, errors, script_timings in results:
+        for phase in PHASES:
+            timings[phase] += script_timings[phase]
+        
+        if errors:
+            failed += 1
+            print(f"--{rute_script}--\n")
+            for error in errors:
+                print(f"{error}\n")
+    
+    print(f"Checked {len(scripts)} scripts in {elapsed:.2f}s with {jobs} jobs, {failed} with errors")
+    print("Time per phase: " + ", ".join(f"{phase} {timings[phase] * 1000:.1f}ms" for phase in PHASES))
+    
+    return failed == 0
+
+def cmd_akorn_build(rute_script: str, reporter, lexer_engine: str = "fast", target: str = "c", output: str | None = None, shared: bool = False, debug: bool = False) -> bool:
+    """Compiles the script ahead of time to a native executable, or a shared
+    library that exports `akorn_main`. Returns False if it could not."""
+    
+    #Code Akon, nothing is created if the script does not exist
+    code = load_source(rute_script, reporter, allow_mapped=lexer_engine == "fast")
+    
+    if code is None:
+        reporter.display()
+        reporter.clear_list_error()
+        return False
+    
+    root_node = check_source(code, reporter, lexer_engine, debug)
+    
+    if root_node is None:
+        return False
+    
+    #The C code is kept next to the output
+    output = output or default_output(rute_script, shared)
+    c_path = os.path.splitext(output)[0] + ".c"
+    
+    with open(c_path, "w", encoding="utf-8") as c_file:
+        c_file.write(CCodegen().lower(root_node, shared))
+    
+    compiler = find_c_compiler()
+    
+    if compiler is None:
+        print(f"No C compiler was found, set CC to one. The C code is in {c_path}")
+        return False
+    
+    errors = compile_c(c_path, output, compiler, shared)
+    
+    if errors is not None:
+        print(f"The C compiler '{compiler}' failed on {c_path}:\n{errors}")
+        return False
+    
+    if debug:
+        print(f"[Debug] {c_path} compiled with {compiler}")
+    
+    print(f"Built {output}")
+    return True
+
 def cmd_akorn_version():
     print("--Akon Programming Language: v0.1.0--")
 
 def cmd_akorn_help():
     print("--Akon-Cli Commands--\n\n")
     
-    print("-ast: Command that executes an akon script and displays its parent node, syntax: akon ast [path to akon script]\n")
+    print("-ast: Command that executes an akon script and displays its parent node, syntax: akon ast [path to akon script] [--ast=tree|flat] [--debug]\n")
+    print("-build: Command that compiles an akon script ahead of time to C and then to a native executable with the installed C compiler (CC), or to a shared library with --shared, syntax: akon build [path to akon script] [--target=c] [--output=path] [--shared] [--lexer=fast|reference] [--debug]\n")
+    print("-check: Command that checks akon scripts up to the type checker without running them, directories are searched for .akorn scripts, syntax: akon check [paths to akon scripts or directories] [--jobs=N] [--lexer=fast|reference]\n")
     print("-exit: Command that exits the akon repl, syntax: akon repl, can only be done in the repl\n")
     print("-help: displays all akon-cli commands with their function and syntax, syntax: akon help\n")
-    print("-repl: activates the interactive mode of the akon programming language, syntax: akon repl\n")
-    print("-run: Command that fully executes an akon script, syntax: akon run [path to akon script]\n")
-    print("-token: Command that executes an akon script up to the lexer and displays the created tokens, syntax: akon token [path to akon script]\n")
+    print("-repl: activates the interactive mode of the akon programming language, syntax: akon repl [--debug]\n")
+    print("-run: Command that fully executes an akon script, syntax: akon run [path to akon script] [--lexer=fast|reference] [--ast=tree|flat] [--engine=tree|closure|vm|pycodegen] [--jit] [--jit-stats] [--out=file] [--input=file] [--no-cache] [--debug]\n")
+    print("-token: Command that executes an akon script up to the lexer and displays the created tokens, syntax: akon token [path to akon script] [--lexer=fast|reference]\n")
+    print("--ast=flat: keeps the AST in a flat table of arrays instead of a tree of objects, for very big scripts, for run and ast\n")
+    print("--engine=closure: run compiles the checked program once into Python closures and runs them, instead of walking the AST (--engine=tree, the default)\n")
+    print("--engine=vm: run compiles the checked program to bytecode and runs it on a stack virtual machine\n")
+    print("--engine=pycodegen: run translates the checked program to Python and runs it as CPython bytecode, the compiled code is cached in __akorncache__ like a .pyc\n")
+    print("--jit: the tree walker compiles each loop that runs many times to a Python function, entered while the variables around it are set (or unset) as when it was compiled\n")
+    print("--jit-stats: like --jit, and after the run prints the loops compiled, the entries that found a variable set or unset otherwise (guard failures) and the time saved\n")
+    print("--out=file: run writes the output of the script to the file instead of the terminal, the errors are still shown in the terminal\n")
+    print("--input=file: the reads of run take their lines from the file instead of the terminal, without showing their prompts\n")
+    print("--no-cache: run checks the script again and does not read or write its compiled program in __akorncache__\n")
+    print("--jobs=N: number of processes that check uses, all the cores by default, --jobs N also works\n")
+    print("--debug: prints how many AST nodes of each class the parser created, for run, ast and the commands of the repl\n")
     print("-version: displays the current language version, syntax: akon version\n")
     
         
\ No newline at end of file
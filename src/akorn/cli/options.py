@@ -0,0 +1,119 @@
+import os
+from akorn.scanner import LEXERS
+from akorn.runtime import ENGINES
+
+#Forms of the AST that run and ast can work on
+AST_FORMS = ("tree", "flat")
+
+#Targets of `akorn build --target=`
+BUILD_TARGETS = ("c",)
+
+#Options that can also take their value as the next argument, `--jobs 4`
+VALUED_OPTIONS = frozenset({"jobs", "output", "out", "input"})
+
+def split_options(args: list[str]) -> tuple[list[str], dict]:
+    """Separates the `--name=value` and `--flag` options from the positional arguments"""
+    
+    positional = []
+    options = {}
+    pending = None
+    
+    for arg in args:
+        if pending is not None and not arg.startswith("--"):
+            options[pending] = arg
+            pending = None
+        elif arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value if value else True
+            pending = name if not value and name in VALUED_OPTIONS else None
+        else:
+            positional.append(arg)
+            
+    return positional, options
+
+
+def lexer_option(options: dict) -> str | None:
+    lexer_engine = options.get("lexer", "fast")
+    
+    if lexer_engine not in LEXERS:
+        print(f"Unknown lexer '{lexer_engine}', use --lexer=fast|reference")
+        return None
+    
+    return lexer_engine
+
+
+
+def ast_option(options: dict) -> str | None:
+    ast_form = options.get("ast", "tree")
+    
+    if ast_form not in AST_FORMS:
+        print(f"Unknown AST form '{ast_form}', use --ast=tree|flat")
+        return None
+    
+    return ast_form
+
+
+def engine_option(options: dict) -> str | None:
+    engine = options.get("engine", "tree")
+    
+    if engine not in ENGINES:
+        print(f"Unknown engine '{engine}', use --engine={'|'.join(ENGINES)}")
+        return None
+    
+    return engine
+
+
+def target_option(options: dict) -> str | None:
+    target = options.get("target", "c")
+    
+    if target not in BUILD_TARGETS:
+        print(f"Unknown build target '{target}', use --target={'|'.join(BUILD_TARGETS)}")
+        return None
+    
+    return target
+
+
+def jit_option(options: dict, engine: str) -> str | None:
+    """"off", "on" or "stats", --jit-stats also turns the JIT on"""
+    
+    if options.get("jit-stats"):
+        jit = "stats"
+    elif options.get("jit"):
+        jit = "on"
+    else:
+        jit = "off"
+    
+    #The JIT compiles the loops of the tree walker
+    if jit != "off" and engine != "tree":
+        print("The JIT only works with the tree walker, use --jit with --engine=tree")
+        return None
+    
+    return jit
+
+
+def file_option(options: dict, name: str) -> str | None:
+    """File of --out or --input of `run`, "" for stdout or stdin"""
+    
+    path = options.get(name, "")
+    
+    if path is True:
+        print(f"Missing file for --{name}, use --{name}=file or --{name} file")
+        return None
+    
+    return path
+
+
+def jobs_option(options: dict) -> int | None:
+    jobs = options.get("jobs", os.cpu_count() or 1)
+    
+    try:
+        #A bare --jobs has no number
+        jobs = int(jobs) if jobs is not True else 0
+    except ValueError:
+        jobs = 0
+    
+    if jobs < 1:
+        print(f"Invalid number of jobs '{options['jobs']}', use --jobs=N with N 1 or more")
+        return None
+    
+    return jobs
\ No newline at end of file
@@ -0,0 +1,63 @@
+from collections import Counter
+import mmap
+from akorn.ast import ProgramNode
+from akorn.diagnostic import ErrorReporter
+from akorn.scanner import LEXERS
+from akorn.syntatic_normalizer import TheNormalizer
+from akorn.parser import Parser
+
+def parse_source(code: str | mmap.mmap, reporter: ErrorReporter, lexer_engine: str = "fast", debug: bool = False) -> ProgramNode | None:
+    """Lexer -> normalizer -> parser as one pull pipeline, the parser asks for
+    tokens and no phase ever holds the whole token list.
+    \nEvery phase reports into its own ErrorReporter and only the errors of the
+    first phase that failed are displayed, as if they had run one after the
+    other, even if the parser could not cope with the tokens of a phase that
+    had already failed. Returns None when there were errors.
+    \nA memory-mapped `code` (see `load_source`) needs the fast lexer. With
+    `debug` the nodes created by the parser are printed."""
+    
+    lexer_reporter = ErrorReporter()
+    normalizer_reporter = ErrorReporter()
+    
+    lexer = LEXERS[lexer_engine](code, lexer_reporter)
+    
+    #A mapped script is scanned into a compact buffer, its bytes are only copied for the values
+    if isinstance(code, str):
+        tokens = lexer.stream()
+    else:
+        tokens = lexer.tokenize_buffer().tokens()
+    
+    tokens = TheNormalizer(tokens, normalizer_reporter).stream()
+    parser = Parser(tokens, reporter, debug)
+    try:
+        root_node = parser.parse_program()
+    except Exception:
+        #The lexer and the normalizer must still see the rest of the script
+        for _ in tokens:
+            pass
+        
+        if not (lexer_reporter.has_errors() or normalizer_reporter.has_errors()):
+            raise
+    
+    for phase_reporter in (lexer_reporter, normalizer_reporter):
+        if phase_reporter.has_errors():
+            reporter.clear_list_error()
+            
+            for error in phase_reporter.errors:
+                reporter.add_error(error)
+            break
+    
+    if debug:
+        print_allocations(parser.allocations)
+    
+    if reporter.has_errors():
+        reporter.display()
+        reporter.clear_list_error()
+        return None
+    
+    return root_node
+
+
+def print_allocations(allocations: Counter[str]) -> None:
+    detail = ", ".join(f"{name}: {count}" for name, count in allocations.most_common())
+    print(f"[Debug] parser allocations: {allocations.total()} nodes ({detail})\n")
\ No newline at end of file
@@ -1,10 +1,13 @@
-from .cmd_akorn import cmd_akorn_ast, cmd_akorn_help, cmd_akorn_run, cmd_akorn_tokens, cmd_akorn_version
+from .options import split_options, lexer_option, ast_option, engine_option, jit_option, file_option, target_option, jobs_option
+from .cmd_akorn import cmd_akorn_ast, cmd_akorn_build, cmd_akorn_check, cmd_akorn_help, cmd_akorn_run, cmd_akorn_tokens, cmd_akorn_version
 
-def repl(reporter):
+def repl(reporter, debug: bool = False):
     while True:
         cmd = input(">> ")
         
-        args = cmd.split(" ")
+        args, options = split_options(cmd.split(" "))
+        command_debug = debug or bool(options.get("debug"))
+        use_cache = not options.get("no-cache")
         
         if len(args) < 1:
             print("Usage: [command]")
@@ -14,22 +17,64 @@ def repl(reporter):
             break
         
         elif args[0] == "run":
+            lexer_engine = lexer_option(options)
+            ast_form = ast_option(options)
+            engine = engine_option(options)
+            jit = jit_option(options, engine) if engine is not None else None
+            out = file_option(options, "out")
+            input_file = file_option(options, "input")
+            if lexer_engine is None or ast_form is None or engine is None or jit is None or out is None or input_file is None:
+                continue
+            
             try:
-                cmd_akorn_run(args[1], reporter)
+                cmd_akorn_run(args[1], reporter, lexer_engine, command_debug, ast_form, use_cache, engine, jit, out, input_file)
             except IndexError:
-                print("Usage: run [rute script akon]")
+                print("Usage: run [rute script akon] [--lexer=fast|reference] [--ast=tree|flat] [--engine=tree|closure|vm|pycodegen] [--jit] [--jit-stats] [--out=file] [--input=file] [--no-cache] [--debug]")
             
         elif args[0] == "token":
+            lexer_engine = lexer_option(options)
+            if lexer_engine is None:
+                continue
+            
             try:
-                cmd_akorn_tokens(args[1], reporter)
+                cmd_akorn_tokens(args[1], reporter, lexer_engine)
             except IndexError:
-                print("Usage: token [rute script akon]")
+                print("Usage: token [rute script akon] [--lexer=fast|reference]")
         
         elif args[0] == "ast":
+            ast_form = ast_option(options)
+            if ast_form is None:
+                continue
+            
             try:
-                cmd_akorn_ast(args[1], reporter)
+                cmd_akorn_ast(args[1], reporter, command_debug, ast_form)
             except IndexError:
-                print("Usage: ast [rute script akon]")
+                print("Usage: ast [rute script akon] [--ast=tree|flat] [--debug]")
+        
+        elif args[0] == "check":
+            lexer_engine = lexer_option(options)
+            jobs = jobs_option(options)
+            if lexer_engine is None or jobs is None:
+                continue
+            
+            if len(args) < 2:
+                print("Usage: check [rutes of akon scripts or directories] [--jobs=N] [--lexer=fast|reference]")
+                continue
+            
+            cmd_akorn_check(args[1:], jobs, lexer_engine)
+        
+        elif args[0] == "build":
+            lexer_engine = lexer_option(options)
+            target = target_option(options)
+            output = options.get("output")
+            if lexer_engine is None or target is None:
+                continue
+            
+            if len(args) < 2 or output is True:
+                print("Usage: build [rute script akon] [--target=c] [--output=path] [--shared] [--lexer=fast|reference] [--debug]")
+                continue
+            
+            cmd_akorn_build(args[1], reporter, lexer_engine, target, output, bool(options.get("shared")), command_debug)
         
         elif args[0] == "version":
             cmd_akorn_version()
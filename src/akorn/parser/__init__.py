@@ -1,3 +1,4 @@
 from .parser import Parser
+from .token_stream import TokenStream
 
-__all__ = ["Parser"]
\ No newline at end of file
+__all__ = ["Parser", "TokenStream"]
\ No newline at end of file
@@ -1,14 +1,73 @@
+from collections import Counter
+from typing import Callable, Iterable
 from akorn.scanner import Token, TokenType
 from akorn.ast import *
 from akorn.diagnostic import ErrorReporter
 from akorn.enviroment import Enviroment
+from .token_stream import TokenStream
+
+#Binding powers of the prefix operators
+NOT_BINDING_POWER = 3
+UNARY_BINDING_POWER = 8
 
 class Parser:
-    def __init__(self, tokens:list[Token], reporter: ErrorReporter) -> None:
-        self.tokens: list[Token] = tokens
+    #Infix operator -> (binding power, binding power of its right operand, node)
+    #A right operand with the same power makes the operator left-associative
+    infix_operators = {
+        TokenType.OR: (1, 1, BooleanOpNode),
+        TokenType.AND: (2, 2, BooleanOpNode),
+        TokenType.EQUAL: (4, 4, ComparisonOpNode),
+        TokenType.DIFERENT: (4, 4, ComparisonOpNode),
+        TokenType.GREATER: (5, 5, ComparisonOpNode),
+        TokenType.LESS: (5, 5, ComparisonOpNode),
+        TokenType.GREATER_EQUAL: (5, 5, ComparisonOpNode),
+        TokenType.LESS_EQUAL: (5, 5, ComparisonOpNode),
+        TokenType.PLUS: (6, 6, BinaryOpNode),
+        TokenType.MINUS: (6, 6, BinaryOpNode),
+        TokenType.STAR: (7, 7, BinaryOpNode),
+        TokenType.SLASH: (7, 7, BinaryOpNode),
+        TokenType.MOD: (7, 7, BinaryOpNode),
+        TokenType.DOUBLE_STAR: (9, 8, BinaryOpNode),
+    }
+    
+    compound_assignments = {
+        TokenType.PLUS_ASSIGN: "+",
+        TokenType.MINUS_ASSIGN: "-",
+        TokenType.STAR_ASSIGN: "*",
+        TokenType.SLASH_ASSIGN: "/",
+        TokenType.DOUBLE_STAR_ASSIGN: "**",
+        TokenType.MOD_ASSIGN: "%",
+    }
+    
+    def __init__(self, tokens:list[Token] | Iterable[Token], reporter: ErrorReporter, debug: bool = False) -> None:
+        if not isinstance(tokens, list):
+            tokens = TokenStream(tokens)
+        
+        self.tokens: list[Token] | TokenStream = tokens
         self.position = 0
-        self.length_list = len(self.tokens)
         self.reporter = reporter
+        
+        #With debug, parse_program counts the nodes created of each class
+        self.debug = debug
+        self.allocations: Counter[str] = Counter()
+        
+        #Prefix operator -> (binding power, parser)
+        self.prefix_parsers = {
+            TokenType.NOT: (NOT_BINDING_POWER, self.not_boolean_expr),
+            TokenType.MINUS: (UNARY_BINDING_POWER, self.unary_expr),
+        }
+        
+        #First token of a statement -> parser, the token is already consumed when it is called
+        self.statement_parsers = {
+            TokenType.VAR: self.parse_variable_declaration,
+            TokenType.LET: self.parse_variable_declaration,
+            TokenType.IDENT: self.parse_assignment_or_call,
+            TokenType.IF: self.parse_if_statement,
+            TokenType.WHILE: self.parse_while_statement,
+            TokenType.LOOP: self.parse_loop_statement,
+            TokenType.BREAK: self.parse_break_statement,
+            TokenType.CONTINUE: self.parse_continue_statement,
+        }
 
 
     def at_end(self) -> bool:
@@ -41,24 +100,19 @@ class Parser:
     
 
     def peek_token(self, step) -> Token:
-        if self.position + step >= self.length_list:
-            return None
-        
         return self.tokens[self.position + step]
 
 
-    #Seguir mañana y arreglar los comentarios de errores en las lines e columnas
-
     def line(self) -> int:
-        if self.at_end:
-            return self.peek_token(-1).line
-        return self.peek_token(0).line
+        """Line of the last consumed token"""
+        
+        return self.peek_token(-1).line
     
     
     def column(self) -> int:
-        if self.at_end:
-            return self.peek_token(-1).column
-        return self.peek_token(0).column
+        """Column of the last consumed token"""
+        
+        return self.peek_token(-1).column
     
     
     def check(self, type: TokenType) -> bool:
@@ -93,55 +147,54 @@ class Parser:
     
     
     def parse_statement(self, scope: Enviroment) -> Node:
-        none_aux = NoneNode(self.line(), self.column())
+        #Error nodes take the location of the token before the statement
+        anchor = self.peek_token(-1)
+        statement_parser = self.statement_parsers.get(self.peek_token(0).type)
         
-        #Declaracion de variables
-        if self.match_token_type(TokenType.VAR, TokenType.LET):
-            if self.match_token_type(TokenType.INT, TokenType.FLOAT, TokenType.STRING, TokenType.BOOL):
-                mutable: bool = True
-                
-                if self.peek_token(-2).type == TokenType.LET:
-                    mutable = False
-            
-                data_type = self.peek_token(-1).value
-                
-                return self.parse_declaration(data_type, mutable, scope)
+        #Algo extraño
+        if statement_parser is None:
+            self.declare_error("Unexpected syntax error")
+            return NoneNode(anchor.line, anchor.column)
+        
+        self.advance()
+        node = statement_parser(scope)
+        
+        if node is None:
+            return NoneNode(anchor.line, anchor.column)
+        
+        return node
+    
+    
+    #Declaracion de variables
+    def parse_variable_declaration(self, scope: Enviroment) -> list[DeclarationNode] | None:
+        if self.match_token_type(TokenType.INT, TokenType.FLOAT, TokenType.STRING, TokenType.BOOL):
+            mutable: bool = True
             
-            else:
-                self.declare_error("The variable declaration attempt failed; the variable's data type was missing after the mutated type.")
-                return none_aux
+            if self.peek_token(-2).type == TokenType.LET:
+                mutable = False
         
-        #Asignacion de variables o llamado a funcion
-        elif self.match_token_type(TokenType.IDENT):
-            if self.match_token_type(TokenType.LPAREN):
-                return self.parse_call_function(scope)
-            else:
-                return self.parse_assignment(scope)
+            data_type = self.peek_token(-1).value
             
-        #If Statement
-        elif self.match_token_type(TokenType.IF):
-            return self.parse_if_statement(scope)
-
-        # While Statement
-        elif self.match_token_type(TokenType.WHILE):
-            return self.parse_while_statement(scope, False)
+            return self.parse_declaration(data_type, mutable, scope)
         
-        # Loop Statement
-        elif self.match_token_type(TokenType.LOOP):
-            return self.parse_while_statement(scope, True)
+        self.declare_error("The variable declaration attempt failed; the variable's data type was missing after the mutated type.")
+        return None
+    
+    
+    #Asignacion de variables o llamado a funcion
+    def parse_assignment_or_call(self, scope: Enviroment) -> Node:
+        if self.match_token_type(TokenType.LPAREN):
+            return self.parse_call_function(scope)
         
-        # Break Statement
-        elif self.match_token_type(TokenType.BREAK):
-            return BreakStatement()
-
-        # Continue Statement
-        elif self.match_token_type(TokenType.CONTINUE):
-            return ContinueStatement()
-            
-        #Algo extraño
-        else:
-            self.declare_error("Unexpected syntax error")
-            return none_aux
+        return self.parse_assignment(scope)
+    
+    
+    def parse_break_statement(self, scope: Enviroment) -> BreakStatement:
+        return BreakStatement()
+    
+    
+    def parse_continue_statement(self, scope: Enviroment) -> ContinueStatement:
+        return ContinueStatement()
             
 
     def parse_declaration(self, data_type: str, mutable: bool, scope: Enviroment) -> list[DeclarationNode]:
@@ -159,10 +212,10 @@ class Parser:
 
     def parse_single_declaration(self, data_type: str, mutable: bool, scope: Enviroment) -> DeclarationNode:
         #Locacion de la declaracion
-        none_aux = NoneNode(self.line(), self.column())
+        anchor = self.peek_token(-1)
         
         if not self.eat(TokenType.IDENT, "Variable declaration attempt failed, identifier not declared"):
-            return none_aux
+            return NoneNode(anchor.line, anchor.column)
         
         var_name = self.peek_token(-1).value
         
@@ -170,72 +223,42 @@ class Parser:
         if self.match_token_type(TokenType.ASSIGN):
             var_value = self.expression(scope)
         elif self.check(TokenType.SEMICOLON) or self.check(TokenType.COMMA):
-            var_value = none_aux
+            var_value = NoneNode(anchor.line, anchor.column)
         else:
             self.declare_error("Variable declaration attempt failed; neither assignment operator ('=') for initialization \nnor semicolon (';') to terminate the statement with an empty declaration was found.")
-            return none_aux
+            return NoneNode(anchor.line, anchor.column)
         
         return DeclarationNode(var_name, data_type, mutable, var_value)
         
          
     def parse_assignment(self, scope) -> AssignmentNode:
-        var_name = self.peek_token(-1).value
-        none_aux = NoneNode(self.line(), self.column())
+        anchor = self.peek_token(-1)
+        var_name = anchor.value
         
         if self.match_token_type(TokenType.ASSIGN):
             var_value = self.expression(scope)
-            
-        elif self.match_token_type(TokenType.PLUS_ASSIGN):
-            var_value = BinaryOpNode(
-                VariableNode(var_name, self.line(), self.column()),
-                "+",
-                self.expression(scope)
-            )
-        
-        elif self.match_token_type(TokenType.MINUS_ASSIGN):
-            var_value = BinaryOpNode(
-                VariableNode(var_name, self.line(), self.column()),
-                "-",
-                self.expression(scope)
-            )
-        
-        elif self.match_token_type(TokenType.STAR_ASSIGN):
-            var_value = BinaryOpNode(
-                VariableNode(var_name, self.line(), self.column()),
-                "*",
-                self.expression(scope)
-            )
-        
-        elif self.match_token_type(TokenType.SLASH_ASSIGN):
-            var_value = BinaryOpNode(
-                VariableNode(var_name, self.line(), self.column()),
-                "/",
-                self.expression(scope)
-            )
-        
-        elif self.match_token_type(TokenType.DOUBLE_STAR_ASSIGN):
-            var_value = BinaryOpNode(
-                VariableNode(var_name, self.line(), self.column()),
-                "**",
-                self.expression(scope)
-            )
         
-        elif self.match_token_type(TokenType.MOD_ASSIGN):
+        #Compound assignment, x += value is parsed as x = x + value
+        elif self.peek_token(0).type in self.compound_assignments:
+            self.advance()
+            operator_token = self.peek_token(-1)
+            
             var_value = BinaryOpNode(
-                VariableNode(var_name, self.line(), self.column()),
-                "%",
+                VariableNode(var_name, operator_token.line, operator_token.column),
+                self.compound_assignments[operator_token.type],
                 self.expression(scope)
             )
                 
         else:
             self.declare_error("The attempt to assign to a variable failed; the common assignment operator or compound assignment operator was not found.")
-            return none_aux
+            return NoneNode(anchor.line, anchor.column)
         
         return AssignmentNode(var_name, var_value)
             
 
     def parse_call_function(self, scope) -> CallNode | NoneNode:
-        call_name = self.peek_token(-2).value
+        callee = self.peek_token(-2)
+        call_name = callee.value
         call_args = []
         
         while True:
@@ -249,7 +272,7 @@ class Parser:
                 self.declare_error("The function call failed; I needed closing parenthesis ')' or ',' to continue providing arguments.")
                 return NoneNode(self.line(), self.column())
                 
-        return CallNode(call_name, call_args)
+        return CallNode(call_name, call_args, callee.line, callee.column)
             
             
     def parse_if_statement(self, scope: Enviroment) -> IfNode:
@@ -278,7 +301,7 @@ class Parser:
         return IfNode(branches, else_node)        
     
     
-    def parse_while_statement(self, scope: Enviroment, loop: bool) -> WhileNode:
+    def parse_while_statement(self, scope: Enviroment, loop: bool = False) -> WhileNode:
         if loop:
             cond = BoolNode(True, self.line(), self.column())
         else:
@@ -289,11 +312,15 @@ class Parser:
         return WhileNode(cond, block)
     
     
+    def parse_loop_statement(self, scope: Enviroment) -> WhileNode:
+        return self.parse_while_statement(scope, True)
+    
+    
     def parse_block(self, scope: Enviroment) -> BlockNode | NoneNode:
-        none_aux = NoneNode(self.line(), self.column())
+        anchor = self.peek_token(-1)
         
         if not self.eat(TokenType.LBRACE, "Attempt at statement with code block failed, opening block '{' could not be found"):
-            return none_aux
+            return NoneNode(anchor.line, anchor.column)
             
         scope_block = Enviroment(scope)
         statements = []
@@ -304,7 +331,7 @@ class Parser:
 
             if self.at_end():
                 self.declare_error("Attempt at statement with code block failed, block closure '}' not found")
-                return none_aux
+                return NoneNode(anchor.line, anchor.column)
                 
             if self.match_token_type(TokenType.RBRACE):
                 break
@@ -321,6 +348,44 @@ class Parser:
               
                 
     def parse_program(self) -> ProgramNode:
+        if self.debug:
+            return self.count_allocations(self.parse_statements)
+        
+        return self.parse_statements()
+    
+    
+    def count_allocations(self, parse: Callable[[], ProgramNode]) -> ProgramNode:
+        """Runs `parse` with the __init__ of every node class wrapped by a
+        counter, so the normal parse does not pay anything for it"""
+        
+        allocations = self.allocations
+        originals = {}
+        node_classes = [Node]
+        
+        def counting(node_class, init):
+            def counting_init(node, *args, **kwargs):
+                if type(node) is node_class:
+                    allocations[node_class.__name__] += 1
+                init(node, *args, **kwargs)
+            
+            return counting_init
+        
+        for node_class in node_classes:
+            node_classes.extend(node_class.__subclasses__())
+            originals[node_class] = node_class.__dict__.get("__init__")
+            node_class.__init__ = counting(node_class, node_class.__init__)
+        
+        try:
+            return parse()
+        finally:
+            for node_class, init in originals.items():
+                if init is None:
+                    del node_class.__init__
+                else:
+                    node_class.__init__ = init
+    
+    
+    def parse_statements(self) -> ProgramNode:
         statements: list[Node] = []
         scope = Enviroment()
         
@@ -342,137 +407,90 @@ class Parser:
         return ProgramNode(statements, scope)
         
         
-    def expression(self, scope) -> Node:
-        return self.or_expr(scope)
-    
-
-    def or_expr(self, scope) -> Node:
-        node = self.and_expr(scope)
+    def expression(self, scope, binding_power: int = 0) -> Node:
+        """Pratt parser: the first token is parsed by its prefix parser and
+        then every infix operator that binds tighter than `binding_power`
+        takes the node built so far as its left operand"""
         
-        while self.match_token_type(TokenType.OR):
-            node = BooleanOpNode(node, "or", self.and_expr(scope))
+        prefix = self.prefix_parsers.get(self.peek_token(0).type)
         
-        return node
-    
-    
-    def and_expr(self, scope) -> Node:
-        node = self.not_boolean_expr(scope)
-        
-        while self.match_token_type(TokenType.AND):
-            node = BooleanOpNode(node, "and", self.not_boolean_expr(scope))
-            
-        return node
-    
-    
-    def not_boolean_expr(self, scope) -> Node:
-        if self.match_token_type(TokenType.NOT):
-            node = NotBooleanNode(self.not_boolean_expr(scope))
+        #not and - are only allowed where the grammar reaches them
+        if prefix is not None and binding_power < prefix[0]:
+            node = prefix[1](scope)
         else:
-            node = self.equality_expr(scope)
-            
-        return node
-
-
-    def equality_expr(self, scope) -> Node:
-        node = self.comp_expr(scope)
+            node = self.primitive(scope)
         
-        while self.match_token_type(TokenType.EQUAL, TokenType.DIFERENT):
-            node = ComparisonOpNode(node, self.peek_token(-1).value, self.comp_expr(scope))
+        while True:
+            infix = self.infix_operators.get(self.peek_token(0).type)
             
-        return node
-
-
-    def comp_expr(self, scope) -> Node:
-        node = self.add_expr(scope)
-        
-        while self.match_token_type(TokenType.GREATER, TokenType.LESS, TokenType.GREATER_EQUAL, TokenType.LESS_EQUAL):
-            node = ComparisonOpNode(node, self.peek_token(-1).value, self.add_expr(scope))
-        
-        return node    
-        
+            if infix is None or infix[0] <= binding_power:
+                return node
             
-    def add_expr(self, scope) -> Node:
-        node = self.mult_expr(scope)
-        
-        while self.match_token_type(TokenType.PLUS, TokenType.MINUS):
-            node = BinaryOpNode(node, self.peek_token(-1).value, self.mult_expr(scope))
+            _, right_binding_power, node_class = infix
+            operator = self.peek_token(0).value
+            self.advance()
             
-        return node
+            node = node_class(node, operator, self.expression(scope, right_binding_power))
     
     
-    def mult_expr(self, scope) -> Node:
-        node = self.unary_expr(scope)
-        
-        while self.match_token_type(TokenType.STAR, TokenType.SLASH, TokenType.MOD):
-            node = BinaryOpNode(node, self.peek_token(-1).value, self.unary_expr(scope))
-            
-        return node
+    def not_boolean_expr(self, scope) -> Node:
+        self.advance()
+        return NotBooleanNode(self.expression(scope, NOT_BINDING_POWER - 1))
     
     
     def unary_expr(self, scope) -> Node:
-        if self.match_token_type(TokenType.MINUS):
-            node = UnaryNode(self.peek_token(-1).value, self.unary_expr(scope))
-        else:
-            node = self.power_expr(scope)
-            
-        return node
-    
-    
-    def power_expr(self, scope) -> Node:
-        node = self.primitive(scope)
-        
-        while self.match_token_type(TokenType.DOUBLE_STAR):
-            node = BinaryOpNode(node, "**", self.power_expr(scope))
-            
-        return node
+        self.advance()
+        operator = self.peek_token(-1).value
+        return UnaryNode(operator, self.expression(scope, UNARY_BINDING_POWER - 1))
     
     
     def primitive(self, scope) -> Node:
-        none_aux = NoneNode(self.line(), self.column())
+        anchor = self.peek_token(-1)
+        current_token = self.peek_token(0)
+        token_type = current_token.type
         
         # Is a NUMBER?
-        if self.match_token_type(TokenType.NUMBER):
-            current_token = self.peek_token(-1)
+        if token_type == TokenType.NUMBER:
+            self.advance()
             
             if isinstance(current_token.value, float):
-                node = FloatNode(current_token.value, current_token.line, current_token.column)
-            else:
-                node = IntNode(current_token.value, current_token.line, current_token.column)
+                return FloatNode(current_token.value, current_token.line, current_token.column)
             
-            return node
+            return IntNode(current_token.value, current_token.line, current_token.column)
 
         # is a STRING_LITERAL
-        if self.match_token_type(TokenType.STRING_LITERAL):
-            current_token = self.peek_token(-1)
-            node = StringNode(current_token.value, current_token.line, current_token.column)
-            return node
+        if token_type == TokenType.STRING_LITERAL:
+            self.advance()
+            return StringNode(current_token.value, current_token.line, current_token.column)
                         
-       # is a bool
-        if self.match_token_type(TokenType.TRUE):
-            return BoolNode(True, self.line(), self.column())
-        
-        if self.match_token_type(TokenType.FALSE):
-            return BoolNode(False, self.line(), self.column())
+        # is a bool
+        if token_type == TokenType.TRUE or token_type == TokenType.FALSE:
+            self.advance()
+            return BoolNode(token_type == TokenType.TRUE, current_token.line, current_token.column)
         
-        #is a None value
-        if self.match_token_type(TokenType.NONE):
-            return none_aux
+        #is a None value, located at the token before it
+        if token_type == TokenType.NONE:
+            self.advance()
+            return NoneNode(anchor.line, anchor.column)
         
         # Is a LPAREN?
-        if self.match_token_type(TokenType.LPAREN):
+        if token_type == TokenType.LPAREN:
+            self.advance()
             node = self.expression(scope)
+            
             if not self.eat(TokenType.RPAREN, "Priority exploitation attempt failed, parenthesis lock ')' not found"):
-                return none_aux
+                return NoneNode(anchor.line, anchor.column)
+            
             return node
         
         #Is a identifier?
-        elif self.match_token_type(TokenType.IDENT):
+        if token_type == TokenType.IDENT:
+            self.advance()
+            
             if self.match_token_type(TokenType.LPAREN):
                 return self.parse_call_function(scope)
-            else:
-                variable_token = self.peek_token(-1)
-                return VariableNode(variable_token.value, variable_token.line, variable_token.column)
+            
+            return VariableNode(current_token.value, current_token.line, current_token.column)
                 
         self.declare_error("Unexpected primitive")
-        return none_aux
-
+        return NoneNode(anchor.line, anchor.column)
\ No newline at end of file
@@ -0,0 +1,38 @@
+from collections import deque
+from typing import Iterable
+from akorn.scanner import Token, TokenType
+
+class TokenStream:
+    """Indexable window over a token iterator.
+    \nThe parser indexes it like the token list, but only the last `capacity`
+    tokens pulled from the iterator are kept, so memory does not grow with
+    the size of the script."""
+    
+    def __init__(self, tokens: Iterable[Token], capacity: int = 4) -> None:
+        self.tokens = iter(tokens)
+        self.window: deque[Token] = deque()
+        self.capacity = capacity
+        self.first = 0
+        self.last_token: Token = Token(TokenType.EOF, None, 0, 0)
+        
+    def __getitem__(self, index: int) -> Token:
+        #Like list[-1], before the first token is the EOF
+        if index < 0:
+            return self.last_token
+        
+        while index >= self.first + len(self.window):
+            token = next(self.tokens, None)
+            
+            if token is None:
+                return self.last_token
+            
+            self.window.append(token)
+            
+            if len(self.window) > self.capacity:
+                self.window.popleft()
+                self.first += 1
+        
+        if index < self.first:
+            raise IndexError(f"token {index} is no longer in the window of the stream")
+        
+        return self.window[index - self.first]
@@ -1,3 +1,12 @@
 from .interpreter import Interpreter
+from .frames import FramePool
+from .output import OutputBuffer
+from .input import InputReader
+from .closure_compiler import ClosureInterpreter
+from .bytecode import Bytecode, BytecodeCompiler
+from .vm import VirtualMachine
+from .pycodegen import PythonCodegen, PythonEngine
+from .jit import LoopJit
+from .engines import ENGINES
 
-__all__ = ["Interpreter"]
\ No newline at end of file
+__all__ = ["Interpreter", "FramePool", "OutputBuffer", "InputReader", "ClosureInterpreter", "Bytecode", "BytecodeCompiler", "VirtualMachine", "PythonCodegen", "PythonEngine", "LoopJit", "ENGINES"]
\ No newline at end of file
@@ -0,0 +1,435 @@
+import operator
+from array import array
+from bisect import bisect_right
+from akorn.ast import *
+
+#Every instruction is four ints, the opcode and three arguments (0 when not used)
+OPCODES = (
+    "LOAD_CONST",
+    "LOAD_VAR",
+    "STORE_VAR",
+    "BINARY",
+    "BINARY_VAR",
+    "BINARY_CONST",
+    "VAR_BINARY_VAR",
+    "VAR_BINARY_CONST",
+    "DIVIDE",
+    "DIVIDE_VAR",
+    "VAR_DIVIDE_VAR",
+    "NEGATIVE",
+    "POSITIVE",
+    "NOT",
+    "JUMP",
+    "JUMP_IF_FALSE",
+    "JUMP_IF_FALSE_OR_POP",
+    "JUMP_IF_TRUE_OR_POP",
+    "CALL",
+    "POP",
+    "HALT",
+)
+
+(
+    LOAD_CONST,
+    LOAD_VAR,
+    STORE_VAR,
+    BINARY,
+    BINARY_VAR,
+    BINARY_CONST,
+    VAR_BINARY_VAR,
+    VAR_BINARY_CONST,
+    DIVIDE,
+    DIVIDE_VAR,
+    VAR_DIVIDE_VAR,
+    NEGATIVE,
+    POSITIVE,
+    NOT,
+    JUMP,
+    JUMP_IF_FALSE,
+    JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_TRUE_OR_POP,
+    CALL,
+    POP,
+    HALT,
+) = range(len(OPCODES))
+
+#Functions of the operators, the BINARY instructions take their index
+OPERATOR_FUNCTIONS = (
+    operator.add,
+    operator.sub,
+    operator.mul,
+    operator.pow,
+    operator.lt,
+    operator.gt,
+    operator.le,
+    operator.ge,
+    operator.eq,
+    operator.ne,
+    operator.floordiv,
+    operator.truediv,
+    operator.mod,
+)
+
+OPERATOR_INDEXES = {
+    "+": 0,
+    "-": 1,
+    "*": 2,
+    "**": 3,
+    "<": 4,
+    ">": 5,
+    "<=": 6,
+    ">=": 7,
+    "==": 8,
+    "!=": 9,
+}
+
+FLOOR_DIVISION, TRUE_DIVISION, MODULO = 10, 11, 12
+
+LITERAL_KINDS = frozenset((IntNode, FloatNode, StringNode, BoolNode))
+
+
+class Bytecode:
+    """Compiled program: the instructions, the constant pool and the line
+    table.
+    \n`instructions` holds (opcode, a, b, c) quadruples, instruction i is the
+    ints 4i to 4i + 3, and a jump takes in `a` the number of the instruction
+    it goes to. The BINARY instructions take the index of an
+    OPERATOR_FUNCTIONS function in `a` and the variable or the constant of
+    their right operand in `b`; the VAR_BINARY ones take the variable of
+    the left operand in `b` and the right operand in `c`. The DIVIDE ones
+    are the same for the divisions whose divisor is checked for zero. The constants are the values of
+    the literals and the (name of the builtin, number of arguments) of the
+    calls, the engine that runs the bytecode has the builtins. Variables are indexes
+    into one list, `variable_count` long, with a range for every block.
+    \nThe line table maps the instructions to the source: entry i says that
+    the instructions from number `line_starts[i]` on come from `line_numbers[i]`,
+    `line_columns[i]`."""
+
+    def __init__(self) -> None:
+        self.instructions = array('i')
+        self.constants: list = []
+        self.variable_count = 0
+        self.line_starts = array('i')
+        self.line_numbers = array('i')
+        self.line_columns = array('i')
+
+
+    def position(self, index: int) -> tuple[int, int]:
+        """(line, column) of the instruction number `index`"""
+
+        entry = bisect_right(self.line_starts, index) - 1
+
+        if entry < 0:
+            return 0, 0
+
+        return self.line_numbers[entry], self.line_columns[entry]
+
+
+    def unpack(self) -> list[tuple[int, int, int, int]]:
+        """The instructions as (opcode, a, b, c) tuples, what the VM runs"""
+
+        instructions = iter(self.instructions)
+        return list(zip(instructions, instructions, instructions, instructions))
+
+
+    def disassemble(self) -> str:
+        lines = []
+
+        for index, (opcode, a, b, c) in enumerate(self.unpack()):
+            line, column = self.position(index)
+
+            if opcode in (LOAD_CONST, CALL):
+                detail = f"{a} ({self.constants[a]!r})"
+            elif opcode in (BINARY, BINARY_VAR, DIVIDE, DIVIDE_VAR):
+                detail = f"{OPERATOR_FUNCTIONS[a].__name__} {b}"
+            elif opcode == BINARY_CONST:
+                detail = f"{OPERATOR_FUNCTIONS[a].__name__} {b} ({self.constants[b]!r})"
+            elif opcode in (VAR_BINARY_VAR, VAR_DIVIDE_VAR):
+                detail = f"{OPERATOR_FUNCTIONS[a].__name__} {b} {c}"
+            elif opcode == VAR_BINARY_CONST:
+                detail = f"{OPERATOR_FUNCTIONS[a].__name__} {b} {c} ({self.constants[c]!r})"
+            else:
+                detail = f"{a}"
+
+            lines.append(f"{index:>6} {line:>5}:{column:<4} {OPCODES[opcode]:<22}{detail}")
+
+        return "\n".join(lines)
+
+
+class BytecodeCompiler:
+    """Turns a checked and resolved program into `Bytecode`.
+    \nEvery block gets its own range of the variable list, its (depth, slot)
+    addresses of the Resolver become `base of the block + slot`. A block
+    does not clear its range when it runs again, Semantic already rejects a
+    variable read before its declaration.
+    \nA break or continue out of any loop ends the statement of the program
+    it is in, as in the tree walker."""
+
+    def __init__(self) -> None:
+        self.bytecode = Bytecode()
+        self.constant_indexes: dict[tuple, int] = {}
+        #Base of the open blocks by depth
+        self.bases: list[int] = []
+        #Start of each open loop and the jumps of its breaks
+        self.loops: list[tuple[int, list[int]]] = []
+        #Jumps of the breaks and continues outside of a loop
+        self.statement_exits: list[int] = []
+
+        self.statement_compilers = {
+            DeclarationNode: self.compile_store,
+            AssignmentNode: self.compile_store,
+            CallNode: self.compile_call_statement,
+            IfNode: self.compile_if,
+            WhileNode: self.compile_while,
+            BreakStatement: self.compile_break,
+            ContinueStatement: self.compile_continue,
+        }
+
+        self.expression_compilers = {
+            IntNode: self.compile_literal,
+            FloatNode: self.compile_literal,
+            StringNode: self.compile_literal,
+            BoolNode: self.compile_literal,
+            NoneNode: self.compile_literal,
+            VariableNode: self.compile_variable,
+            UnaryNode: self.compile_unary,
+            NotBooleanNode: self.compile_not,
+            BinaryOpNode: self.compile_operation,
+            ComparisonOpNode: self.compile_operation,
+            BooleanOpNode: self.compile_boolean_operation,
+            CallNode: self.compile_call,
+        }
+
+
+    def compile(self, root_node: ProgramNode | FlatAst) -> Bytecode:
+        if isinstance(root_node, FlatAst):
+            root_node = root_node.root()
+
+        self.open_block(root_node)
+
+        for statement in root_node.statements:
+            self.compile_statement(statement)
+
+            for jump in self.statement_exits:
+                self.patch(jump)
+
+            self.statement_exits = []
+
+        self.bases.pop()
+        self.emit(HALT)
+        return self.bytecode
+
+
+    def emit(self, opcode: int, a: int = 0, b: int = 0, c: int = 0, node: Node | None = None) -> int:
+        """Appends an instruction and returns the index of its first argument
+        in the array, a `node` adds its position to the line table when it
+        changes"""
+
+        bytecode = self.bytecode
+        index = self.next_instruction()
+
+        if node is not None:
+            line, column = node.line, node.column
+
+            if not bytecode.line_starts or (bytecode.line_numbers[-1], bytecode.line_columns[-1]) != (line, column):
+                bytecode.line_starts.append(index)
+                bytecode.line_numbers.append(line)
+                bytecode.line_columns.append(column)
+
+        bytecode.instructions.extend((opcode, a, b, c))
+        return index * 4 + 1
+
+
+    def patch(self, argument_index: int) -> None:
+        """Makes the jump whose argument is at `argument_index` go to the next instruction"""
+
+        self.bytecode.instructions[argument_index] = self.next_instruction()
+
+
+    def next_instruction(self) -> int:
+        return len(self.bytecode.instructions) // 4
+
+
+    def constant(self, value) -> int:
+        #1, 1.0 and True are equal, the type keeps them apart
+        key = (type(value), value)
+        index = self.constant_indexes.get(key)
+
+        if index is None:
+            index = self.constant_indexes[key] = len(self.bytecode.constants)
+            self.bytecode.constants.append(value)
+
+        return index
+
+
+    def open_block(self, block_node: ProgramNode | BlockNode) -> None:
+        del self.bases[block_node.depth:]
+        self.bases.append(self.bytecode.variable_count)
+        self.bytecode.variable_count += block_node.size
+
+
+    def compile_block(self, block_node: BlockNode) -> None:
+        self.open_block(block_node)
+
+        for statement in block_node.statements:
+            self.compile_statement(statement)
+
+        self.bases.pop()
+
+
+    def variable(self, node: VariableNode | AssignmentNode | DeclarationNode) -> int:
+        return self.bases[node.depth] + node.slot
+
+
+    def compile_statement(self, node: Node) -> None:
+        compiler = self.statement_compilers.get(node.kind)
+
+        if compiler is not None:
+            compiler(node)
+
+
+    def compile_store(self, node: DeclarationNode | AssignmentNode) -> None:
+        self.compile_expression(node.value)
+        self.emit(STORE_VAR, self.variable(node), node=node)
+
+
+    def compile_call_statement(self, call_node: CallNode) -> None:
+        self.compile_call(call_node)
+        self.emit(POP)
+
+
+    def compile_if(self, if_node: IfNode) -> None:
+        exits = []
+
+        for condition, block in if_node.branches:
+            self.compile_expression(condition)
+            next_branch = self.emit(JUMP_IF_FALSE)
+            self.compile_block(block)
+            exits.append(self.emit(JUMP))
+            self.patch(next_branch)
+
+        if if_node.else_node.kind is ElseNode:
+            self.compile_block(if_node.else_node.block)
+
+        for jump in exits:
+            self.patch(jump)
+
+
+    def compile_while(self, while_node: WhileNode) -> None:
+        start = self.next_instruction()
+        breaks = []
+        self.loops.append((start, breaks))
+
+        self.compile_expression(while_node.condition)
+        breaks.append(self.emit(JUMP_IF_FALSE))
+        self.compile_block(while_node.block)
+        self.emit(JUMP, start)
+
+        self.loops.pop()
+
+        for jump in breaks:
+            self.patch(jump)
+
+
+    def compile_break(self, break_node: BreakStatement) -> None:
+        if not self.loops:
+            self.statement_exits.append(self.emit(JUMP))
+            return
+
+        self.loops[-1][1].append(self.emit(JUMP))
+
+
+    def compile_continue(self, continue_node: ContinueStatement) -> None:
+        if not self.loops:
+            self.statement_exits.append(self.emit(JUMP))
+            return
+
+        self.emit(JUMP, self.loops[-1][0])
+
+
+    def compile_expression(self, node: Node) -> None:
+        self.expression_compilers[node.kind](node)
+
+
+    def compile_literal(self, literal_node: LiteralNode | NoneNode) -> None:
+        #A declaration without value holds None, as in the tree walker
+        value = None if literal_node.kind is NoneNode else literal_node.value
+        self.emit(LOAD_CONST, self.constant(value))
+
+
+    def compile_variable(self, var_node: VariableNode) -> None:
+        self.emit(LOAD_VAR, self.variable(var_node))
+
+
+    def compile_unary(self, unary_node: UnaryNode) -> None:
+        self.compile_expression(unary_node.node)
+        self.emit(NEGATIVE if unary_node.operator == "-" else POSITIVE)
+
+
+    def compile_not(self, not_node: NotBooleanNode) -> None:
+        self.compile_expression(not_node.node)
+        self.emit(NOT)
+
+
+    def compile_operation(self, operation: BinaryOpNode | ComparisonOpNode) -> None:
+        """A variable or a literal on the right is taken by the instruction
+        itself instead of being pushed first, and so is a variable on the
+        left when the right one is taken.
+        \nThe divisions are only checked for zero when the divisor is not a
+        literal, and Semantic's static type says if `/` divides two ints (the
+        floor division of the tree walker) or two floats."""
+
+        operator = operation.operator
+        left, right = operation.left, operation.right
+
+        if operator == "%":
+            function = MODULO
+        elif operator == "/":
+            function = FLOOR_DIVISION if operation.static_type == "int" else TRUE_DIVISION
+        else:
+            function = OPERATOR_INDEXES[operator]
+
+        if right.kind in LITERAL_KINDS and (function < FLOOR_DIVISION or right.value != 0):
+            if left.kind is VariableNode:
+                self.emit(VAR_BINARY_CONST, function, self.variable(left), self.constant(right.value))
+            else:
+                self.compile_expression(left)
+                self.emit(BINARY_CONST, function, self.constant(right.value))
+
+        elif function >= FLOOR_DIVISION:
+            #The division errors point at the left operand
+            if right.kind is not VariableNode:
+                self.compile_expression(left)
+                self.compile_expression(right)
+                self.emit(DIVIDE, function, node=left)
+            elif left.kind is VariableNode:
+                self.emit(VAR_DIVIDE_VAR, function, self.variable(left), self.variable(right), node=left)
+            else:
+                self.compile_expression(left)
+                self.emit(DIVIDE_VAR, function, self.variable(right), node=left)
+
+        elif right.kind is VariableNode:
+            if left.kind is VariableNode:
+                self.emit(VAR_BINARY_VAR, function, self.variable(left), self.variable(right))
+            else:
+                self.compile_expression(left)
+                self.emit(BINARY_VAR, function, self.variable(right))
+
+        else:
+            self.compile_expression(left)
+            self.compile_expression(right)
+            self.emit(BINARY, function)
+
+
+    def compile_boolean_operation(self, operation: BooleanOpNode) -> None:
+        #The right operand is skipped when the left one decides, the left value stays as the result
+        self.compile_expression(operation.left)
+        end = self.emit(JUMP_IF_FALSE_OR_POP if operation.operator == "and" else JUMP_IF_TRUE_OR_POP)
+        self.compile_expression(operation.right)
+        self.patch(end)
+
+
+    def compile_call(self, call_node: CallNode) -> None:
+        for arg in call_node.args:
+            self.compile_expression(arg)
+
+        self.emit(CALL, self.constant((call_node.calle, len(call_node.args))), node=call_node)
\ No newline at end of file
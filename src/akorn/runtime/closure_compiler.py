@@ -0,0 +1,303 @@
+from typing import Callable
+from akorn.ast import *
+from akorn.diagnostic import ErrorReporter
+from .interpreter import make_builtins, NORMAL, BREAK, CONTINUE
+from .frames import FramePool
+from .output import OutputBuffer
+from .input import InputReader
+
+#A compiled node is a closure without arguments, expressions return their
+#value and statements None or the BREAK/CONTINUE completion of the tree walker
+Compiled = Callable[[], object]
+
+#Operator -> maker of the closure of an operation on two compiled operands
+BINARY_CLOSURES: dict[str, Callable[[Compiled, Compiled], Compiled]] = {
+    "+": lambda left, right: lambda: left() + right(),
+    "-": lambda left, right: lambda: left() - right(),
+    "*": lambda left, right: lambda: left() * right(),
+    "**": lambda left, right: lambda: left() ** right(),
+    "<": lambda left, right: lambda: left() < right(),
+    ">": lambda left, right: lambda: left() > right(),
+    "<=": lambda left, right: lambda: left() <= right(),
+    ">=": lambda left, right: lambda: left() >= right(),
+    "==": lambda left, right: lambda: left() == right(),
+    "!=": lambda left, right: lambda: left() != right(),
+    "and": lambda left, right: lambda: left() and right(),
+    "or": lambda left, right: lambda: left() or right(),
+}
+
+
+class ClosureInterpreter:
+    """Execution engine that compiles the checked program once into a tree
+    of closures, one per node, and then calls the closure of the root.
+    \nEverything a node needs is bound when it is compiled: the closures of
+    its children, the function of its operator, its value or its (depth,
+    slot) address, so running a node does not look at the AST, its kind or
+    its operator again. The output and the errors are the ones of
+    `Interpreter`, with the same frames of the Resolver and the same
+    `FramePool`."""
+
+    def __init__(self, root_node: ProgramNode | FlatAst, reporter: ErrorReporter):
+        if isinstance(root_node, FlatAst):
+            root_node = root_node.root()
+
+        self.reporter = reporter
+        self.frames: list[list] = []
+        self.frame_pool = FramePool()
+        self.output = OutputBuffer()
+        self.input = InputReader(self.output)
+        self.builtins = make_builtins(self.output, self.input)
+
+        self.statement_compilers = {
+            DeclarationNode: self.compile_declaration,
+            AssignmentNode: self.compile_assignment,
+            CallNode: self.compile_call_statement,
+            IfNode: self.compile_if,
+            WhileNode: self.compile_while,
+            BreakStatement: self.compile_jump,
+            ContinueStatement: self.compile_jump,
+        }
+
+        self.expression_compilers = {
+            IntNode: self.compile_literal,
+            FloatNode: self.compile_literal,
+            StringNode: self.compile_literal,
+            BoolNode: self.compile_literal,
+            NoneNode: self.compile_none,
+            VariableNode: self.compile_variable,
+            UnaryNode: self.compile_unary,
+            NotBooleanNode: self.compile_not,
+            BinaryOpNode: self.compile_binary_operation,
+            ComparisonOpNode: self.compile_binary_operation,
+            BooleanOpNode: self.compile_binary_operation,
+            CallNode: self.compile_call,
+        }
+
+        self.program = self.compile_program(root_node)
+
+
+    def stop(self):
+        raise Exception
+
+
+    def interpret_main(self):
+        try:
+            self.program()
+        finally:
+            self.output.flush()
+
+
+    def compile_program(self, program_node: ProgramNode) -> Compiled:
+        frames = self.frames
+        frame_pool = self.frame_pool
+        size = program_node.size
+        statements = self.compile_statements(program_node.statements)
+
+        #The program ignores the breaks and continues out of a loop, like the tree walker
+        def run_program():
+            frames[:] = [frame_pool.acquire(size)]
+
+            try:
+                for statement in statements:
+                    statement()
+            finally:
+                #With an error the blocks it stopped are still open
+                for frame in frames:
+                    frame_pool.release(frame)
+
+                frames.clear()
+
+        return run_program
+
+
+    def compile_statements(self, statements: list[Node]) -> list[Compiled]:
+        compilers = self.statement_compilers
+        return [compilers[node.kind](node) for node in statements if node.kind in compilers]
+
+
+    def compile_block(self, block_node: BlockNode) -> Compiled:
+        frames = self.frames
+        acquire = self.frame_pool.acquire
+        release = self.frame_pool.release
+        size = block_node.size
+        statements = self.compile_statements(block_node.statements)
+
+        def run_block():
+            frames.append(acquire(size))
+
+            for statement in statements:
+                completion = statement()
+
+                if completion:
+                    break
+            else:
+                completion = None
+
+            release(frames.pop())
+            return completion
+
+        return run_block
+
+
+    def compile_jump(self, jump_node: BreakStatement | ContinueStatement) -> Compiled:
+        completion = BREAK if jump_node.kind is BreakStatement else CONTINUE
+        return lambda: completion
+
+
+    def compile_declaration(self, decl_node: DeclarationNode | AssignmentNode) -> Compiled:
+        frames = self.frames
+        depth, slot = decl_node.depth, decl_node.slot
+        value = self.compile_expression(decl_node.value)
+
+        def run_declaration():
+            frames[depth][slot] = value()
+
+        return run_declaration
+
+
+    #An assignment only differs from a declaration in Semantic
+    compile_assignment = compile_declaration
+
+
+    def compile_if(self, if_node: IfNode) -> Compiled:
+        branches = [
+            (self.compile_expression(condition), self.compile_block(block))
+            for condition, block in if_node.branches
+        ]
+        else_block = self.compile_block(if_node.else_node.block) if if_node.else_node.kind is ElseNode else None
+
+        def run_if():
+            for condition, block in branches:
+                if condition():
+                    return block()
+
+            if else_block is not None:
+                return else_block()
+
+        return run_if
+
+
+    def compile_while(self, while_node: WhileNode) -> Compiled:
+        condition = self.compile_expression(while_node.condition)
+        block = self.compile_block(while_node.block)
+
+        def run_while():
+            while condition():
+                if block() == BREAK:
+                    break
+
+        return run_while
+
+
+    def compile_expression(self, node: Node) -> Compiled:
+        return self.expression_compilers[node.kind](node)
+
+
+    def compile_literal(self, literal_node: LiteralNode) -> Compiled:
+        value = literal_node.value
+        return lambda: value
+
+
+    def compile_none(self, none_node: NoneNode) -> Compiled:
+        return lambda: None
+
+
+    def compile_variable(self, var_node: VariableNode) -> Compiled:
+        frames = self.frames
+        depth, slot = var_node.depth, var_node.slot
+        return lambda: frames[depth][slot]
+
+
+    def compile_unary(self, unary_node: UnaryNode) -> Compiled:
+        operand = self.compile_expression(unary_node.node)
+
+        if unary_node.operator == "-":
+            return lambda: -operand()
+
+        return lambda: +operand()
+
+
+    def compile_not(self, not_node: NotBooleanNode) -> Compiled:
+        #Semantic only lets bool operands reach the operator
+        operand = self.compile_expression(not_node.node)
+        return lambda: not operand()
+
+
+    def compile_binary_operation(self, operation: BinaryOpNode | ComparisonOpNode | BooleanOpNode) -> Compiled:
+        left = self.compile_expression(operation.left)
+        right = self.compile_expression(operation.right)
+        operator = operation.operator
+
+        if operator == "/" or operator == "%":
+            return self.compile_division(operation, left, right)
+
+        return BINARY_CLOSURES[operator](left, right)
+
+
+    def compile_division(self, operation: BinaryOpNode, left: Compiled, right: Compiled) -> Compiled:
+        reporter = self.reporter
+        stop = self.stop
+        message = (
+            f"[ZeroDivisionError][line: {operation.left.line}, col: {operation.left.column}] "
+            + ("You cannot divide a number by zero" if operation.operator == "/" else "You cannot find the modulus of a number divided by zero")
+        )
+
+        if operation.operator == "%":
+            def run_modulo():
+                dividend = left()
+                divisor = right()
+
+                if divisor == 0:
+                    reporter.add_error(message)
+                    stop()
+
+                return dividend % divisor
+
+            return run_modulo
+
+        #Two ints give an int, like the tree walker
+        if operation.static_type == "int":
+            def run_floor_division():
+                dividend = left()
+                divisor = right()
+
+                if divisor == 0:
+                    reporter.add_error(message)
+                    stop()
+
+                return dividend // divisor
+
+            return run_floor_division
+
+        def run_division():
+            dividend = left()
+            divisor = right()
+
+            if divisor == 0:
+                reporter.add_error(message)
+                stop()
+
+            return dividend / divisor
+
+        return run_division
+
+
+    def compile_call(self, call_node: CallNode) -> Compiled:
+        function = self.builtins[call_node.calle]
+        args = [self.compile_expression(arg) for arg in call_node.args]
+
+        def run_call():
+            return function([arg() for arg in args])
+
+        return run_call
+
+
+    def compile_call_statement(self, call_node: CallNode) -> Compiled:
+        call = self.compile_call(call_node)
+
+        #The value of a call used as a statement is dropped, it is not a completion
+        def run_call_statement():
+            call()
+            return NORMAL
+
+        return run_call_statement
@@ -0,0 +1,12 @@
+from .interpreter import Interpreter
+from .closure_compiler import ClosureInterpreter
+from .vm import VirtualMachine
+from .pycodegen import PythonEngine
+
+#Engines of `akorn run --engine=`, all take the checked program and a reporter
+ENGINES = {
+    "tree": Interpreter,
+    "closure": ClosureInterpreter,
+    "vm": VirtualMachine,
+    "pycodegen": PythonEngine,
+}
\ No newline at end of file
@@ -0,0 +1,64 @@
+import struct
+import sys
+
+#Bytes of a list object without items and of each item, a pointer
+LIST_BYTES = sys.getsizeof([])
+SLOT_BYTES = struct.calcsize("P")
+
+
+class FramePool:
+    """Free list of the frames the engines run the blocks with.
+    \nA block takes a frame of its `size` with `acquire` when it starts and
+    gives it back with `release` when it ends. The frames given back are
+    emptied, so the values of a run are not kept alive by the pool, and kept
+    by size for the next block of that size: a loop runs its block with the
+    same frame every iteration instead of making a new list.
+    \nThe frames are all the memory the variables of a program take.
+    `peak_bytes` is the most of it the open blocks held at the same time."""
+
+    def __init__(self) -> None:
+        self.free: dict[int, list[list]] = {}
+        self.blanks: dict[int, tuple] = {}
+        self.live_bytes = 0
+        self.peak_bytes = 0
+        self.created = 0
+        self.reused = 0
+
+
+    def acquire(self, size: int) -> list:
+        free = self.free.get(size)
+
+        if free:
+            frame = free.pop()
+            self.reused += 1
+        else:
+            frame = [None] * size
+            self.created += 1
+
+        self.live_bytes += LIST_BYTES + SLOT_BYTES * size
+
+        if self.live_bytes > self.peak_bytes:
+            self.peak_bytes = self.live_bytes
+
+        return frame
+
+
+    def release(self, frame: list) -> None:
+        size = len(frame)
+        blank = self.blanks.get(size)
+
+        if blank is None:
+            blank = self.blanks[size] = (None,) * size
+            self.free[size] = []
+
+        #Same length, the list keeps its items array
+        frame[:] = blank
+        self.free[size].append(frame)
+        self.live_bytes -= LIST_BYTES + SLOT_BYTES * size
+
+
+    def report(self) -> str:
+        return (
+            f"[Frames] {self.created} created, {self.reused} reused, "
+            f"peak {self.peak_bytes} bytes, {self.live_bytes} bytes still held"
+        )
@@ -0,0 +1,168 @@
+import mmap
+import sys
+from .output import OutputBuffer
+
+#Bytes read from stdin at a time when it is not a terminal
+INPUT_CHUNK_SIZE = 1 << 16
+
+
+class InputReader:
+    """Where `readInt`, `readFloat`, `readString` and `readBool` of an
+    engine take their lines from, every engine has its own.
+    \nAt a terminal a line is read with `input()`, that shows the prompt.
+    When stdin is a pipe or a file nobody reads the prompts, so they are not
+    written: stdin is read in chunks of `INPUT_CHUNK_SIZE` bytes and the
+    lines are cut from the chunk as they are asked for. The numbers are
+    parsed from the bytes of their line, without making a str of it.
+    \n`open_file` reads the lines of a file instead of stdin, mapped in
+    memory, what `akorn run --input file` uses. The text of `output` waits
+    in it until a read has to wait for stdin.
+    \nThe chunk read from stdin stays in the reader, two readers of the
+    same stdin in one process take their lines from different chunks."""
+
+    def __init__(self, output: OutputBuffer) -> None:
+        self.output = output
+        self.stream = None
+        self.interactive = False
+        self.data: bytearray | mmap.mmap = bytearray()
+        self.position = 0
+        self.at_end = False
+        self.file = None
+        self.encoding = "utf-8"
+        self.errors = "strict"
+
+
+    def open_file(self, path: str) -> None:
+        """The lines are read from the file at `path` until `close`"""
+
+        self.close()
+        self.file = open(path, "rb")
+
+        #An empty file can not be mapped
+        if self.file.seek(0, 2):
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.at_end = True
+        self.encoding = "utf-8"
+        self.errors = "strict"
+
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+        self.stream = None
+        self.data = bytearray()
+        self.position = 0
+        self.at_end = False
+
+
+    def read_chunk(self) -> bool:
+        """Reads more of stdin after what is left, False at its end"""
+
+        if self.at_end:
+            return False
+
+        #Whoever feeds stdin may wait for the output before writing more
+        self.output.flush()
+        chunk = self.stream.buffer.read1(INPUT_CHUNK_SIZE)
+
+        if not chunk:
+            self.at_end = True
+            return False
+
+        data = self.data
+
+        #The lines already read are dropped once they are half of the data, a byte is moved at most once
+        if self.position > len(data) // 2:
+            del data[:self.position]
+            self.position = 0
+
+        data += chunk
+        return True
+
+
+    def read_line(self, prompt: object = "", raw: bool = False) -> str | bytes | bytearray:
+        """The next line without its end of line, its bytes if `raw` and stdin
+        is not a terminal. EOFError when there are no more lines, like input()"""
+
+        if self.file is None:
+            stream = sys.stdin
+
+            #A new stdin, as the benchmarks put, starts without a chunk
+            if stream is not self.stream:
+                self.close()
+                self.stream = stream
+                self.interactive = stream.isatty()
+                self.encoding = getattr(stream, "encoding", None) or "utf-8"
+                self.errors = getattr(stream, "errors", None) or "strict"
+
+            if self.interactive:
+                self.output.flush()
+                return input(prompt)
+
+            #A stdin of text alone, as io.StringIO, is read by lines
+            if getattr(stream, "buffer", None) is None:
+                self.output.flush()
+                line = stream.readline()
+
+                if not line:
+                    raise EOFError("EOF when reading a line")
+
+                return line[:-1] if line[-1:] == "\n" else line
+
+        data = self.data
+        end = data.find(b"\n", self.position)
+
+        while end < 0:
+            #The bytes before the new chunk have no end of line, they are not searched again
+            scanned = len(data) - self.position
+
+            if not self.read_chunk():
+                break
+
+            end = data.find(b"\n", self.position + scanned)
+
+        if end < 0:
+            #The last line may have no end of line
+            if self.position >= len(data):
+                raise EOFError("EOF when reading a line")
+
+            end = next_line = len(data)
+        else:
+            next_line = end + 1
+
+        #input() of a pipe also takes "\r\n" as an end of line
+        if end > self.position and data[end - 1:end] == b"\r":
+            end -= 1
+
+        line = data[self.position:end]
+        self.position = next_line
+
+        if raw:
+            return line
+
+        return line.decode(self.encoding, self.errors)
+
+
+    def read_number(self, prompt: object, parse: type) -> int | float:
+        """Reads lines until one is a number for `parse`, int or float"""
+
+        while True:
+            line = self.read_line(prompt, raw=True)
+
+            try:
+                return parse(line)
+            except ValueError:
+                pass
+
+            #The bytes only take ASCII digits and spaces, the text takes any
+            if not isinstance(line, str) and not line.isascii():
+                try:
+                    return parse(line.decode(self.encoding, self.errors))
+                except (ValueError, UnicodeDecodeError):
+                    pass
@@ -1,11 +1,200 @@
+import operator
 from akorn.ast import *
 from akorn.diagnostic import ErrorReporter
-from akorn.enviroment import Enviroment
+from .frames import FramePool
+from .output import OutputBuffer
+from .input import InputReader
+
+#(operator, static type of the operands) -> function of the operation, Semantic
+#only lets operands of the same type reach an operator, so the type of the
+#values is known when the program is loaded and `/` of two ints is a floor division
+SPECIALIZED_OPERATIONS = {
+    **{("+", value_type): operator.add for value_type in ("int", "float")},
+    **{("-", value_type): operator.sub for value_type in ("int", "float")},
+    **{("*", value_type): operator.mul for value_type in ("int", "float")},
+    **{("**", value_type): operator.pow for value_type in ("int", "float")},
+    **{("%", value_type): operator.mod for value_type in ("int", "float")},
+    ("/", "int"): operator.floordiv,
+    ("/", "float"): operator.truediv,
+    **{("<", value_type): operator.lt for value_type in ("int", "float", "string")},
+    **{(">", value_type): operator.gt for value_type in ("int", "float", "string")},
+    **{("<=", value_type): operator.le for value_type in ("int", "float", "string")},
+    **{(">=", value_type): operator.ge for value_type in ("int", "float", "string")},
+    **{("==", value_type): operator.eq for value_type in ("int", "float", "string", "bool")},
+    **{("!=", value_type): operator.ne for value_type in ("int", "float", "string", "bool")},
+}
+
+#Completion of a statement: NORMAL goes on with the next one, BREAK and
+#CONTINUE leave the block up to the innermost loop. NORMAL is 0 and the
+#statements that always complete normally return None, so any true value stops a block
+NORMAL, BREAK, CONTINUE = 0, 1, 2
+
+
+def make_builtins(output: OutputBuffer, input_reader: InputReader) -> dict:
+    """name -> function of the builtins of one engine, they write to
+    `output` and read from `input_reader`. A builtin takes the list of the
+    values of its arguments."""
+
+    def builtin_write(args) -> None:
+        #The values are separated like print() does, the text waits in the output buffer
+        output.write(" ".join(map(str, args)))
+        return None
+
+
+    def builtin_writeline(args) -> None:
+        output.write(" ".join(map(str, args)) + "\n")
+        return None
+
+
+    def builtin_read_int(args) -> int:
+        #The prompt is only shown at a terminal, a line that is not a number is read again
+        return input_reader.read_number(args[0] if args else "", int)
+
+
+    def builtin_read_float(args) -> float:
+        return input_reader.read_number(args[0] if args else "", float)
+
+
+    def builtin_read_string(args) -> str:
+        return input_reader.read_line(args[0] if args else "")
+
+
+    def builtin_read_bool(args) -> bool:
+        values = []
+        for arg in args:
+            values.append(arg)
+
+        input_string = input_reader.read_line(values[0])
+
+        while True:
+            if input_string == values[1]:
+                return True
+            elif input_string == values[2]:
+                return False
+            else:
+                input_string = input_reader.read_line(values[0])
+
+
+    return {
+        "writeline":builtin_writeline,
+        "write":builtin_write,
+        "readInt":builtin_read_int,
+        "readFloat":builtin_read_float,
+        "readString":builtin_read_string,
+        "readBool":builtin_read_bool,
+    }
+
 
 class Interpreter:
-    def __init__(self, root_node: ProgramNode, reporter: ErrorReporter):
+    """Walks the tree of a `ProgramNode` or the rows of a `FlatAst`, the
+    nodes are told apart by their `kind` so both read the same way.
+    \nThe program must have gone through the Resolver. The values of the
+    variables live in frames, a list of `size` values a block takes from
+    `frame_pool` when it starts and gives back when it ends, and `frames`
+    holds the frame of every open block by depth, so a variable is read as
+    `frames[depth][slot]`. Nothing of a run is left on the nodes, the same
+    program can run again.
+    \nWhen the program is loaded every arithmetic operation and comparison
+    gets its `operation` from `SPECIALIZED_OPERATIONS`, so running it does
+    not test its operator or the types of its values again. A division by
+    zero is the ZeroDivisionError of Python, reported as the error of the
+    Akorn division.
+    \nStatements and expressions are dispatched on their `kind` with the
+    tables `statement_visitors` and `expression_visitors`. A statement
+    returns its completion code, a break or continue stops every block up
+    to its loop; at the top of the program they only end their statement.
+    \nThe builtins of `make_builtins` write to the `output` of the
+    interpreter and read from its `input`, so two interpreters never share
+    what they print or the lines they read.
+    \nWith a `LoopJit` the `while` loops are run by the JIT, that compiles
+    the hot ones."""
+    
+    def __init__(self, root_node: ProgramNode | FlatAst, reporter: ErrorReporter, jit=None):
+        if isinstance(root_node, FlatAst):
+            root_node.operations = [None] * len(root_node)
+            
+            for row, operator_name, operand_type in root_node.operation_rows():
+                root_node.operations[row] = SPECIALIZED_OPERATIONS[(operator_name, operand_type)]
+            
+            root_node = root_node.root()
+        else:
+            self.specialize(root_node)
+        
         self.root_node = root_node
         self.reporter = reporter
+        self.frames: list[list] = []
+        self.frame_pool = FramePool()
+        self.jit = jit
+        self.output = OutputBuffer()
+        self.input = InputReader(self.output)
+        self.builtins = make_builtins(self.output, self.input)
+        
+        self.statement_visitors = {
+            DeclarationNode: self.visit_declar,
+            AssignmentNode: self.visit_assing,
+            CallNode: self.visit_call_statement,
+            IfNode: self.visit_if_node,
+            WhileNode: self.visit_while_node,
+            BreakStatement: self.visit_break,
+            ContinueStatement: self.visit_continue,
+        }
+        
+        self.expression_visitors = {
+            CallNode: self.visit_call_node,
+            VariableNode: self.visit_variable,
+            BinaryOpNode: self.visit_binary_operation,
+            UnaryNode: self.visit_unary,
+            NotBooleanNode: self.visit_not_boolean_operator,
+            ComparisonOpNode: self.visit_comparison_operation,
+            BooleanOpNode: self.visit_boolean_operation,
+            IntNode: self.visit_literal,
+            FloatNode: self.visit_literal,
+            BoolNode: self.visit_literal,
+            StringNode: self.visit_literal,
+            NoneNode: self.visit_none,
+        }
+
+
+    def specialize(self, node: Node) -> None:
+        """Gives the operations under `node` their function, from their
+        operator and the static type of their left operand"""
+        
+        kind = node.kind
+        
+        if kind is BinaryOpNode or kind is ComparisonOpNode:
+            node.operation = SPECIALIZED_OPERATIONS[(node.operator, node.left.static_type)]
+            self.specialize(node.left)
+            self.specialize(node.right)
+        
+        elif kind is BooleanOpNode:
+            self.specialize(node.left)
+            self.specialize(node.right)
+        
+        elif kind is UnaryNode or kind is NotBooleanNode:
+            self.specialize(node.node)
+        
+        elif kind is CallNode:
+            for arg in node.args:
+                self.specialize(arg)
+        
+        elif kind is DeclarationNode or kind is AssignmentNode:
+            self.specialize(node.value)
+        
+        elif kind is ProgramNode or kind is BlockNode:
+            for statement in node.statements:
+                self.specialize(statement)
+        
+        elif kind is IfNode:
+            for condition, block in node.branches:
+                self.specialize(condition)
+                self.specialize(block)
+            
+            if node.else_node.kind is ElseNode:
+                self.specialize(node.else_node.block)
+        
+        elif kind is WhileNode:
+            self.specialize(node.condition)
+            self.specialize(node.block)
 
 
     def stop(self):
@@ -13,59 +202,62 @@ class Interpreter:
 
 
     def interpret_main(self):
-        statements = self.root_node.statements
-        scope = self.root_node.scope
-        for statement in statements:
-            if isinstance(statement, DeclarationNode):
-                self.visit_declar(statement, scope)
-            elif isinstance(statement, AssignmentNode):
-                self.visit_assing(statement, scope)
-            elif isinstance(statement, CallNode):
-                self.visit_call_node(statement, scope)
-            elif isinstance(statement, IfNode):
-                self.visit_if_node(statement)
-            elif isinstance(statement, WhileNode):
-                self.visit_while_node(statement)
+        statement_visitors = self.statement_visitors
+        frame_pool = self.frame_pool
+        self.frames = [frame_pool.acquire(self.root_node.size)]
+        
+        try:
+            #The completion of a statement of the program is not looked at
+            for statement in self.root_node.statements:
+                statement_visitors[statement.kind](statement)
+        finally:
+            #With an error the blocks it stopped are still open
+            for frame in self.frames:
+                frame_pool.release(frame)
+            
+            self.frames = []
+            self.output.flush()
     
     
-    def interpretet_block(self, block_node: BlockNode):
-        statements = block_node.statements
-        scope: Enviroment = block_node.scope
+    def interpretet_block(self, block_node: BlockNode) -> int:
+        statement_visitors = self.statement_visitors
+        frames = self.frames
         
-        for statement in statements:
-            if isinstance(statement, DeclarationNode):
-                self.visit_declar(statement, scope)
-            elif isinstance(statement, AssignmentNode):
-                self.visit_assing(statement, scope)
-            elif isinstance(statement, CallNode):
-                self.visit_call_node(statement, scope)
-            elif isinstance(statement, IfNode):
-                state = self.visit_if_node(statement)
-                
-                if state == "continue":
-                    return "continue"
-                elif state == "break":
-                    return "break"
-                elif state == "pass":
-                    continue
-                
-            elif isinstance(statement, BreakStatement):
-                return "break"
-            elif isinstance(statement, ContinueStatement):
-                return "continue"
-            elif isinstance(statement, WhileNode):
-                self.visit_while_node(statement)
+        #The blocks around this one are open, its frame is at its depth
+        frames.append(self.frame_pool.acquire(block_node.size))
         
-        return "pass"
+        for statement in block_node.statements:
+            completion = statement_visitors[statement.kind](statement)
+            
+            if completion:
+                break
+        else:
+            completion = NORMAL
+        
+        self.frame_pool.release(frames.pop())
+        return completion
+    
+    
+    def visit_break(self, break_node: BreakStatement) -> int:
+        return BREAK
+    
+    
+    def visit_continue(self, continue_node: ContinueStatement) -> int:
+        return CONTINUE
        
                    
     def visit_literal(self, literal_node: LiteralNode):
         return literal_node.value
+    
+    
+    def visit_none(self, none_node: NoneNode):
+        #A declaration without value holds None
+        return None
    
            
-    def visit_unary(self, unary_node: UnaryNode, scope: Enviroment):
+    def visit_unary(self, unary_node: UnaryNode):
         sign_unary = unary_node.operator
-        value = self.visit_node(unary_node.node, scope)
+        value = self.visit_node(unary_node.node)
             
         if sign_unary == '-':
             return -value
@@ -73,27 +265,14 @@ class Interpreter:
             return +value
     
     
-    def visit_comparison_operation(self, comparison_op_node: ComparisonOpNode, scope: Enviroment):
-        left = self.visit_node(comparison_op_node.left, scope)
-        operator = comparison_op_node.operator
-        right = self.visit_node(comparison_op_node.right, scope)
-        
-        if operator == '<':
-            return left < right
-        elif operator == '>':
-            return left > right
-        elif operator == '<=':
-            return left <= right
-        elif operator == '>=':
-            return left >= right
-        elif operator == '==':
-            return left == right
-        elif operator == '!=':
-            return left != right
+    def visit_comparison_operation(self, comparison_op_node: ComparisonOpNode):
+        left = self.visit_node(comparison_op_node.left)
+        right = self.visit_node(comparison_op_node.right)
+        return comparison_op_node.operation(left, right)
             
                
-    def visit_boolean_operation(self, boolean_op_node: BooleanOpNode, scope: Enviroment):
-        left = self.visit_node(boolean_op_node.left, scope)
+    def visit_boolean_operation(self, boolean_op_node: BooleanOpNode):
+        left = self.visit_node(boolean_op_node.left)
         operator = boolean_op_node.operator
         
         # short-circuit
@@ -102,7 +281,7 @@ class Interpreter:
         elif operator == "or" and left == True:
             return True 
         
-        right = self.visit_node(boolean_op_node.right, scope)
+        right = self.visit_node(boolean_op_node.right)
         
         if operator == "and":
             return left and right
@@ -110,8 +289,8 @@ class Interpreter:
             return left or right
 
 
-    def visit_not_boolean_operator(self, not_boolean_operator: NotBooleanNode, scope: Enviroment):
-        value_bool = self.visit_node(not_boolean_operator.node, scope)
+    def visit_not_boolean_operator(self, not_boolean_operator: NotBooleanNode):
+        value_bool = self.visit_node(not_boolean_operator.node)
         
         if isinstance(value_bool, bool):
             return not value_bool
@@ -122,222 +301,79 @@ class Interpreter:
             self.stop()
 
             
-    def visit_binary_operation(self, binary_op_node: BinaryOpNode, scope: Enviroment):
-        line_operation = binary_op_node.left.line
-        column_operation = binary_op_node.left.column
-        left = self.visit_node(binary_op_node.left, scope)
-        operator = binary_op_node.operator
-        right = self.visit_node(binary_op_node.right, scope)
-        
-        if operator == '+':
-            return left + right
+    def visit_binary_operation(self, binary_op_node: BinaryOpNode):
+        left = self.visit_node(binary_op_node.left)
+        right = self.visit_node(binary_op_node.right)
         
-        elif operator == '-':
-            return left - right
-        
-        elif operator == '*':
-            return left * right
-        
-        elif operator == '/':
-            if right == 0:
-                self.reporter.add_error(
-                    f"[ZeroDivisionError][line: {line_operation}, col: {column_operation}] You cannot divide a number by zero"
-                )
-                self.stop()
-
+        try:
+            return binary_op_node.operation(left, right)
+        except ZeroDivisionError:
+            #Only `/` and `%` are divisions of Akorn, 0 ** -1 stays a Python error
+            if binary_op_node.operator == '/':
+                message = "You cannot divide a number by zero"
+            elif binary_op_node.operator == '%':
+                message = "You cannot find the modulus of a number divided by zero"
             else:
-                if isinstance(left, int) and isinstance(right, int):
-                    return left // right
+                raise
             
-                return left / right
-            
-        elif operator == '%':
-            if right == 0:
-                self.reporter.add_error(
-                    f"[ZeroDivisionError][line: {line_operation}, col: {column_operation}] You cannot find the modulus of a number divided by zero"
-                )
-                self.stop()
-                
-            else:
-                return left % right
-            
-        elif operator == "**":
-            return left ** right
+            self.reporter.add_error(
+                f"[ZeroDivisionError][line: {binary_op_node.left.line}, col: {binary_op_node.left.column}] {message}"
+            )
+            self.stop()
 
 
-    def visit_variable(self, var_node: VariableNode, scope: Enviroment):
-        value = scope.get(var_node.name)
-        
-        if not value is None:
-            return value
+    def visit_variable(self, var_node: VariableNode):
+        return self.frames[var_node.depth][var_node.slot]
     
     
-    def visit_declar(self, decl_node: DeclarationNode, scope: Enviroment):
-        value = self.visit_node(decl_node.value, scope)
-        symbol = Symbol(value, decl_node.type, decl_node.mutable)
-        scope.add_symbol(symbol, decl_node.name)
+    def visit_declar(self, decl_node: DeclarationNode):
+        value = self.visit_node(decl_node.value)
+        self.frames[decl_node.depth][decl_node.slot] = value
         
-    def visit_assing(self, assing_node: AssignmentNode, scope: Enviroment):
-        value = self.visit_node(assing_node.value, scope)
-        scope.assign(assing_node.name, value)
+    def visit_assing(self, assing_node: AssignmentNode):
+        value = self.visit_node(assing_node.value)
+        self.frames[assing_node.depth][assing_node.slot] = value
   
-    def visit_if_node(self, if_node: IfNode):
-        len_branches = len(if_node.branches)
-        for body in range(len_branches):
-            condition = if_node.branches[body][0]
-            scope = if_node.branches[body][1].scope
-             
-            bool_conditional = self.visit_node(condition, scope)
-                
-            if bool_conditional:
-                state = self.interpretet_block(if_node.branches[body][1])
-                return state
+    def visit_if_node(self, if_node: IfNode) -> int:
+        for condition, block in if_node.branches:
+            if self.visit_node(condition):
+                return self.interpretet_block(block)
             
-        if isinstance(if_node.else_node, ElseNode):
-            state = self.interpretet_block(if_node.else_node.block)
-            return state
+        if if_node.else_node.kind is ElseNode:
+            return self.interpretet_block(if_node.else_node.block)
+        
+        return NORMAL
 
 
-    def visit_while_node(self, while_node: WhileNode):
-        block = while_node.block
-        while self.visit_node(while_node.condition, while_node.block.scope):
-            state = self.interpretet_block(block)
-
-            if state == "break":
-                break
-            elif state == "continue":
-                continue
-
-    # Builtin Functions temporals
-    def builtin_write(args) -> None:
-        values = []
-        for arg in args:
-            values.append(arg)
-        
-        print(*values, end="")
-        return None
-    
-    
-    # Builtin Functions temporals
-    def builtin_writeline(args) -> None:
-        values = []
-        for arg in args:
-            values.append(arg)
+    def visit_while_node(self, while_node: WhileNode) -> int:
+        if self.jit is not None:
+            self.jit.run_while(self, while_node)
+            return NORMAL
         
-        print(*values)
-        return None
-    
-    
-    def builtin_read_int(args) -> int:
-        values = []
-        for arg in args:
-            values.append(arg)
-            
-        input_int = input(*values)
-        
-        while True:
-            try:
-                input_int = int(input_int)
-                break
-            except ValueError:
-                input_int = input(*values)
-         
-        return input_int
-    
-    
-    def builtin_read_float(args) -> float:
-        values = []
-        for arg in args:
-            values.append(arg)
-            
-        input_float = input(*values)
+        condition = while_node.condition
+        block = while_node.block
         
-        while True:
-            try:
-                input_float = float(input_float)
+        while self.visit_node(condition):
+            if self.interpretet_block(block) == BREAK:
                 break
-            except ValueError:
-                input_float = input(*values)
-         
-        return input_float
-        
-        
-    def builtin_read_string(args) -> str:
-        values = []
-        for arg in args:
-            values.append(arg)
-            
-        input_string = input(*values)
-        return input_string
-    
-    
-    def builtin_read_bool(args) -> bool:
-        values = []
-        for arg in args:
-            values.append(arg)
-            
-        input_string = input(values[0])
-        
-        while True:
-            if input_string == values[1]:
-                return True
-            elif input_string == values[2]:
-                return False
-            else:
-                input_string = input(values[0])  
         
-                  
-    BUILTINS = {
-        "writeline":builtin_writeline,
-        "write":builtin_write,
-        "readInt":builtin_read_int,
-        "readFloat":builtin_read_float,
-        "readString":builtin_read_string,
-        "readBool":builtin_read_bool,
-    }
+        return NORMAL
 
 
-    def visit_call_node(self, call_node: CallNode, scope: Enviroment):
+    def visit_call_node(self, call_node: CallNode):
         args = []
             
         for arg in call_node.args:
-            value_arg = self.visit_node(arg, scope)
+            value_arg = self.visit_node(arg)
             args.append(value_arg)
                 
-        return self.BUILTINS[call_node.calle](args)
+        return self.builtins[call_node.calle](args)
 
 
-    def visit_node(self, node: Node, scope):
-        if isinstance(node, CallNode):
-            return self.visit_call_node(node, scope)
-        
-        if isinstance(node, VariableNode):
-            return self.visit_variable(node, scope)
-        
-        elif isinstance(node, BinaryOpNode):
-            return self.visit_binary_operation(node, scope)
-        
-        elif isinstance(node, UnaryNode):
-            return self.visit_unary(node, scope)
-        
-        elif isinstance(node, NotBooleanNode):
-            return self.visit_not_boolean_operator(node, scope)
-        
-        elif isinstance(node, ComparisonOpNode):
-            return self.visit_comparison_operation(node, scope)
-        
-        elif isinstance(node, BooleanOpNode):
-            return self.visit_boolean_operation(node, scope)
-        
-        elif isinstance(node, IntNode):
-            return self.visit_literal(node)
-        
-        elif isinstance(node, FloatNode):
-            return self.visit_literal(node)
-        
-        elif isinstance(node, BoolNode):
-            return self.visit_literal(node)
-        
-        elif isinstance(node, StringNode):
-            return self.visit_literal(node)
-        
\ No newline at end of file
+    def visit_call_statement(self, call_node: CallNode) -> None:
+        #The value of a call used as a statement is dropped, it is not a completion
+        self.visit_call_node(call_node)
+
+
+    def visit_node(self, node: Node):
+        return self.expression_visitors[node.kind](node)
\ No newline at end of file
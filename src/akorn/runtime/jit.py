@@ -0,0 +1,281 @@
+import ast
+import time
+from dataclasses import dataclass
+from typing import Callable
+from akorn.ast import *
+from .interpreter import Interpreter, BREAK
+from .pycodegen import PythonCodegen, fill_locations, zero_division_position, division_message
+
+#Back-edges a loop of the tree walker takes before it is compiled
+JIT_THRESHOLD = 200
+
+#Name of the function a hot loop is compiled to
+LOOP_FUNCTION = "akorn_loop"
+
+#What a compiled loop returns when a guard fails, before it changed anything
+GUARD_FAILED = -1
+
+#Guard failures in a row after which a loop is compiled again for the variables it is entered with
+JIT_RECOMPILE_FAILURES = 2
+
+
+def frame_item(frame: str, index: int, context: ast.expr_context) -> ast.Subscript:
+    """`frame[index]` of the generated function"""
+
+    return ast.Subscript(ast.Name(frame, ast.Load()), ast.Constant(index), context)
+
+
+def set_guard(name: str, value: object) -> ast.Compare:
+    """`name is None` if `value` is None, else `name is not None`"""
+
+    return ast.Compare(ast.Name(name, ast.Load()), [ast.Is() if value is None else ast.IsNot()], [ast.Constant(None)])
+
+
+@dataclass(slots=True)
+class LoopRecord:
+    """What the JIT knows of one `while` of the script"""
+
+    line: int
+    column: int
+    walked: int = 0
+    walker_seconds: float = 0.0
+    function: Callable | None = None
+    positions: tuple = ()
+    compile_seconds: float = 0.0
+    compilations: int = 0
+    compiled_failed: bool = False
+    runs: int = 0
+    compiled_iterations: int = 0
+    compiled_seconds: float = 0.0
+    guard_failures: int = 0
+    failures_since_compile: int = 0
+
+
+    def seconds_saved(self) -> float:
+        """Time the walker would have taken for the compiled iterations, at
+        the speed it walked this loop, less the time of compiling and
+        running them"""
+
+        if self.function is None or not self.walked:
+            return 0.0
+
+        per_iteration = self.walker_seconds / self.walked
+        return self.compiled_iterations * per_iteration - self.compiled_seconds - self.compile_seconds
+
+
+class LoopCodegen(PythonCodegen):
+    """Lowers one `while` to a Python function that runs it on the frames of
+    the tree walker.
+    \nThe code is the one of `PythonCodegen`, the same for any values:
+    Semantic fixes the type of every variable, so there is nothing of the
+    values seen to specialize it to. The variables of the blocks around the
+    loop are loaded to locals when the function starts and the ones the
+    loop assigns are stored back when it ends. The guard when it starts only
+    checks that each of them is set, or unset, as it was when the loop was
+    compiled, the one thing that can differ from one entry to another.
+    Their locals start with `_`, an Akorn name cannot, so they never meet the
+    names of the variables declared in the loop. The names the function
+    needs for itself, `_frames`, `_frame_<depth>` and `_iterations`, start
+    with `_` too and have no slot, so they meet neither kind of variable."""
+
+    def __init__(self, outer_depth: int) -> None:
+        super().__init__()
+        self.outer_depth = outer_depth
+        self.outer_variables: dict[str, tuple[int, int]] = {}
+        self.assigned: set[str] = set()
+
+
+    def variable_name(self, node: VariableNode | AssignmentNode | DeclarationNode) -> str:
+        if node.depth >= self.outer_depth:
+            return super().variable_name(node)
+
+        name = f"_{node.name}_{node.depth}_{node.slot}"
+        self.outer_variables[name] = (node.depth, node.slot)
+        return name
+
+
+    def lower_store(self, node: DeclarationNode | AssignmentNode) -> list[ast.stmt]:
+        lowered = super().lower_store(node)
+
+        if node.depth < self.outer_depth:
+            self.assigned.add(lowered[0].targets[0].id)
+
+        return lowered
+
+
+    def lower_loop(self, while_node: WhileNode, frames: list[list]) -> ast.Module:
+        #The blocks around the loop have no locals of their own
+        self.bases = [0] * self.outer_depth
+        self.loop_depth = 1
+        loop = ast.While(
+            self.lower_expression(while_node.condition),
+            [ast.AugAssign(ast.Name("_iterations", ast.Store()), ast.Add(), ast.Constant(1))] + self.lower_block(while_node.block),
+            [],
+        )
+
+        depths = sorted({depth for depth, _ in self.outer_variables.values()})
+        body = [ast.Assign([ast.Name(f"_frame_{depth}", ast.Store())], frame_item("_frames", depth, ast.Load())) for depth in depths]
+        guards = []
+
+        for name, (depth, slot) in self.outer_variables.items():
+            body.append(ast.Assign([ast.Name(name, ast.Store())], frame_item(f"_frame_{depth}", slot, ast.Load())))
+            guards.append(set_guard(name, frames[depth][slot]))
+
+        if guards:
+            test = guards[0] if len(guards) == 1 else ast.BoolOp(ast.And(), guards)
+            body.append(ast.If(ast.UnaryOp(ast.Not(), test), [ast.Return(ast.Constant(GUARD_FAILED))], []))
+
+        write_back = [
+            ast.Assign([frame_item(f"_frame_{self.outer_variables[name][0]}", self.outer_variables[name][1], ast.Store())], ast.Name(name, ast.Load()))
+            for name in sorted(self.assigned)
+        ]
+        body.append(ast.Assign([ast.Name("_iterations", ast.Store())], ast.Constant(0)))
+        body.append(ast.Try([loop], [], [], write_back or [ast.Pass()]))
+        body.append(ast.Return(ast.Name("_iterations", ast.Load())))
+
+        #Only the divisions of the loop have a line in the source map, the
+        #nodes are built here and not parsed, a parsed name would be NFKC normalized
+        function = ast.FunctionDef(
+            name=LOOP_FUNCTION,
+            args=ast.arguments(posonlyargs=[], args=[ast.arg("_frames")], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=body,
+            decorator_list=[],
+        )
+        module = ast.Module([function], type_ignores=[])
+        fill_locations(module)
+        return module
+
+
+class LoopJit:
+    """Tracing JIT of the tree walker for hot loops.
+    \n`Interpreter` hands it its `while` loops. It walks them and counts the
+    back-edges of each one; a loop that takes `threshold` of them is compiled
+    with `LoopCodegen` to a Python function and runs from its next iteration
+    on as CPython bytecode. When the guard of the function fails, a variable
+    around the loop is set or unset otherwise than when it was compiled, the
+    loop is walked by the tree walker again; after `JIT_RECOMPILE_FAILURES`
+    failures in a row it is compiled again for the variables it is entered
+    with.
+    \nThe output and the errors are the ones of the tree walker. `report()`
+    tells the loops compiled, the guard failures and an estimate of the time
+    saved."""
+
+    def __init__(self, threshold: int = JIT_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.loops: dict[object, LoopRecord] = {}
+
+
+    def run_while(self, interpreter: Interpreter, while_node: WhileNode) -> None:
+        #A row of a flat AST is the same loop for every cursor of it
+        key = getattr(while_node, "index", while_node)
+        record = self.loops.get(key)
+
+        if record is None:
+            record = self.loops[key] = LoopRecord(while_node.condition.line, while_node.condition.column)
+
+        condition, block = while_node.condition, while_node.block
+        use_compiled = record.function is not None
+        start = time.perf_counter()
+        compiled_start = record.compiled_seconds + record.compile_seconds
+        walked = 0
+
+        try:
+            while True:
+                if use_compiled:
+                    if self.run_compiled(interpreter, record):
+                        return
+
+                    use_compiled = False
+
+                    if record.failures_since_compile >= JIT_RECOMPILE_FAILURES and not record.compiled_failed:
+                        use_compiled = self.compile(interpreter, while_node, record)
+                        continue
+
+                if not interpreter.visit_node(condition):
+                    return
+
+                completion = interpreter.interpretet_block(block)
+                walked += 1
+
+                if completion == BREAK:
+                    return
+
+                if record.function is None and not record.compiled_failed and record.walked + walked >= self.threshold:
+                    use_compiled = self.compile(interpreter, while_node, record)
+        finally:
+            record.walked += walked
+            record.walker_seconds += time.perf_counter() - start - (record.compiled_seconds + record.compile_seconds - compiled_start)
+
+
+    def compile(self, interpreter: Interpreter, while_node: WhileNode, record: LoopRecord) -> bool:
+        start = time.perf_counter()
+        codegen = LoopCodegen(while_node.block.depth)
+
+        try:
+            code = compile(codegen.lower_loop(while_node, interpreter.frames), "<akorn loop>", "exec")
+        except (RecursionError, SyntaxError):
+            #Loops nested too deep for CPython keep being walked
+            record.compiled_failed = True
+            return False
+
+        namespace = dict(interpreter.builtins)
+        exec(code, namespace)
+        record.function = namespace[LOOP_FUNCTION]
+        record.positions = tuple(codegen.positions)
+        record.compilations += 1
+        record.failures_since_compile = 0
+        record.compile_seconds += time.perf_counter() - start
+        return True
+
+
+    def run_compiled(self, interpreter: Interpreter, record: LoopRecord) -> bool:
+        """Runs the loop to its end with its compiled function, False if a
+        guard failed and the loop has to be walked"""
+
+        start = time.perf_counter()
+
+        try:
+            iterations = record.function(interpreter.frames)
+        except ZeroDivisionError as error:
+            position = zero_division_position(error, record.positions, LOOP_FUNCTION)
+
+            if position is None:
+                raise
+
+            line, column, operator = position
+            interpreter.reporter.add_error(f"[ZeroDivisionError][line: {line}, col: {column}] {division_message(operator)}")
+            interpreter.stop()
+        finally:
+            record.compiled_seconds += time.perf_counter() - start
+
+        if iterations == GUARD_FAILED:
+            record.guard_failures += 1
+            record.failures_since_compile += 1
+            return False
+
+        record.failures_since_compile = 0
+        record.runs += 1
+        record.compiled_iterations += iterations
+        return True
+
+
+    def report(self) -> str:
+        compiled = [record for record in self.loops.values() if record.function is not None]
+        guard_failures = sum(record.guard_failures for record in self.loops.values())
+        saved = sum(record.seconds_saved() for record in compiled)
+
+        lines = [f"[JIT] {len(compiled)} of {len(self.loops)} loops compiled, {guard_failures} guard failures, ~{saved * 1000:.1f}ms saved"]
+
+        for record in sorted(self.loops.values(), key=lambda record: (record.line, record.column)):
+            if record.function is None:
+                lines.append(f"  loop at line {record.line}, col {record.column}: walked {record.walked} iterations, not compiled")
+            else:
+                compilations = "" if record.compilations == 1 else f" {record.compilations} times"
+                lines.append(
+                    f"  loop at line {record.line}, col {record.column}: walked {record.walked} iterations, "
+                    f"{record.compiled_iterations} compiled in {record.runs} runs ({record.compiled_seconds * 1000:.1f}ms), "
+                    f"compiled{compilations} in {record.compile_seconds * 1000:.2f}ms, {record.guard_failures} guard failures, "
+                    f"~{record.seconds_saved() * 1000:.1f}ms saved"
+                )
+
+        return "\n".join(lines)
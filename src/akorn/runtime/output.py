@@ -0,0 +1,80 @@
+import sys
+
+#Characters the output keeps before it writes them out
+OUTPUT_BUFFER_SIZE = 1 << 16
+
+
+class OutputBuffer:
+    """Where `write` and `writeline` of an engine put their text, every
+    engine has its own.
+    \nThe text is kept in `chunks` and written out in one call when it
+    reaches `OUTPUT_BUFFER_SIZE` characters, before a read has to wait for
+    stdin and when the program ends. A terminal gets every write at
+    once, like the `print()` the builtins used before.
+    \nThe text goes to the `sys.stdout` of the moment it is written out,
+    encoded to its `buffer` when it has one and is not a terminal, or to
+    the file of `redirect`, what `akorn run --out file` uses."""
+
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+        self.size = 0
+        #0 writes out the first text, that is when the limit is known
+        self.limit = 0
+        self.file = None
+
+
+    def write(self, text: str) -> None:
+        self.chunks.append(text)
+        self.size += len(text)
+
+        if self.size >= self.limit:
+            self.flush()
+
+
+    def flush(self) -> None:
+        if not self.chunks:
+            return
+
+        text = "".join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+
+        if self.file is not None:
+            self.limit = OUTPUT_BUFFER_SIZE
+            self.file.write(text.encode("utf-8"))
+            return
+
+        stream = sys.stdout
+
+        if stream.isatty():
+            self.limit = 1
+            stream.write(text)
+            return
+
+        self.limit = OUTPUT_BUFFER_SIZE
+        buffer = getattr(stream, "buffer", None)
+
+        if buffer is None:
+            stream.write(text)
+            return
+
+        #What print() left in the text layer goes out before this text
+        stream.flush()
+        buffer.write(text.encode(stream.encoding, stream.errors))
+
+
+    def redirect(self, path: str) -> None:
+        """The text goes to the file at `path` until `close`"""
+
+        self.flush()
+        self.file = open(path, "wb")
+        self.limit = OUTPUT_BUFFER_SIZE
+
+
+    def close(self) -> None:
+        self.flush()
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.limit = 0
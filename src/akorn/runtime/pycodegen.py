@@ -0,0 +1,331 @@
+import ast
+from types import CodeType
+from akorn.ast import *
+from akorn.diagnostic import ErrorReporter
+from .interpreter import make_builtins
+from .output import OutputBuffer
+from .input import InputReader
+
+#Name of the function that holds the program, its variables are Python locals
+MAIN_FUNCTION = "akorn_main"
+
+BINARY_OPERATORS = {
+    "+": ast.Add,
+    "-": ast.Sub,
+    "*": ast.Mult,
+    "**": ast.Pow,
+    "%": ast.Mod,
+}
+
+COMPARISON_OPERATORS = {
+    "<": ast.Lt,
+    ">": ast.Gt,
+    "<=": ast.LtE,
+    ">=": ast.GtE,
+    "==": ast.Eq,
+    "!=": ast.NotEq,
+}
+
+
+def fill_locations(tree: ast.AST) -> None:
+    """The nodes without a line of their own are line 0 of the source map"""
+
+    for node in ast.walk(tree):
+        if "lineno" in node._attributes and not hasattr(node, "lineno"):
+            node.lineno = node.end_lineno = 0
+            node.col_offset = node.end_col_offset = 0
+
+
+def zero_division_position(error: ZeroDivisionError, positions: tuple, function_name: str) -> tuple[int, int, str] | None:
+    """(line, column, operator) in the Akorn script of the division that
+    raised `error` in the generated function, None if it was raised
+    somewhere else"""
+
+    traceback = error.__traceback__
+
+    while traceback.tb_next is not None:
+        traceback = traceback.tb_next
+
+    if traceback.tb_frame.f_code.co_name != function_name or not 0 < traceback.tb_lineno < len(positions):
+        return None
+
+    return positions[traceback.tb_lineno]
+
+
+def division_message(operator: str) -> str:
+    if operator == "/":
+        return "You cannot divide a number by zero"
+
+    return "You cannot find the modulus of a number divided by zero"
+
+
+class PythonCodegen:
+    """Lowers a checked and resolved program to a Python `ast.Module`.
+    \nThe program becomes the body of one function so its variables are
+    Python locals, named `<name>_<index>` with the index of the variable in
+    the block ranges of the bytecode compiler, so two Akorn variables never
+    share a Python name. The builtins are globals of the module.
+    \nThe source map is `positions`: the divisions get their own Python line
+    number, its index in `positions`, that holds the (line, column, operator)
+    of the division in the Akorn script. Line 0 is everything else.
+    \nA break or continue out of any loop ends the statement of the program
+    it is in, as in the tree walker: that statement is put in a loop that
+    runs once."""
+
+    def __init__(self) -> None:
+        self.positions: list[tuple[int, int, str]] = [(0, 0, "")]
+        self.bases: list[int] = []
+        self.variable_count = 0
+        self.loop_depth = 0
+        self.leaves_statement = False
+
+        self.statement_lowerers = {
+            DeclarationNode: self.lower_store,
+            AssignmentNode: self.lower_store,
+            CallNode: self.lower_call_statement,
+            IfNode: self.lower_if,
+            WhileNode: self.lower_while,
+            BreakStatement: self.lower_break,
+            ContinueStatement: self.lower_continue,
+        }
+
+        self.expression_lowerers = {
+            IntNode: self.lower_literal,
+            FloatNode: self.lower_literal,
+            StringNode: self.lower_literal,
+            BoolNode: self.lower_literal,
+            NoneNode: self.lower_none,
+            VariableNode: self.lower_variable,
+            UnaryNode: self.lower_unary,
+            NotBooleanNode: self.lower_not,
+            BinaryOpNode: self.lower_binary_operation,
+            ComparisonOpNode: self.lower_comparison,
+            BooleanOpNode: self.lower_boolean_operation,
+            CallNode: self.lower_call,
+        }
+
+
+    def lower(self, root_node: ProgramNode | FlatAst) -> ast.Module:
+        if isinstance(root_node, FlatAst):
+            root_node = root_node.root()
+
+        self.open_block(root_node)
+        body = []
+
+        for statement in root_node.statements:
+            self.leaves_statement = False
+            lowered = self.lower_statement(statement)
+
+            if self.leaves_statement:
+                lowered = [ast.While(ast.Constant(True), lowered + [ast.Break()], [])]
+
+            body.extend(lowered)
+
+        self.bases.pop()
+
+        function = ast.FunctionDef(
+            name=MAIN_FUNCTION,
+            args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=body or [ast.Pass()],
+            decorator_list=[],
+        )
+        module = ast.Module([function], type_ignores=[])
+        fill_locations(module)
+        return module
+
+
+    def open_block(self, block_node: ProgramNode | BlockNode) -> None:
+        del self.bases[block_node.depth:]
+        self.bases.append(self.variable_count)
+        self.variable_count += block_node.size
+
+
+    def lower_block(self, block_node: BlockNode) -> list[ast.stmt]:
+        self.open_block(block_node)
+        body = []
+
+        for statement in block_node.statements:
+            body.extend(self.lower_statement(statement))
+
+        self.bases.pop()
+        return body or [ast.Pass()]
+
+
+    def variable_name(self, node: VariableNode | AssignmentNode | DeclarationNode) -> str:
+        return f"{node.name}_{self.bases[node.depth] + node.slot}"
+
+
+    def lower_statement(self, node: Node) -> list[ast.stmt]:
+        lowerer = self.statement_lowerers.get(node.kind)
+
+        if lowerer is None:
+            return []
+
+        return lowerer(node)
+
+
+    def lower_store(self, node: DeclarationNode | AssignmentNode) -> list[ast.stmt]:
+        target = ast.Name(self.variable_name(node), ast.Store())
+        return [ast.Assign([target], self.lower_expression(node.value))]
+
+
+    def lower_call_statement(self, call_node: CallNode) -> list[ast.stmt]:
+        return [ast.Expr(self.lower_call(call_node))]
+
+
+    def lower_if(self, if_node: IfNode) -> list[ast.stmt]:
+        if if_node.else_node.kind is ElseNode:
+            orelse = self.lower_block(if_node.else_node.block)
+        else:
+            orelse = []
+
+        #The elif branches are nested in the else of the branch before
+        lowered = [(self.lower_expression(condition), self.lower_block(block)) for condition, block in if_node.branches]
+
+        for condition, body in reversed(lowered):
+            orelse = [ast.If(condition, body, orelse)]
+
+        return orelse
+
+
+    def lower_while(self, while_node: WhileNode) -> list[ast.stmt]:
+        condition = self.lower_expression(while_node.condition)
+        self.loop_depth += 1
+        body = self.lower_block(while_node.block)
+        self.loop_depth -= 1
+        return [ast.While(condition, body, [])]
+
+
+    def lower_break(self, break_node: BreakStatement) -> list[ast.stmt]:
+        if self.loop_depth == 0:
+            self.leaves_statement = True
+
+        return [ast.Break()]
+
+
+    def lower_continue(self, continue_node: ContinueStatement) -> list[ast.stmt]:
+        if self.loop_depth == 0:
+            self.leaves_statement = True
+            return [ast.Break()]
+
+        return [ast.Continue()]
+
+
+    def lower_expression(self, node: Node) -> ast.expr:
+        return self.expression_lowerers[node.kind](node)
+
+
+    def lower_literal(self, literal_node: LiteralNode) -> ast.expr:
+        return ast.Constant(literal_node.value)
+
+
+    def lower_none(self, none_node: NoneNode) -> ast.expr:
+        #A declaration without value holds None, as in the tree walker
+        return ast.Constant(None)
+
+
+    def lower_variable(self, var_node: VariableNode) -> ast.expr:
+        return ast.Name(self.variable_name(var_node), ast.Load())
+
+
+    def lower_unary(self, unary_node: UnaryNode) -> ast.expr:
+        operator = ast.USub() if unary_node.operator == "-" else ast.UAdd()
+        return ast.UnaryOp(operator, self.lower_expression(unary_node.node))
+
+
+    def lower_not(self, not_node: NotBooleanNode) -> ast.expr:
+        return ast.UnaryOp(ast.Not(), self.lower_expression(not_node.node))
+
+
+    def lower_binary_operation(self, operation: BinaryOpNode) -> ast.expr:
+        left = self.lower_expression(operation.left)
+        right = self.lower_expression(operation.right)
+
+        if operation.operator != "/" and operation.operator != "%":
+            return ast.BinOp(left, BINARY_OPERATORS[operation.operator](), right)
+
+        #Two ints give an int, like the tree walker
+        if operation.operator == "%":
+            operator = ast.Mod()
+        elif operation.static_type == "int":
+            operator = ast.FloorDiv()
+        else:
+            operator = ast.Div()
+
+        #Python raises the ZeroDivisionError, its line is the entry of the division in the source map
+        line = len(self.positions)
+        self.positions.append((operation.left.line, operation.left.column, operation.operator))
+        return ast.BinOp(left, operator, right, lineno=line, end_lineno=line, col_offset=0, end_col_offset=0)
+
+
+    def lower_comparison(self, operation: ComparisonOpNode) -> ast.expr:
+        operator = COMPARISON_OPERATORS[operation.operator]()
+        return ast.Compare(self.lower_expression(operation.left), [operator], [self.lower_expression(operation.right)])
+
+
+    def lower_boolean_operation(self, operation: BooleanOpNode) -> ast.expr:
+        operator = ast.And() if operation.operator == "and" else ast.Or()
+        return ast.BoolOp(operator, [self.lower_expression(operation.left), self.lower_expression(operation.right)])
+
+
+    def lower_call(self, call_node: CallNode) -> ast.expr:
+        #The builtins take the list of their arguments
+        args = ast.List([self.lower_expression(arg) for arg in call_node.args], ast.Load())
+        return ast.Call(ast.Name(call_node.calle, ast.Load()), [args], [])
+
+
+class PythonEngine:
+    """Execution engine that lowers the checked program with `PythonCodegen`,
+    compiles the module once with `compile()` and runs it as CPython
+    bytecode.
+    \nThe output and the errors are the ones of `Interpreter`. A division by
+    zero raises Python's ZeroDivisionError, whose line in the traceback is
+    looked up in the source map to report the Akorn line and column.
+    \n`code` and `positions` are all the engine needs to run again, they are
+    what `akorn run` caches (see `store_code`)."""
+
+    def __init__(self, root_node: ProgramNode | FlatAst, reporter: ErrorReporter):
+        codegen = PythonCodegen()
+        module = codegen.lower(root_node)
+
+        self.reporter = reporter
+        self.code: CodeType = compile(module, "<akorn>", "exec")
+        self.positions: tuple[tuple[int, int, str], ...] = tuple(codegen.positions)
+        self.output = OutputBuffer()
+        self.input = InputReader(self.output)
+        self.builtins = make_builtins(self.output, self.input)
+
+
+    @classmethod
+    def from_code(cls, code: CodeType, positions: tuple, reporter: ErrorReporter) -> "PythonEngine":
+        engine = cls.__new__(cls)
+        engine.reporter = reporter
+        engine.code = code
+        engine.positions = positions
+        engine.output = OutputBuffer()
+        engine.input = InputReader(engine.output)
+        engine.builtins = make_builtins(engine.output, engine.input)
+        return engine
+
+
+    def stop(self):
+        raise Exception
+
+
+    def interpret_main(self):
+        namespace = dict(self.builtins)
+        exec(self.code, namespace)
+
+        try:
+            namespace[MAIN_FUNCTION]()
+        except ZeroDivisionError as error:
+            position = zero_division_position(error, self.positions, MAIN_FUNCTION)
+
+            if position is None:
+                raise
+
+            line, column, operator = position
+            self.reporter.add_error(f"[ZeroDivisionError][line: {line}, col: {column}] {division_message(operator)}")
+            self.stop()
+        finally:
+            self.output.flush()
\ No newline at end of file
@@ -0,0 +1,152 @@
+from akorn.ast import *
+from akorn.diagnostic import ErrorReporter
+from .bytecode import *
+from .output import OutputBuffer
+from .input import InputReader
+from .interpreter import make_builtins
+
+
+class VirtualMachine:
+    """Execution engine that compiles the checked program to `Bytecode` and
+    runs it on a stack.
+    \nThe loop of `run` keeps the instructions, the constants, the
+    variables and the stack in locals and tells the opcodes apart with one
+    chain of comparisons, the most common ones first. The output and the
+    errors are the ones of `Interpreter`; a runtime error finds its line and
+    column in the line table."""
+
+    def __init__(self, root_node: ProgramNode | FlatAst, reporter: ErrorReporter):
+        self.reporter = reporter
+        self.bytecode = BytecodeCompiler().compile(root_node)
+        self.output = OutputBuffer()
+        self.input = InputReader(self.output)
+        self.builtins = make_builtins(self.output, self.input)
+
+
+    def stop(self):
+        raise Exception
+
+
+    def division_error(self, index: int, function: int) -> None:
+        line, column = self.bytecode.position(index)
+        message = "You cannot find the modulus of a number divided by zero" if function == MODULO else "You cannot divide a number by zero"
+        self.reporter.add_error(f"[ZeroDivisionError][line: {line}, col: {column}] {message}")
+        self.stop()
+
+
+    def interpret_main(self):
+        try:
+            self.run()
+        finally:
+            self.output.flush()
+
+
+    def run(self):
+        bytecode = self.bytecode
+        instructions = bytecode.unpack()
+        constants = bytecode.constants
+        builtins = self.builtins
+        functions = OPERATOR_FUNCTIONS
+        variables = [None] * bytecode.variable_count
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        index = 0
+
+        while True:
+            opcode, a, b, c = instructions[index]
+            index += 1
+
+            if opcode == LOAD_VAR:
+                push(variables[a])
+
+            elif opcode == VAR_BINARY_CONST:
+                push(functions[a](variables[b], constants[c]))
+
+            elif opcode == VAR_BINARY_VAR:
+                push(functions[a](variables[b], variables[c]))
+
+            elif opcode == STORE_VAR:
+                variables[a] = pop()
+
+            elif opcode == JUMP_IF_FALSE:
+                if not pop():
+                    index = a
+
+            elif opcode == BINARY_CONST:
+                stack[-1] = functions[a](stack[-1], constants[b])
+
+            elif opcode == BINARY_VAR:
+                stack[-1] = functions[a](stack[-1], variables[b])
+
+            elif opcode == JUMP:
+                index = a
+
+            elif opcode == VAR_DIVIDE_VAR:
+                right = variables[c]
+
+                if right == 0:
+                    self.division_error(index - 1, a)
+
+                push(functions[a](variables[b], right))
+
+            elif opcode == DIVIDE_VAR:
+                right = variables[b]
+
+                if right == 0:
+                    self.division_error(index - 1, a)
+
+                stack[-1] = functions[a](stack[-1], right)
+
+            elif opcode == LOAD_CONST:
+                push(constants[a])
+
+            elif opcode == JUMP_IF_FALSE_OR_POP:
+                if stack[-1]:
+                    pop()
+                else:
+                    index = a
+
+            elif opcode == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    index = a
+                else:
+                    pop()
+
+            elif opcode == BINARY:
+                right = pop()
+                stack[-1] = functions[a](stack[-1], right)
+
+            elif opcode == DIVIDE:
+                right = pop()
+
+                if right == 0:
+                    self.division_error(index - 1, a)
+
+                stack[-1] = functions[a](stack[-1], right)
+
+            elif opcode == CALL:
+                name, arg_count = constants[a]
+
+                if arg_count:
+                    args = stack[-arg_count:]
+                    del stack[-arg_count:]
+                else:
+                    args = []
+
+                push(builtins[name](args))
+
+            elif opcode == POP:
+                pop()
+
+            elif opcode == NEGATIVE:
+                stack[-1] = -stack[-1]
+
+            elif opcode == POSITIVE:
+                stack[-1] = +stack[-1]
+
+            elif opcode == NOT:
+                stack[-1] = not stack[-1]
+
+            elif opcode == HALT:
+                return
\ No newline at end of file
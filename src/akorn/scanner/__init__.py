@@ -1,4 +1,7 @@
 from .lexer import Lexer
+from .fast_lexer import FastLexer, LEXERS
 from .token import Token, TokenType
+from .token_buffer import TokenBuffer, TokenView
+from .source import load_source, decode_source
 
-__all__ = ["Lexer", "Token", "TokenType"]
\ No newline at end of file
+__all__ = ["Lexer", "FastLexer", "LEXERS", "Token", "TokenType", "TokenBuffer", "TokenView", "load_source", "decode_source"]
\ No newline at end of file
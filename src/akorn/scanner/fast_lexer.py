@@ -0,0 +1,437 @@
+import re
+from bisect import bisect_left
+from typing import Callable, Iterator
+from .token import Token, TokenType
+from .lexer import Lexer
+from .token_buffer import TokenBuffer
+
+class FastLexer(Lexer):
+    """Lexer engine built on a single compiled alternation pattern.
+    \nEvery match consumes a whole run (the spaces plus the word, number,
+    operator or comment after them) instead of peeking one character at a time. It emits the
+    same tokens, lines, columns and errors as `Lexer`; characters outside
+    ASCII fall back to the scanners inherited from `Lexer`."""
+
+    pattern = re.compile(r"""
+        \ *(?:
+            (?P<newline>\n)
+            |(?P<word>[A-Za-z][A-Za-z0-9_]*)
+            |(?P<operator>\*\*=?|[-+*/%=<>!]=|[-+*%=<>;,(){}]|/(?![/*]))
+            |(?P<number>[0-9]+(?:\.[0-9]+)?)
+            |(?P<string>["'])
+            |(?P<single_comment>//[^\n]*)
+            |(?P<multi_comment>/\*)
+        )
+        |(?P<spaces>\ +)
+    """, re.VERBOSE)
+
+    operators = {
+        ";":TokenType.SEMICOLON,
+        ",":TokenType.COMMA,
+        "(":TokenType.LPAREN,
+        ")":TokenType.RPAREN,
+        "{":TokenType.LBRACE,
+        "}":TokenType.RBRACE,
+        "+":TokenType.PLUS,
+        "+=":TokenType.PLUS_ASSIGN,
+        "-":TokenType.MINUS,
+        "-=":TokenType.MINUS_ASSIGN,
+        "*":TokenType.STAR,
+        "*=":TokenType.STAR_ASSIGN,
+        "**":TokenType.DOUBLE_STAR,
+        "**=":TokenType.DOUBLE_STAR_ASSIGN,
+        "%":TokenType.MOD,
+        "%=":TokenType.MOD_ASSIGN,
+        "/":TokenType.SLASH,
+        "/=":TokenType.SLASH_ASSIGN,
+        "=":TokenType.ASSIGN,
+        "==":TokenType.EQUAL,
+        "<":TokenType.LESS,
+        "<=":TokenType.LESS_EQUAL,
+        ">":TokenType.GREATER,
+        ">=":TokenType.GREATER_EQUAL,
+        "!=":TokenType.DIFERENT,
+    }
+
+
+    bytes_pattern = re.compile(pattern.pattern.encode(), re.VERBOSE)
+    bytes_keywords = {word.encode(): token_type for word, token_type in Lexer.keywords.items()}
+    bytes_operators = {operator.encode(): token_type for operator, token_type in operators.items()}
+
+
+    def peek(self, step: int) -> str:
+        character = super().peek(step)
+
+        #Indexing the bytes of a mapped script gives ints
+        if isinstance(character, int):
+            return chr(character)
+
+        return character
+
+
+    def needs_fallback(self, end: int) -> bool:
+        """True when a number or word ending at `end` could keep going with
+        non-ASCII digits or letters, which only the reference scanners know"""
+
+        if end >= self.code_length:
+            return False
+
+        if self.code[end] == '.':
+            end += 1
+
+        return end < self.code_length and self.code[end] > '\x7f'
+
+
+    def scan_fallback(self) -> None:
+        if self.peek(0).isdigit():
+            self.scan_literal_number()
+        elif self.peek(0).isalpha():
+            self.scan_identifier_or_keyword()
+        else:
+            self.scan_strange_symbol()
+
+
+    def stream(self) -> Iterator[Token]:
+        code = self.code
+        length = self.code_length
+        match = self.pattern.match
+        keywords = self.keywords
+        operators = self.operators
+
+        position = self.position
+        column = self.column
+        line = self.line
+
+        while position < length:
+            found = match(code, position)
+            kind = found.lastgroup if found else None
+
+            if kind is None:
+                self.position, self.column, self.line = position, column, line
+                self.scan_fallback()
+                position, column, line = self.position, self.column, self.line
+                
+                yield from self.tokens_array
+                self.tokens_array.clear()
+                continue
+
+            #The spaces before the token are part of the match
+            start = found.start(kind)
+            end = found.end()
+            column += start - position
+            position = start
+
+            if (kind == "word" or kind == "number") and end < length and (code[end] > '\x7f' or code[end] == '.') and self.needs_fallback(end):
+                self.position, self.column, self.line = position, column, line
+
+                if kind == "word":
+                    self.scan_identifier_or_keyword()
+                else:
+                    self.scan_literal_number()
+
+                position, column, line = self.position, self.column, self.line
+                
+                yield from self.tokens_array
+                self.tokens_array.clear()
+                continue
+
+            #Whitespaces
+            if kind == "spaces":
+                column += end - position
+
+            #Identifiers or keywords, the column is the one after the word
+            elif kind == "word":
+                column += end - position
+                word = found.group(kind)
+                yield Token(keywords.get(word, TokenType.IDENT), word, column, line)
+
+            #Operators and punctuation, the column is the one of the first character
+            elif kind == "operator":
+                operator = found.group(kind)
+                yield Token(operators[operator], operator, column, line)
+                column += end - position
+
+            #Newlines
+            elif kind == "newline":
+                yield Token(TokenType.NEWLINE, "\\n", column + 1, line)
+                line += 1
+                column = 0
+
+            #Literals numbers, the column is the one after the number
+            elif kind == "number":
+                column += end - position
+                number = found.group(kind)
+
+                if '.' in number:
+                    yield Token(TokenType.NUMBER, float(number), column, line)
+                else:
+                    yield Token(TokenType.NUMBER, int(number), column, line)
+
+            #Strings, newlines inside them are still reported as tokens
+            elif kind == "string":
+                quote = code[position]
+                close = code.find(quote, end)
+                stop = length if close == -1 else close + 1
+                column += 1
+
+                segment = end
+                newline = code.find('\n', segment, stop)
+                while newline != -1:
+                    column += newline - segment + 1
+                    yield Token(TokenType.NEWLINE, "\\n", column, line)
+                    line += 1
+                    column = 0
+                    segment = newline + 1
+                    newline = code.find('\n', segment, stop)
+
+                column += stop - segment
+                end = stop
+
+                if close == -1:
+                    self.reporter.add_error(
+                        f"[LexerError][line:{line} , col:{column}] You forgot to close the string with quotation marks; use them at the end -> '{quote}'"
+                    )
+                    column += 1
+                    end += 1
+                else:
+                    literal = code[position + 1 : close]
+
+                    if "\\n" in literal:
+                        literal = literal.replace("\\n", "\n")
+                    if "\\t" in literal:
+                        literal = literal.replace("\\t", "\t")
+
+                    yield Token(TokenType.STRING_LITERAL, literal, column, line)
+
+            #Comments of single-line
+            elif kind == "single_comment":
+                column += end - position
+
+            #Comments of multi-line, the column restarts at 1 after each newline
+            else:
+                close = code.find("*/", end)
+                stop = length if close == -1 else close + 2
+                column += 2
+
+                segment = end
+                newline = code.find('\n', segment, stop)
+                while newline != -1:
+                    column += newline - segment
+                    yield Token(TokenType.NEWLINE, "\\n", column, line)
+                    line += 1
+                    column = 1
+                    segment = newline + 1
+                    newline = code.find('\n', segment, stop)
+
+                column += stop - segment
+                end = stop
+
+                if close == -1:
+                    self.reporter.add_error(
+                        f"[Lexer Error][line:{line}, col:{column}] You forgot to close the comment with these characters -> '*/'"
+                    )
+
+            position = end
+
+        self.position, self.column, self.line = position, column, line
+        yield Token(TokenType.EOF, None, 0, 0)
+
+
+    def tokenize(self) -> list[Token]:
+        self.tokens_array = list(self.stream())
+        return self.tokens_array
+
+
+    def scan_fallback_into(self, buffer: TokenBuffer, position: int, scanner) -> int:
+        """Runs a scanner inherited from `Lexer` at `position` and moves the
+        token it produced into the buffer, returns the position after it"""
+
+        line = len(buffer.line_starts) - 1
+        self.position = position
+        self.line = line + 1
+        self.column = position - buffer.line_starts[line] + buffer.line_bias[line]
+
+        scanner()
+
+        for token in self.tokens_array:
+            buffer.append(token.type, position, self.position)
+
+        self.tokens_array.clear()
+        return self.position
+
+
+    def tokenize_buffer(self) -> TokenBuffer:
+        """Same scan as `stream`, but the tokens go into a compact `TokenBuffer`
+        as (type, start, end) rows instead of `Token` objects"""
+
+        buffer = TokenBuffer(self.code)
+        self.fill_buffer(buffer)
+        buffer.append(TokenType.EOF, self.code_length, self.code_length)
+        return buffer
+
+
+    def relex(self, previous: TokenBuffer, offset: int, removed: int, inserted: str) -> TokenBuffer:
+        """Tokens of `self.code`, which is `previous.source` after replacing
+        `removed` characters at `offset` with `inserted`.
+        \nThe scan restarts after the last token that ends two characters
+        before the edit (the pattern never looks further ahead), so it is
+        never inside a string or a comment, and stops at the first token
+        after the edit that the previous buffer also had, moved by the size
+        of the edit. The rows and lines after it are only shifted. Errors
+        are reported for the scanned region only."""
+
+        delta = len(inserted) - removed
+        edit_end = offset + len(inserted)
+        newline_code = TokenType.NEWLINE.value
+        types = previous.types
+        last = len(types) - 1
+
+        #The ends of the rows never go back, the starts do for the newlines of a string
+        restart = bisect_left(range(last), offset - 1, key=previous.end)
+        while restart > 0 and types[restart - 1] == newline_code:
+            restart -= 1
+
+        position = previous.end(restart - 1) if restart > 0 else 0
+
+        buffer = TokenBuffer(self.code)
+        buffer.extend(previous, 0, restart, 1, previous.line_index(position) + 1)
+
+        old_index = restart
+
+        def synced(position: int) -> bool:
+            nonlocal old_index
+            row = len(buffer.types) - 1
+
+            if row < 0 or buffer.ends[row] != position or buffer.starts[row] < edit_end or buffer.types[row] == newline_code:
+                return False
+
+            old_end = position - delta
+            while old_index < last and (previous.end(old_index) < old_end or types[old_index] == newline_code):
+                old_index += 1
+
+            return (
+                old_index < last
+                and previous.end(old_index) == old_end
+                and previous.start(old_index) == buffer.starts[row] - delta
+                and types[old_index] == buffer.types[row]
+            )
+
+        self.position = position
+
+        if self.fill_buffer(buffer, synced):
+            old_end = self.position - delta
+            buffer.attach(previous, old_index + 1, previous.line_index(old_end) + 1, delta)
+        else:
+            buffer.append(TokenType.EOF, self.code_length, self.code_length)
+
+        return buffer
+
+
+    def fill_buffer(self, buffer: TokenBuffer, synced: Callable[[int], bool] | None = None) -> bool:
+        """Scans from the current position to the end of the code into
+        `buffer`. `synced` is asked after every step whether the scan can
+        stop at the position reached, then True is returned."""
+
+        code = self.code
+        length = self.code_length
+
+        if isinstance(code, str):
+            match = self.pattern.match
+            keywords = self.keywords
+            operators = self.operators
+            newline_char, comment_close = '\n', "*/"
+            as_text = str
+        else:
+            #Plain ASCII bytes of a mapped script, no character needs the fallback scanners
+            match = self.bytes_pattern.match
+            keywords = self.bytes_keywords
+            operators = self.bytes_operators
+            newline_char, comment_close = b'\n', b"*/"
+            as_text = bytes.decode
+
+        append = buffer.append
+        new_line = buffer.new_line
+        position = self.position
+
+        while position < length:
+            found = match(code, position)
+            kind = found.lastgroup if found else None
+
+            if kind is None:
+                position = self.scan_fallback_into(buffer, position, self.scan_fallback)
+                continue
+
+            start = found.start(kind)
+            end = found.end()
+
+            if (kind == "word" or kind == "number") and as_text is str and end < length and (code[end] > '\x7f' or code[end] == '.') and self.needs_fallback(end):
+                scanner = self.scan_identifier_or_keyword if kind == "word" else self.scan_literal_number
+                position = self.scan_fallback_into(buffer, start, scanner)
+                continue
+
+            if kind == "word":
+                append(keywords.get(found.group(kind), TokenType.IDENT), start, end)
+
+            elif kind == "operator":
+                append(operators[found.group(kind)], start, end)
+
+            elif kind == "newline":
+                append(TokenType.NEWLINE, start, end)
+                new_line(end)
+
+            elif kind == "number":
+                append(TokenType.NUMBER, start, end)
+
+            #Strings, the newlines inside them are tokens placed before the string
+            elif kind == "string":
+                quote = code[start:start + 1]
+                close = code.find(quote, end)
+                stop = length if close == -1 else close + 1
+
+                newline = code.find(newline_char, end, stop)
+                while newline != -1:
+                    append(TokenType.NEWLINE, newline, newline + 1)
+                    new_line(newline + 1)
+                    newline = code.find(newline_char, newline + 1, stop)
+
+                end = stop
+
+                if close == -1:
+                    self.reporter.add_error(
+                        f"[LexerError][line:{len(buffer.line_starts)} , col:{length - buffer.line_starts[-1] + buffer.line_bias[-1]}] You forgot to close the string with quotation marks; use them at the end -> '{as_text(quote)}'"
+                    )
+                else:
+                    append(TokenType.STRING_LITERAL, start, end)
+
+            #Comments of multi-line, their newlines have no width and the next line counts from 1
+            elif kind == "multi_comment":
+                close = code.find(comment_close, end)
+                stop = length if close == -1 else close + 2
+
+                newline = code.find(newline_char, end, stop)
+                while newline != -1:
+                    append(TokenType.NEWLINE, newline, newline)
+                    new_line(newline + 1, 1)
+                    newline = code.find(newline_char, newline + 1, stop)
+
+                end = stop
+
+                if close == -1:
+                    self.reporter.add_error(
+                        f"[Lexer Error][line:{len(buffer.line_starts)}, col:{length - buffer.line_starts[-1] + buffer.line_bias[-1]}] You forgot to close the comment with these characters -> '*/'"
+                    )
+
+            position = end
+
+            if synced is not None and synced(position):
+                self.position = position
+                return True
+
+        self.position = position
+        return False
+
+
+LEXERS = {
+    "fast":FastLexer,
+    "reference":Lexer,
+}
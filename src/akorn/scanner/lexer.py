@@ -1,3 +1,4 @@
+from typing import Iterator
 from .token import Token, TokenType
 from akorn.diagnostic import ErrorReporter
 
@@ -159,156 +160,177 @@ class Lexer:
             self.tokens_array.append(Token(TokenType.STRING_LITERAL, temporal_string, self.column, self.line))
             
             
-    def tokenize(self) -> list[Token]:
-        while self.position < self.code_length:
-             
-            #Whitespaces and Newlines
-            if self.peek(0) == ' ':
-                self.advance(1)
-            
-            elif self.peek(0) == '\n':
-                self.advance(1)
-                self.reset_line()
-                    
-            #Semicolon
-            elif self.peek(0) == ';':
-                self.tokens_array.append(Token(TokenType.SEMICOLON, ';', self.column, self.line))
-                self.advance(1)
+    def scan_strange_symbol(self) -> None:
+        self.reporter.add_error(
+            f"[LexerError][line:{self.line}, col:{self.column}] Strange symbol found -> '{self.peek(0)}'"
+        )
+        self.advance(1)
             
-            #Comma
-            elif self.peek(0) == ',':
-                self.tokens_array.append(Token(TokenType.COMMA, ',', self.column, self.line))
-                self.advance(1)
             
-            #Left parenthesis
-            elif self.peek(0) == '(':
-                self.tokens_array.append(Token(TokenType.LPAREN, '(', self.column, self.line))
-                self.advance(1)
+    def scan_token(self) -> None:
+        """Scans the token that starts at the current position"""
+        
+        #Whitespaces and Newlines
+        if self.peek(0) == ' ':
+            self.advance(1)
+        
+        elif self.peek(0) == '\n':
+            self.advance(1)
+            self.reset_line()
+                
+        #Semicolon
+        elif self.peek(0) == ';':
+            self.tokens_array.append(Token(TokenType.SEMICOLON, ';', self.column, self.line))
+            self.advance(1)
+        
+        #Comma
+        elif self.peek(0) == ',':
+            self.tokens_array.append(Token(TokenType.COMMA, ',', self.column, self.line))
+            self.advance(1)
+        
+        #Left parenthesis
+        elif self.peek(0) == '(':
+            self.tokens_array.append(Token(TokenType.LPAREN, '(', self.column, self.line))
+            self.advance(1)
+        
+        #Right parenthesis
+        elif self.peek(0) == ')':
+            self.tokens_array.append(Token(TokenType.RPAREN, ')', self.column, self.line))
+            self.advance(1)
+        
+        #Left brace
+        elif self.peek(0) == "{":
+            self.tokens_array.append(Token(TokenType.LBRACE, '{', self.column, self.line))
+            self.advance(1)
             
-            #Right parenthesis
-            elif self.peek(0) == ')':
-                self.tokens_array.append(Token(TokenType.RPAREN, ')', self.column, self.line))
-                self.advance(1)
+        #Right brace
+        elif self.peek(0) == "}":
+            self.tokens_array.append(Token(TokenType.RBRACE, '}', self.column, self.line))
+            self.advance(1)
             
-            #Left brace
-            elif self.peek(0) == "{":
-                self.tokens_array.append(Token(TokenType.LBRACE, '{', self.column, self.line))
-                self.advance(1)
-                
-            #Right brace
-            elif self.peek(0) == "}":
-                self.tokens_array.append(Token(TokenType.RBRACE, '}', self.column, self.line))
+        #Operator of plus and comuest plus
+        elif self.peek(0) == '+':
+            if self.peek(1) == '=':
+                self.tokens_array.append(Token(TokenType.PLUS_ASSIGN, '+=', self.column, self.line))
+                self.advance(2)
+            else:
+                self.tokens_array.append(Token(TokenType.PLUS, '+', self.column, self.line))
                 self.advance(1)
-                
-            #Operator of plus and comuest plus
-            elif self.peek(0) == '+':
-                if self.peek(1) == '=':
-                    self.tokens_array.append(Token(TokenType.PLUS_ASSIGN, '+=', self.column, self.line))
-                    self.advance(2)
-                else:
-                    self.tokens_array.append(Token(TokenType.PLUS, '+', self.column, self.line))
-                    self.advance(1)
-
-            #Operators of minus and compuest minus
-            elif self.peek(0) == '-':
-                if self.peek(1) == '=':
-                    self.tokens_array.append(Token(TokenType.MINUS_ASSIGN, '-=', self.column, self.line))
-                    self.advance(2)
-                else:
-                    self.tokens_array.append(Token(TokenType.MINUS, '-', self.column, self.line))
-                    self.advance(1)
-            
-            #Operators of multiplication, power, compuest multiplication and compuest power
-            elif self.peek(0) == '*':
-                if self.peek(1) == '*':
-                    if self.peek(2) == '=':
-                        self.tokens_array.append(Token(TokenType.DOUBLE_STAR_ASSIGN, "**=", self.column, self.line))
-                        self.advance(3)
-                    else:
-                        self.tokens_array.append(Token(TokenType.DOUBLE_STAR, "**", self.column, self.line))
-                        self.advance(2)
-                else:
-                    if self.peek(1) == '=':
-                        self.tokens_array.append(Token(TokenType.STAR_ASSIGN, "*=", self.column, self.line))
-                        self.advance(2)
-                    else:
-                        self.tokens_array.append(Token(TokenType.STAR, '*', self.column, self.line))
-                        self.advance(1)
-                
-            #Operators of division and compuest division, or comments of single-line and multi-line
-            elif self.peek(0) == '/':
-                if self.peek(1) == '/':
-                    self.advance(2)
-                    self.scan_single_comment() 
-                elif self.peek(1) == '*':
-                    self.advance(2)
-                    self.scan_multi_comment()
-                elif self.peek(1) == '=':
-                    self.tokens_array.append(Token(TokenType.SLASH_ASSIGN, '/=', self.column, self.line))
-                    self.advance(2)
-                else:
-                    self.tokens_array.append(Token(TokenType.SLASH, '/', self.column, self.line))  
-                    self.advance(1)    
 
-            #Operators of mod and compound mod
-            elif self.peek(0) == '%':
-                if self.peek(1) == '=':
-                    self.tokens_array.append(Token(TokenType.MOD_ASSIGN, "%=", self.column, self.line))
-                    self.advance(2)
+        #Operators of minus and compuest minus
+        elif self.peek(0) == '-':
+            if self.peek(1) == '=':
+                self.tokens_array.append(Token(TokenType.MINUS_ASSIGN, '-=', self.column, self.line))
+                self.advance(2)
+            else:
+                self.tokens_array.append(Token(TokenType.MINUS, '-', self.column, self.line))
+                self.advance(1)
+        
+        #Operators of multiplication, power, compuest multiplication and compuest power
+        elif self.peek(0) == '*':
+            if self.peek(1) == '*':
+                if self.peek(2) == '=':
+                    self.tokens_array.append(Token(TokenType.DOUBLE_STAR_ASSIGN, "**=", self.column, self.line))
+                    self.advance(3)
                 else:
-                    self.tokens_array.append(Token(TokenType.MOD, '%', self.column, self.line))
-                    self.advance(1)
-            
-            #Assign sign and Equal operators
-            elif self.peek(0) == '=':
-                if self.peek(1) == '=':
-                    self.tokens_array.append(Token(TokenType.EQUAL, "==", self.column, self.line))
+                    self.tokens_array.append(Token(TokenType.DOUBLE_STAR, "**", self.column, self.line))
                     self.advance(2)
-                else:
-                    self.tokens_array.append(Token(TokenType.ASSIGN, '=', self.column, self.line))
-                    self.advance(1)
-            
-            #Less and Less and Equal operators
-            elif self.peek(0) == '<':
+            else:
                 if self.peek(1) == '=':
-                    self.tokens_array.append(Token(TokenType.LESS_EQUAL, "<=", self.column, self.line))
+                    self.tokens_array.append(Token(TokenType.STAR_ASSIGN, "*=", self.column, self.line))
                     self.advance(2)
                 else:
-                    self.tokens_array.append(Token(TokenType.LESS, '<', self.column, self.line))
+                    self.tokens_array.append(Token(TokenType.STAR, '*', self.column, self.line))
                     self.advance(1)
             
-            #Greater and Greater and equal operators
-            elif self.peek(0) == '>':
-                if self.peek(1) == '=':
-                    self.tokens_array.append(Token(TokenType.GREATER_EQUAL, ">=", self.column, self.line))
-                    self.advance(2)
-                else:
-                    self.tokens_array.append(Token(TokenType.GREATER, '>', self.column, self.line))
-                    self.advance(1)
+        #Operators of division and compuest division, or comments of single-line and multi-line
+        elif self.peek(0) == '/':
+            if self.peek(1) == '/':
+                self.advance(2)
+                self.scan_single_comment() 
+            elif self.peek(1) == '*':
+                self.advance(2)
+                self.scan_multi_comment()
+            elif self.peek(1) == '=':
+                self.tokens_array.append(Token(TokenType.SLASH_ASSIGN, '/=', self.column, self.line))
+                self.advance(2)
+            else:
+                self.tokens_array.append(Token(TokenType.SLASH, '/', self.column, self.line))  
+                self.advance(1)    
 
-            #Diferent operator
-            elif self.peek(0) == '!' and self.peek(1) == '=':
-                self.tokens_array.append(Token(TokenType.DIFERENT, "!=", self.column, self.line))
+        #Operators of mod and compound mod
+        elif self.peek(0) == '%':
+            if self.peek(1) == '=':
+                self.tokens_array.append(Token(TokenType.MOD_ASSIGN, "%=", self.column, self.line))
+                self.advance(2)
+            else:
+                self.tokens_array.append(Token(TokenType.MOD, '%', self.column, self.line))
+                self.advance(1)
+        
+        #Assign sign and Equal operators
+        elif self.peek(0) == '=':
+            if self.peek(1) == '=':
+                self.tokens_array.append(Token(TokenType.EQUAL, "==", self.column, self.line))
                 self.advance(2)
-            
-            #Literals numbers
-            elif self.peek(0).isdigit():
-                self.scan_literal_number()
-                
-            #Strings
-            elif self.peek(0) == "\"" or self.peek(0) == "'":
-                self.scan_literal_string()
-            
-            #Identifiers or keywords
-            elif self.peek(0).isalpha():
-                self.scan_identifier_or_keyword()
-            
             else:
-                self.reporter.add_error(
-                    f"[LexerError][line:{self.line}, col:{self.column}] Strange symbol found -> '{self.peek(0)}'"
-                )
+                self.tokens_array.append(Token(TokenType.ASSIGN, '=', self.column, self.line))
                 self.advance(1)
+        
+        #Less and Less and Equal operators
+        elif self.peek(0) == '<':
+            if self.peek(1) == '=':
+                self.tokens_array.append(Token(TokenType.LESS_EQUAL, "<=", self.column, self.line))
+                self.advance(2)
+            else:
+                self.tokens_array.append(Token(TokenType.LESS, '<', self.column, self.line))
+                self.advance(1)
+        
+        #Greater and Greater and equal operators
+        elif self.peek(0) == '>':
+            if self.peek(1) == '=':
+                self.tokens_array.append(Token(TokenType.GREATER_EQUAL, ">=", self.column, self.line))
+                self.advance(2)
+            else:
+                self.tokens_array.append(Token(TokenType.GREATER, '>', self.column, self.line))
+                self.advance(1)
+
+        #Diferent operator
+        elif self.peek(0) == '!' and self.peek(1) == '=':
+            self.tokens_array.append(Token(TokenType.DIFERENT, "!=", self.column, self.line))
+            self.advance(2)
+        
+        #Literals numbers
+        elif self.peek(0).isdigit():
+            self.scan_literal_number()
+            
+        #Strings
+        elif self.peek(0) == "\"" or self.peek(0) == "'":
+            self.scan_literal_string()
+        
+        #Identifiers or keywords
+        elif self.peek(0).isalpha():
+            self.scan_identifier_or_keyword()
+        
+        else:
+            self.scan_strange_symbol()
+
+
+    def stream(self) -> Iterator[Token]:
+        """Yields the tokens as they are scanned instead of collecting them all"""
+        
+        while self.position < self.code_length:
+            self.scan_token()
+            
+            if self.tokens_array:
+                yield from self.tokens_array
+                self.tokens_array.clear()
+        
+        yield Token(TokenType.EOF, None, 0, 0)
+
+
+    def tokenize(self) -> list[Token]:
+        while self.position < self.code_length:
+            self.scan_token()
               
         self.tokens_array.append(Token(TokenType.EOF, None, 0, 0))
         return self.tokens_array
-
@@ -0,0 +1,81 @@
+import codecs
+import mmap
+import os
+import re
+from akorn.diagnostic import ErrorReporter
+
+#Scripts from this size on are memory-mapped instead of read
+MMAP_THRESHOLD = 1 << 20
+
+#Anything that the lexer can not read straight from the bytes
+not_plain_ascii = re.compile(rb"[\x80-\xff\r]")
+
+boms = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+def detect_encoding(head: bytes) -> str:
+    for bom, encoding in boms:
+        if head.startswith(bom):
+            return encoding
+
+    return "utf-8"
+
+
+def decode_source(data, path: str, reporter: ErrorReporter) -> str | None:
+    """Decodes the bytes of a script with the encoding of its BOM (UTF-8 if
+    it has none) and turns '\\r\\n' and '\\r' line endings into '\\n'"""
+
+    encoding = detect_encoding(data[:4])
+
+    try:
+        code = str(data, encoding)
+    except UnicodeDecodeError as error:
+        reporter.add_error(
+            f"[SourceError][file: {path}] The script is not valid {encoding}, byte {error.start} can not be decoded"
+        )
+        return None
+
+    if '\r' in code:
+        code = code.replace("\r\n", "\n").replace("\r", "\n")
+
+    return code
+
+
+def load_source(path: str, reporter: ErrorReporter, allow_mapped: bool = True) -> str | mmap.mmap | None:
+    """Loads the code of a script without creating or touching anything.
+    \nBig plain ASCII scripts are returned as a read-only memory map when
+    `allow_mapped` is True, the fast lexer scans the mapped bytes and only
+    copies the values it needs. Everything else is decoded to a str.
+    Returns None and reports the error when the script can not be read."""
+
+    try:
+        with open(path, "rb") as file_ak:
+            size = os.fstat(file_ak.fileno()).st_size
+
+            if allow_mapped and size >= MMAP_THRESHOLD:
+                mapped = mmap.mmap(file_ak.fileno(), 0, access=mmap.ACCESS_READ)
+
+                if not not_plain_ascii.search(mapped):
+                    return mapped
+
+                data = mapped[:]
+                mapped.close()
+            else:
+                data = file_ak.read()
+
+    except FileNotFoundError:
+        reporter.add_error(f"[SourceError][file: {path}] The script does not exist")
+        return None
+    except IsADirectoryError:
+        reporter.add_error(f"[SourceError][file: {path}] The path is a directory, not a script")
+        return None
+    except OSError as error:
+        reporter.add_error(f"[SourceError][file: {path}] The script can not be read: {error.strerror}")
+        return None
+
+    return decode_source(data, path, reporter)
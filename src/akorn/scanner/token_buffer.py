@@ -0,0 +1,358 @@
+from array import array
+from bisect import bisect_right
+from typing import Iterator
+from .token import Token, TokenType
+
+def add_segment(indexes: list[int], shifts: list[int], index: int, shift: int) -> None:
+    """Starts a segment of `shift` at row `index`, after the last one. A
+    segment left empty is dropped and one of the same shift as the segment
+    before it is merged with it."""
+
+    if indexes and indexes[-1] == index:
+        indexes.pop()
+        shifts.pop()
+
+    if shifts and shifts[-1] == shift:
+        return
+
+    indexes.append(index)
+    shifts.append(shift)
+
+
+def copy_segments(indexes: list[int], shifts: list[int], first: int, last: int, to_indexes: list[int], to_shifts: list[int], base: int, delta: int = 0) -> None:
+    """Adds the segments of the rows [first, last) to `to_indexes` and
+    `to_shifts`, with those rows moved to row `base` and `delta` more
+    shifted"""
+
+    segment = bisect_right(indexes, first) - 1
+
+    while segment < len(indexes) and indexes[segment] < last:
+        add_segment(to_indexes, to_shifts, base + max(indexes[segment], first) - first, shifts[segment] + delta)
+        segment += 1
+
+
+def take(values: array, indexes: list[int], shifts: list[int], first: int, last: int) -> array:
+    """values[first:last] as they really are, the rows of each segment are
+    stored its shift lower"""
+
+    result = array('i')
+    segment = bisect_right(indexes, first) - 1
+
+    while segment < len(indexes) and indexes[segment] < last:
+        start = max(indexes[segment], first)
+        end = min(indexes[segment + 1], last) if segment + 1 < len(indexes) else last
+        shift = shifts[segment]
+
+        if shift == 0:
+            result.extend(values[start:end])
+        else:
+            result.extend([value + shift for value in values[start:end]])
+
+        segment += 1
+
+    return result
+
+class TokenView:
+    """Token read from a row of a `TokenBuffer`.
+    \nIt has the same attributes and repr as `Token`. The type is read when
+    the view is made, since the parser checks it again and again, the value,
+    line and column are only computed when they are read."""
+
+    __slots__ = ("buffer", "index", "type")
+
+    def __init__(self, buffer: "TokenBuffer", index: int) -> None:
+        self.buffer = buffer
+        self.index = index
+        self.type: TokenType = buffer.type_at(index)
+
+    @property
+    def value(self):
+        return self.buffer.value_at(self.index)
+
+    @property
+    def line(self) -> int:
+        return self.buffer.line_at(self.index)
+
+    @property
+    def column(self) -> int:
+        return self.buffer.column_at(self.index)
+
+    def __repr__(self):
+        return f"{Token.__name__}(type={self.type}, value='{self.value}', line={self.line}, column={self.column})"
+
+
+class TokenBuffer:
+    """Tokens stored as parallel arrays: the type code and the start and end
+    offsets of every token in the source.
+    \nValues are slices of the source and the line and column are found with
+    a binary search over the offsets where each line starts. Columns follow
+    the lexer: numbers, words, strings and newlines take the column after
+    the token, operators the column of their first character, and the lines
+    that start inside a `/* */` comment count from 1 instead of 0.
+    \nAfter an incremental re-lex the offsets after each edit are stored
+    lower than they are, so the tokens after an edit are not rewritten. The
+    rows are split in segments: the one that starts at row
+    `shift_indexes[k]` is stored `shifts[k]` lower, and the lines the same
+    with `line_shift_indexes` and `line_shifts`. The first segment starts at
+    row 0, a buffer that was never re-lexed has just that one, of shift 0. A
+    re-lex copies the stored offsets as they are and only adds
+    segments, the shifts are applied when an offset is read."""
+
+    types_by_code = tuple(TokenType)
+
+    column_at_start = frozenset({
+        TokenType.SEMICOLON,
+        TokenType.COMMA,
+        TokenType.LPAREN,
+        TokenType.RPAREN,
+        TokenType.LBRACE,
+        TokenType.RBRACE,
+        TokenType.PLUS,
+        TokenType.PLUS_ASSIGN,
+        TokenType.MINUS,
+        TokenType.MINUS_ASSIGN,
+        TokenType.STAR,
+        TokenType.STAR_ASSIGN,
+        TokenType.DOUBLE_STAR,
+        TokenType.DOUBLE_STAR_ASSIGN,
+        TokenType.MOD,
+        TokenType.MOD_ASSIGN,
+        TokenType.SLASH,
+        TokenType.SLASH_ASSIGN,
+        TokenType.ASSIGN,
+        TokenType.EQUAL,
+        TokenType.LESS,
+        TokenType.LESS_EQUAL,
+        TokenType.GREATER,
+        TokenType.GREATER_EQUAL,
+        TokenType.DIFERENT,
+    })
+
+    def __init__(self, source: str | bytes) -> None:
+        self.source = source
+        self.types = array('i')
+        self.starts = array('i')
+        self.ends = array('i')
+        self.line_starts = array('i', [0])
+        self.line_bias = bytearray(1)
+        self.shift_indexes = [0]
+        self.shifts = [0]
+        self.line_shift_indexes = [0]
+        self.line_shifts = [0]
+
+
+    def append(self, token_type: TokenType, start: int, end: int) -> None:
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+
+    def new_line(self, start: int, bias: int = 0) -> None:
+        """Registers a line that begins at the offset `start`, `bias` is the
+        column of its first character minus one"""
+
+        self.line_starts.append(start)
+        self.line_bias.append(bias)
+
+
+    def start(self, index: int) -> int:
+        shifts = self.shifts
+
+        if len(shifts) == 1:
+            return self.starts[index] + shifts[0]
+
+        return self.starts[index] + shifts[bisect_right(self.shift_indexes, index) - 1]
+
+
+    def end(self, index: int) -> int:
+        shifts = self.shifts
+
+        if len(shifts) == 1:
+            return self.ends[index] + shifts[0]
+
+        return self.ends[index] + shifts[bisect_right(self.shift_indexes, index) - 1]
+
+
+    def line_start(self, line: int) -> int:
+        shifts = self.line_shifts
+
+        if len(shifts) == 1:
+            return self.line_starts[line] + shifts[0]
+
+        return self.line_starts[line] + shifts[bisect_right(self.line_shift_indexes, line) - 1]
+
+
+    def extend(self, other: "TokenBuffer", first: int, last: int, first_line: int, last_line: int) -> None:
+        """Copies the rows [first, last) and the lines [first_line, last_line)
+        of `other` with their segments, the rows and lines appended after
+        them are not shifted"""
+
+        copy_segments(other.shift_indexes, other.shifts, first, last, self.shift_indexes, self.shifts, len(self.types))
+        self.types.extend(other.types[first:last])
+        self.starts.extend(other.starts[first:last])
+        self.ends.extend(other.ends[first:last])
+        add_segment(self.shift_indexes, self.shifts, len(self.types), 0)
+
+        copy_segments(other.line_shift_indexes, other.line_shifts, first_line, last_line, self.line_shift_indexes, self.line_shifts, len(self.line_starts))
+        self.line_starts.extend(other.line_starts[first_line:last_line])
+        self.line_bias.extend(other.line_bias[first_line:last_line])
+        add_segment(self.line_shift_indexes, self.line_shifts, len(self.line_starts), 0)
+
+
+    def attach(self, other: "TokenBuffer", first: int, first_line: int, delta: int) -> None:
+        """Appends the rows from `first` and the lines from `first_line` of
+        `other` moved `delta` characters. Their stored offsets are copied as
+        they are, the move is in the shifts of their segments."""
+
+        copy_segments(other.shift_indexes, other.shifts, first, len(other.types), self.shift_indexes, self.shifts, len(self.types), delta)
+        self.types.extend(other.types[first:])
+        self.starts.extend(other.starts[first:])
+        self.ends.extend(other.ends[first:])
+
+        copy_segments(other.line_shift_indexes, other.line_shifts, first_line, len(other.line_starts), self.line_shift_indexes, self.line_shifts, len(self.line_starts), delta)
+        self.line_starts.extend(other.line_starts[first_line:])
+        self.line_bias.extend(other.line_bias[first_line:])
+
+
+    def text(self, start: int, end: int) -> str:
+        text = self.source[start:end]
+
+        #The source can be the ASCII bytes of a mapped script
+        if not isinstance(text, str):
+            return text.decode("ascii")
+
+        return text
+
+
+    def type_at(self, index: int) -> TokenType:
+        return self.types_by_code[self.types[index] - 1]
+
+
+    def value_at(self, index: int):
+        token_type = self.type_at(index)
+        start = self.start(index)
+        end = self.end(index)
+
+        if token_type == TokenType.EOF:
+            return None
+
+        if token_type == TokenType.NEWLINE:
+            return "\\n"
+
+        if token_type == TokenType.NUMBER:
+            number = self.text(start, end)
+            return float(number) if '.' in number else int(number)
+
+        if token_type == TokenType.STRING_LITERAL:
+            literal = self.text(start + 1, end - 1)
+
+            if "\\n" in literal:
+                literal = literal.replace("\\n", "\n")
+            if "\\t" in literal:
+                literal = literal.replace("\\t", "\t")
+
+            return literal
+
+        return self.text(start, end)
+
+
+    def line_index(self, offset: int) -> int:
+        line_starts = self.line_starts
+        indexes = self.line_shift_indexes
+        shifts = self.line_shifts
+
+        if len(shifts) == 1:
+            return bisect_right(line_starts, offset - shifts[0]) - 1
+
+        #The last segment may have no lines yet
+        segments = len(indexes) if indexes[-1] < len(line_starts) else len(indexes) - 1
+
+        #The segment of the last line that starts at or before `offset`, then the line in it
+        segment = bisect_right(range(segments), offset, key=lambda segment: line_starts[indexes[segment]] + shifts[segment]) - 1
+        end = indexes[segment + 1] if segment + 1 < len(indexes) else len(line_starts)
+        return bisect_right(line_starts, offset - shifts[segment], indexes[segment], end) - 1
+
+
+    def line_at(self, index: int) -> int:
+        token_type = self.type_at(index)
+
+        if token_type == TokenType.EOF:
+            return 0
+
+        #A string is reported on the line of its closing quote
+        if token_type == TokenType.STRING_LITERAL:
+            return self.line_index(self.end(index) - 1) + 1
+
+        return self.line_index(self.start(index)) + 1
+
+
+    def column_at(self, index: int) -> int:
+        token_type = self.type_at(index)
+
+        if token_type == TokenType.EOF:
+            return 0
+
+        line = self.line_at(index) - 1
+
+        if token_type in self.column_at_start:
+            anchor = self.start(index)
+        else:
+            anchor = self.end(index)
+
+        return anchor - self.line_start(line) + self.line_bias[line]
+
+
+    def token(self, index: int) -> Token:
+        """Builds a full `Token` out of the row `index`"""
+
+        return Token(self.type_at(index), self.value_at(index), self.column_at(index), self.line_at(index))
+
+
+    def tokens(self) -> Iterator[Token]:
+        """Yields every row as a full `Token`, for consumers that read each
+        token many times. The lines are walked in order instead of searched."""
+
+        types_by_code = self.types_by_code
+        column_at_start = self.column_at_start
+        line_bias = self.line_bias
+        lines = len(self.line_starts)
+        line_starts = take(self.line_starts, self.line_shift_indexes, self.line_shifts, 0, lines)
+        line = 0
+
+        for index, code in enumerate(self.types):
+            token_type = types_by_code[code - 1]
+
+            if token_type == TokenType.EOF:
+                yield Token(TokenType.EOF, None, 0, 0)
+                continue
+
+            start = self.start(index)
+            end = self.end(index)
+            offset = end - 1 if token_type == TokenType.STRING_LITERAL else start
+
+            while line + 1 < lines and line_starts[line + 1] <= offset:
+                line += 1
+
+            anchor = start if token_type in column_at_start else end
+            column = anchor - line_starts[line] + line_bias[line]
+
+            yield Token(token_type, self.value_at(index), column, line + 1)
+
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+
+    def __getitem__(self, index: int) -> TokenView:
+        if index < 0:
+            index += len(self.types)
+
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+
+        return TokenView(self, index)
+
+
+    def __iter__(self) -> Iterator[TokenView]:
+        for index in range(len(self.types)):
+            yield TokenView(self, index)
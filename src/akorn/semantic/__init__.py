@@ -1,3 +1,4 @@
 from .semantic import Semantic
+from .resolver import Resolver
 
-__all__ = ["Semantic"]
\ No newline at end of file
+__all__ = ["Semantic", "Resolver"]
\ No newline at end of file
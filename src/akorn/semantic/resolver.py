@@ -0,0 +1,107 @@
+from akorn.ast import *
+
+
+class Resolver:
+    """Gives every variable an address, after Semantic has accepted the program.
+    \nThe address is (depth, slot): the depth of the block that declares the
+    variable, 0 for the program, and its index in the frame of that block.
+    Blocks get their depth and the `size` of their frame. At runtime a frame
+    is a list of `size` values and the interpreter keeps the frame of every
+    open block by depth, so reading a variable is two list indexes.
+    \nNames are looked up the way Semantic does: a declaration is visible
+    after it and the value of a declaration still sees the outer variable
+    with the same name."""
+
+    def __init__(self) -> None:
+        #Name -> slot of each open block, the program first
+        self.frames: list[dict[str, int]] = []
+
+        self.statement_resolvers = {
+            DeclarationNode: self.resolve_declaration,
+            AssignmentNode: self.resolve_assignment,
+            CallNode: self.resolve_expression,
+            IfNode: self.resolve_if,
+            WhileNode: self.resolve_while,
+        }
+
+
+    def resolve(self, root_node: ProgramNode) -> None:
+        self.frames = []
+        self.resolve_block(root_node)
+
+
+    def resolve_block(self, block: ProgramNode | BlockNode) -> None:
+        slots: dict[str, int] = {}
+        block.depth = len(self.frames)
+        self.frames.append(slots)
+        statement_resolvers = self.statement_resolvers
+
+        for node in block.statements:
+            resolver = statement_resolvers.get(node.kind)
+
+            if resolver is not None:
+                resolver(node)
+
+        self.frames.pop()
+        block.size = len(slots)
+
+
+    def lookup(self, name: str) -> tuple[int, int]:
+        for depth in range(len(self.frames) - 1, -1, -1):
+            slot = self.frames[depth].get(name)
+
+            if slot is not None:
+                return depth, slot
+
+        raise NameError(f"the variable '{name}' was not declared, Semantic should have reported it")
+
+
+    def resolve_declaration(self, decl_node: DeclarationNode) -> None:
+        self.resolve_expression(decl_node.value)
+
+        #Declaring a name again in the same block reuses its slot
+        slots = self.frames[-1]
+        slot = slots.get(decl_node.name)
+
+        if slot is None:
+            slot = slots[decl_node.name] = len(slots)
+
+        decl_node.depth = len(self.frames) - 1
+        decl_node.slot = slot
+
+
+    def resolve_assignment(self, assign_node: AssignmentNode) -> None:
+        self.resolve_expression(assign_node.value)
+        assign_node.depth, assign_node.slot = self.lookup(assign_node.name)
+
+
+    def resolve_if(self, if_node: IfNode) -> None:
+        for condition, block in if_node.branches:
+            self.resolve_expression(condition)
+            self.resolve_block(block)
+
+        if if_node.else_node.kind is ElseNode:
+            self.resolve_block(if_node.else_node.block)
+
+
+    def resolve_while(self, while_node: WhileNode) -> None:
+        self.resolve_expression(while_node.condition)
+        self.resolve_block(while_node.block)
+
+
+    def resolve_expression(self, node: Node) -> None:
+        kind = node.kind
+
+        if kind is VariableNode:
+            node.depth, node.slot = self.lookup(node.name)
+
+        elif kind is BinaryOpNode or kind is ComparisonOpNode or kind is BooleanOpNode:
+            self.resolve_expression(node.left)
+            self.resolve_expression(node.right)
+
+        elif kind is UnaryNode or kind is NotBooleanNode:
+            self.resolve_expression(node.node)
+
+        elif kind is CallNode:
+            for arg in node.args:
+                self.resolve_expression(arg)
\ No newline at end of file
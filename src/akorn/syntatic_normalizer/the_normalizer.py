@@ -1,8 +1,9 @@
+from typing import Iterable, Iterator
 from akorn.scanner import Token, TokenType
 from akorn.diagnostic import ErrorReporter
 
 class TheNormalizer:
-    tokens_valids = [
+    tokens_valids = frozenset({
         TokenType.NUMBER,
         TokenType.STRING_LITERAL,
         TokenType.IDENT,
@@ -10,105 +11,109 @@ class TheNormalizer:
         TokenType.FALSE,
         TokenType.RPAREN,
         TokenType.CONTINUE,
-        TokenType.BREAK  
-    ]
-    
-    def __init__(self, tokens: list[Token], reporter: ErrorReporter):
+        TokenType.BREAK
+    })
+
+    def __init__(self, tokens: list[Token] | Iterable[Token], reporter: ErrorReporter):
         self.tokens = tokens
-        self.index = 0
-        self.lenght = len(tokens)
         self.reporter = reporter
-        
-    def is_valid(self, type: TokenType) -> bool:
-        return type in self.tokens_valids
-        
-    def is_end(self) -> bool:
-        return self.tokens[self.index].type == TokenType.EOF
-    
-    def peek_type(self, step: int) -> TokenType:
-        if self.index + step > self.lenght:
-            return TokenType.NONE
-        
-        if self.tokens[self.index + step] == TokenType.EOF:
-            return TokenType.NONE
-        
-        return self.tokens[self.index + step].type
-    
-    def line(self) -> int:
-        return self.tokens[self.index].line
-        
-    def column(self) -> int:
-        return self.tokens[self.index].column
-    
-    def declare_error(self, msg: str):
+
+    def is_valid(self, token: Token | None) -> bool:
+        return token is not None and token.type in self.tokens_valids
+
+    def declare_error(self, token: Token, msg: str):
         self.reporter.add_error(
-            f"[TerminationError][line: {self.line()}, col: {self.column()}] {msg}"
+            f"[TerminationError][line: {token.line}, col: {token.column}] {msg}"
         )
-        self.index += 1
-        
+
     def normalizer(self) -> list[Token]:
+        """Single pass over the tokens, the normalized list is built in O(n)"""
+
+        self.tokens = list(self.stream())
+        return self.tokens
+
+
+    def stream(self) -> Iterator[Token]:
+        """Pulls the tokens one by one and only remembers the previous token
+        and the next one.
+        \nNewlines become semicolons after a token that can end a statement
+        (unless a '{' follows) and are dropped everywhere else, also inside
+        parentheses. The first terminator found fixes the style (newlines or
+        semicolons) of the whole script. After a TerminationError the token
+        that follows the wrong terminator is passed through unchecked (and,
+        for a newline, replaced by a semicolon)."""
+
+        tokens = iter(self.tokens)
         depth = 0
         semicolon_mode: bool = None
         mode_verified = False
-        
-        while not self.is_end():
-            if self.peek_type(0) == TokenType.NEWLINE:
-                if not depth > 0:
-                    if self.is_valid(self.peek_type(-1)) and self.peek_type(1) != TokenType.LBRACE:
-                        if mode_verified and semicolon_mode:
-                            self.declare_error("You are using both newlines and semicolons in the terminator; please use only one style.")
-                        
-                        self.tokens[self.index] = Token(TokenType.SEMICOLON, ';', self.column(), self.line())
-                        
-                        if not mode_verified:
-                            semicolon_mode = False
-                            mode_verified = True
-                        
-                        self.index += 1
-                        
-                    else:
-                        self.tokens.pop(self.index)
-                        self.lenght -= 1
-                        
+        previous: Token = None
+
+        current = next(tokens)
+
+        while current.type != TokenType.EOF:
+            following = next(tokens)
+            jumped: Token = None
+
+            if current.type == TokenType.NEWLINE:
+                if depth > 0 or not self.is_valid(previous) or following.type == TokenType.LBRACE:
+                    current = following
+                    continue
+
+                if mode_verified and semicolon_mode:
+                    self.declare_error(current, "You are using both newlines and semicolons in the terminator; please use only one style.")
+                    jumped = Token(TokenType.SEMICOLON, ';', following.column, following.line)
                 else:
-                    self.tokens.pop(self.index)
-                    self.lenght -= 1
-            
-            
-            elif self.peek_type(0) == TokenType.LPAREN:
+                    current = Token(TokenType.SEMICOLON, ';', current.column, current.line)
+
+                if not mode_verified:
+                    semicolon_mode = False
+                    mode_verified = True
+
+            elif current.type == TokenType.LPAREN:
                 depth += 1
-                self.index += 1
-            
-            elif (depth > 0) and (self.peek_type(0) == TokenType.RPAREN):
+
+            elif (depth > 0) and (current.type == TokenType.RPAREN):
                 depth -= 1
-                self.index += 1
-            
-            elif (self.peek_type(0) == TokenType.SEMICOLON):
+
+            elif current.type == TokenType.SEMICOLON:
+                jumped = following
+
                 if depth > 0:
-                    self.declare_error("semicolon found in an unexpected place, remove it")
-                
+                    self.declare_error(current, "semicolon found in an unexpected place, remove it")
+
                 elif mode_verified and not semicolon_mode:
-                    self.declare_error("You are using both newlines and semicolons in the terminator; please use only one style.")
-                    
-                elif not self.is_valid(self.peek_type(-1)):
-                    self.declare_error("Semicolon in an unexpected position, please remove it")
-                
+                    self.declare_error(current, "You are using both newlines and semicolons in the terminator; please use only one style.")
+
+                elif not self.is_valid(previous):
+                    self.declare_error(current, "Semicolon in an unexpected position, please remove it")
+
                 else:
+                    jumped = None
+
                     if not mode_verified:
                         semicolon_mode = True
                         mode_verified = True
-                
-                self.index += 1
-
-            else:
-                self.index += 1
-                        
-        
-        
-        if not semicolon_mode and self.is_valid(self.peek_type(-1)):
-            column = self.tokens[self.index - 1].column + 1
-            line = self.tokens[self.index - 1].line
-            self.tokens.append(self.tokens[self.index])
-            self.tokens[self.index] = Token(TokenType.SEMICOLON, ';', column, line)
-            
-        return self.tokens
\ No newline at end of file
+
+            yield current
+            previous = current
+
+            if jumped is None:
+                current = following
+                continue
+
+            #The jumped token is passed through without being checked
+            yield jumped
+            previous = jumped
+
+            if following.type == TokenType.EOF:
+                if jumped is not following:
+                    yield following
+                return
+
+            current = next(tokens)
+
+        if not semicolon_mode and self.is_valid(previous):
+            yield Token(TokenType.SEMICOLON, ';', previous.column + 1, previous.line)
+
+        yield current
\ No newline at end of file
@@ -1,13 +1,31 @@
-from akorn.ast import Node
+from akorn.ast import Node, NodeCursor, FlatAst
+
+def is_branch(value) -> bool:
+    """Nodes (slotted), cursors of a flat AST and other objects with attributes
+    are printed as branches"""
+    
+    return isinstance(value, (Node, NodeCursor)) or hasattr(value, "__dict__")
+
+
+def attributes(node):
+    if isinstance(node, (Node, NodeCursor)):
+        return [(name, getattr(node, name)) for name in node.fields]
+    
+    return vars(node).items()
+
 
 def print_ast(node, indent="", is_last=True):
     """
     Pretty-print an AST tree, now supporting lists of tuples [(), ()].
+    A `FlatAst` is walked through its cursors and printed like the tree.
     """
     if node is None:
         return
 
-    node_name = node.__class__.__name__
+    if isinstance(node, FlatAst):
+        node = node.root()
+
+    node_name = node.kind.__name__ if isinstance(node, NodeCursor) else node.__class__.__name__
     branch = "└── " if is_last else "├── "
     print(indent + branch + node_name)
 
@@ -19,24 +37,24 @@ def print_ast(node, indent="", is_last=True):
         if isinstance(item, (list, tuple)):
             for sub_item in item:
                 collect_nodes(sub_item, attr_name)
-        elif hasattr(item, "__dict__"):
+        elif is_branch(item):
             children.append((attr_name, item))
         else:
             # Si es un valor simple dentro de una tupla/lista que no es un objeto
             print(new_indent + f"├── {attr_name} (val): {item}")
 
-    for attr, value in vars(node).items():
+    for attr, value in attributes(node):
         if isinstance(value, (list, tuple)):
             # Procesar la lista o lista de tuplas
             for item in value:
                 if isinstance(item, (list, tuple)):
                     # Caso específico: lista de tuplas [ (nodo, nodo), (nodo, val) ]
                     collect_nodes(item, attr)
-                elif hasattr(item, "__dict__"):
+                elif is_branch(item):
                     children.append((attr, item))
                 else:
                     print(new_indent + f"├── {attr}: {item}")
-        elif hasattr(value, "__dict__"):
+        elif is_branch(value):
             children.append((attr, value))
         else:
             # Atributo hoja simple